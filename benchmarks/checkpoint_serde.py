@@ -0,0 +1,117 @@
+"""
+Сравнение сериализаторов checkpoint'ов LangGraph: размер и время encode/decode.
+
+Запуск: make bench (или uv run python -m benchmarks.checkpoint_serde)
+"""
+
+import timeit
+from datetime import datetime
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.redis.jsonplus_redis import JsonPlusRedisSerializer
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from source.domain.entities.employer import EmployerEntity
+from source.domain.entities.resume import JobExperienceEntity, ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.checkpoint_serde import CheckpointSerializer
+
+NUMBER = 200
+
+HTML_PARAGRAPH = (
+    "<p><strong>Чем предстоит заниматься:</strong></p><ul><li>разрабатывать backend сервисов "
+    "на Python (FastAPI, SQLAlchemy, asyncio);</li><li>проектировать REST API и схемы БД;</li>"
+    "<li>участвовать в code review и развитии CI/CD;</li></ul><p><strong>Мы ожидаем:</strong>"
+    "</p><ul><li>опыт коммерческой разработки от 3 лет;</li><li>PostgreSQL, Redis, Docker;</li>"
+    "</ul>"
+)
+
+
+def make_vacancy() -> VacancyEntity:
+    return VacancyEntity(
+        hh_id="123456789",
+        url_vacancy="https://hh.ru/vacancy/123456789",
+        name="Python backend разработчик",
+        experience={"id": "between3And6", "name": "От 3 до 6 лет"},
+        description=HTML_PARAGRAPH * 12,
+        key_skills=[{"name": name} for name in ("Python", "FastAPI", "PostgreSQL", "Redis")],
+        employer_id="987654",
+    )
+
+
+def make_resume() -> ResumeEntity:
+    return ResumeEntity(
+        hh_id="resume-1",
+        title="Python разработчик",
+        name="Иван",
+        surname="Иванов",
+        job_experience=[
+            JobExperienceEntity(
+                company=f"Компания {i}",
+                position="Backend разработчик",
+                start=datetime(2015 + i, 1, 1),
+                end=datetime(2016 + i, 6, 1) if i < 7 else None,
+                description="Разработка микросервисов, интеграции с внешними API, "
+                "оптимизация запросов к PostgreSQL, настройка мониторинга. " * 5,
+            )
+            for i in range(8)
+        ],
+        skills={"Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Docker", "Kafka"},
+        contact_phone="+79990000000",
+        contact_email="ivan@example.com",
+    )
+
+
+def make_employer() -> EmployerEntity:
+    return EmployerEntity(
+        hh_id="987654",
+        name="ООО Рога и копыта",
+        description="<p>Мы - продуктовая IT компания, разрабатываем сервисы для бизнеса.</p>" * 30,
+    )
+
+
+def make_messages() -> list:
+    messages = []
+    for i in range(4):
+        messages.append(AIMessage(content=f"Вариант {i}. Здравствуйте! " + "Текст письма. " * 60))
+        messages.append(HumanMessage(content=f"Замечание {i}: сделай письмо короче"))
+    return messages
+
+
+PAYLOADS = {
+    "vacancy": make_vacancy(),
+    "resume": make_resume(),
+    "employer": make_employer(),
+    "messages": make_messages(),
+    "response": "Здравствуйте! " + "Текст письма. " * 60,
+}
+
+
+def bench(name: str, serde) -> None:
+    for payload_name, payload in PAYLOADS.items():
+        dumped = serde.dumps_typed(payload)
+        encode = (
+            timeit.timeit(lambda payload=payload: serde.dumps_typed(payload), number=NUMBER)
+            / NUMBER
+        )
+        decode = (
+            timeit.timeit(lambda dumped=dumped: serde.loads_typed(dumped), number=NUMBER) / NUMBER
+        )
+        print(
+            f"{name:<24} {payload_name:<10} {dumped[0]:<20} {len(dumped[1]):>8} "
+            f"{encode * 1e6:>10.1f} {decode * 1e6:>10.1f}"
+        )
+
+
+def main() -> None:
+    print(
+        f"{'serializer':<24} {'payload':<10} {'type':<20} {'bytes':>8} "
+        f"{'encode,us':>10} {'decode,us':>10}"
+    )
+    bench("JsonPlusSerializer", JsonPlusSerializer())
+    bench("JsonPlusRedisSerializer", JsonPlusRedisSerializer())
+    bench("CheckpointSerializer", CheckpointSerializer())
+
+
+if __name__ == "__main__":
+    main()
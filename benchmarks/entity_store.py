@@ -0,0 +1,63 @@
+"""
+Сравнение размера состояния графа в checkpoint'е: сущности целиком и ссылки на EntityStore.
+
+Запуск: make bench (или uv run python -m benchmarks.entity_store)
+"""
+
+import asyncio
+import timeit
+
+from benchmarks.checkpoint_serde import make_employer, make_messages, make_resume, make_vacancy
+from fakeredis import FakeAsyncRedis
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from source.infrastructure.services.checkpoint_serde import CheckpointSerializer
+from source.infrastructure.services.entity_store import EntityStore
+
+NUMBER = 200
+
+
+def make_state() -> dict:
+    messages = make_messages()
+    return {
+        "vacancy": make_vacancy(),
+        "resume": make_resume(),
+        "employer": make_employer(),
+        "user_rules": {},
+        "response": messages[-2].content,
+        "user_comments": messages[-1].content,
+        "messages": messages,
+    }
+
+
+async def make_ref_state(state: dict) -> dict:
+    store = EntityStore(FakeAsyncRedis(), ttl=60)
+    ref_state = dict(state)
+    for field in ("vacancy", "resume", "employer"):
+        ref_state[field] = await store.put(state[field])
+    return ref_state
+
+
+def bench(name: str, serde, states: dict[str, dict]) -> None:
+    for state_name, state in states.items():
+        dumped = serde.dumps_typed(state)
+        encode = timeit.timeit(lambda state=state: serde.dumps_typed(state), number=NUMBER) / NUMBER
+        decode = (
+            timeit.timeit(lambda dumped=dumped: serde.loads_typed(dumped), number=NUMBER) / NUMBER
+        )
+        print(
+            f"{name:<24} {state_name:<10} {len(dumped[1]):>8} "
+            f"{encode * 1e6:>10.1f} {decode * 1e6:>10.1f}"
+        )
+
+
+def main() -> None:
+    state = make_state()
+    states = {"inline": state, "refs": asyncio.run(make_ref_state(state))}
+    print(f"{'serializer':<24} {'state':<10} {'bytes':>8} {'encode,us':>10} {'decode,us':>10}")
+    bench("JsonPlusSerializer", JsonPlusSerializer(), states)
+    bench("CheckpointSerializer", CheckpointSerializer(), states)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Ранжирование вакансий по совпадению навыков с резюме: попарное пересечение множеств
+в Python и битовые множества NumPy (кодирование и оценка отдельно).
+
+Запуск: make bench (или uv run python -m benchmarks.skill_match)
+"""
+
+import random
+import timeit
+
+from source.infrastructure.services.skill_matcher import SkillMatcher, normalize_skill
+
+NUMBER = 5
+SIZES = (10_000, 100_000)
+VOCABULARY_SIZE = 3_000
+
+
+def make_skill_sets(size: int, rng: random.Random) -> list[list[str]]:
+    # популярные навыки встречаются чаще: распределение смещено к началу словаря
+    return [
+        [
+            f"Skill {int(rng.paretovariate(1.2)) % VOCABULARY_SIZE}"
+            for _ in range(rng.randint(0, 12))
+        ]
+        for _ in range(size)
+    ]
+
+
+def python_scores(resume: set[str], skill_sets: list[list[str]]) -> list[float | None]:
+    scores = []
+    for skills in skill_sets:
+        required = {normalize_skill(skill) for skill in skills}
+        scores.append(len(required & resume) / len(required) if required else None)
+    return scores
+
+
+def bench(size: int) -> None:
+    rng = random.Random(size)
+    skill_sets = make_skill_sets(size, rng)
+    resume_skills = [f"Skill {i}" for i in rng.sample(range(50), 15)]
+    resume = {normalize_skill(skill) for skill in resume_skills}
+
+    matcher = SkillMatcher()
+    vacancies_bits = matcher.encode(skill_sets)
+    resume_bits = matcher.encode([resume_skills], add=False)[0]
+
+    python = timeit.timeit(lambda: python_scores(resume, skill_sets), number=NUMBER) / NUMBER
+    encode = timeit.timeit(lambda: matcher.encode(skill_sets), number=NUMBER) / NUMBER
+    score = (
+        timeit.timeit(lambda: matcher.score(resume_bits, vacancies_bits), number=NUMBER) / NUMBER
+    )
+    print(
+        f"{size:>10} {len(matcher.vocabulary):>8} {vacancies_bits.nbytes / 1024:>10.0f} "
+        f"{python * 1e3:>10.1f} {encode * 1e3:>10.1f} {score * 1e3:>10.2f}"
+    )
+
+
+def main() -> None:
+    print(
+        f"{'vacancies':>10} {'skills':>8} {'bits,KiB':>10} "
+        f"{'python,ms':>10} {'encode,ms':>10} {'score,ms':>10}"
+    )
+    for size in SIZES:
+        bench(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+_current_deadline: ContextVar["Deadline | None"] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """Время, отведенное на обработку запроса, истекло"""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Крайний срок обработки запроса.
+
+    Создается в use case и передается вниз через contextvars, поэтому сервисы получают его
+    через current_deadline() без изменения сигнатур. Сервисы уменьшают таймауты и паузы между
+    повторами до оставшегося времени и не начинают новых попыток после истечения срока.
+    """
+
+    expires_at: float  # по time.monotonic()
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceededError("Время обработки запроса истекло")
+
+    def timeout(self, default: float | None = None) -> float:
+        """Таймаут операции: default, но не больше оставшегося времени"""
+        self.check()
+        remaining = self.remaining()
+        return remaining if default is None else min(default, remaining)
+
+    @contextlib.contextmanager
+    def bind(self) -> Iterator["Deadline"]:
+        """Делает срок текущим без принудительной отмены (для генераторов)"""
+        current = _current_deadline.get()
+        # вложенный срок не может быть позже внешнего
+        deadline = self if current is None or self.expires_at < current.expires_at else current
+        token = _current_deadline.set(deadline)
+        try:
+            yield deadline
+        finally:
+            # генератор может быть закрыт уже в другом контексте - тогда сбрасывать нечего
+            with contextlib.suppress(ValueError):
+                _current_deadline.reset(token)
+
+    @contextlib.asynccontextmanager
+    async def scope(self) -> AsyncIterator["Deadline"]:
+        """Делает срок текущим и отменяет работу внутри блока после его истечения"""
+        with self.bind() as deadline:
+            try:
+                async with asyncio.timeout(deadline.remaining()):
+                    yield deadline
+            except TimeoutError as e:
+                if deadline.expired and not isinstance(e, DeadlineExceededError):
+                    raise DeadlineExceededError("Время обработки запроса истекло") from e
+                raise
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+@contextlib.asynccontextmanager
+async def deadline_scope(seconds: float | None) -> AsyncIterator[Deadline | None]:
+    """Deadline.scope() на seconds секунд, None - без ограничения"""
+    if seconds is None:
+        yield current_deadline()
+        return
+    async with Deadline.after(seconds).scope() as deadline:
+        yield deadline
+
+
+@contextlib.contextmanager
+def bind_deadline(seconds: float | None) -> Iterator[Deadline | None]:
+    """Deadline.bind() на seconds секунд, None - без ограничения"""
+    if seconds is None:
+        yield current_deadline()
+        return
+    with Deadline.after(seconds).bind() as deadline:
+        yield deadline
@@ -0,0 +1,34 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import Field
+
+from source.application.dtos.base import BaseDTO
+from source.application.dtos.query import QueryCreateDTO
+from source.domain.entities.response import ResponseToVacancyEntity
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class BotReplyTarget(BaseDTO):
+    """Сообщение бота, которое воркер заменит результатом генерации"""
+
+    chat_id: int
+    message_id: int
+
+
+class ResponseJobDTO(BaseDTO):
+    job_id: str
+    status: JobStatus = JobStatus.QUEUED
+    query: QueryCreateDTO
+    reply_to: BotReplyTarget | None = None
+    attempts: int = Field(default=0, description="Количество запусков задачи воркерами")
+    result: ResponseToVacancyEntity | None = None
+    error: str | None = Field(default=None, description="Описание последней ошибки")
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
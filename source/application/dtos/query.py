@@ -1,4 +1,6 @@
-from pydantic import Field
+from typing import Any
+
+from pydantic import Field, model_validator
 
 from source.application.dtos.base import BaseDTO
 
@@ -8,8 +10,35 @@ class QueryCreateDTO(BaseDTO):
     user_id: int
     url_vacancy: str = Field(default="https://usinsk.hh.ru/vacancy/125537679")
     resume_hh_id: str = Field(default="6044a353ff0f1126620039ed1f42324e494b4c")
+    bypass_cache: bool = Field(
+        default=False, description="Сгенерировать новый отклик, не используя кэш"
+    )
 
 
 class QueryRecreateDTO(QueryCreateDTO):
     response: str
     user_comments: str
+
+
+class QueryBatchCreateDTO(BaseDTO):
+    subject: str = Field(description="Уникальный идентификатор пользователя, в основном это hh_id")
+    user_id: int
+    resume_hh_id: str
+    urls_vacancy: list[str] = Field(default_factory=list, description="Ссылки на вакансии")
+    search_filter: dict[str, Any] | None = Field(
+        default=None,
+        description="Фильтры поиска вакансий hh.ru (параметры GET /vacancies), "
+        "используются, если ссылки на вакансии не переданы",
+    )
+    max_vacancies: int = Field(
+        default=20, ge=1, le=2000, description="Максимальное количество вакансий из поиска"
+    )
+    bypass_cache: bool = Field(
+        default=False, description="Сгенерировать новые отклики, не используя кэш"
+    )
+
+    @model_validator(mode="after")
+    def check_vacancies_source(self) -> "QueryBatchCreateDTO":
+        if not self.urls_vacancy and not self.search_filter:
+            raise ValueError("Необходимо передать ссылки на вакансии или фильтры поиска")
+        return self
@@ -0,0 +1,13 @@
+from pydantic import Field
+
+from source.application.dtos.base import BaseDTO
+from source.domain.entities.response import ResponseToVacancyEntity
+
+
+class BatchResponseItemDTO(BaseDTO):
+    vacancy_hh_id: str | None = None
+    url_vacancy: str | None = Field(
+        default=None, description="Не заполнено для ошибки поиска вакансий (последняя строка)"
+    )
+    response: ResponseToVacancyEntity | None = None
+    error: str | None = Field(default=None, description="Описание ошибки, если отклик не создан")
@@ -0,0 +1,46 @@
+from pydantic import Field
+
+from source.application.dtos.base import BaseDTO
+from source.domain.entities.vacancy import VacancyEntity
+
+
+class VacancySearchDTO(BaseDTO):
+    text: str = Field(default="", description="Поисковый запрос по названию и описанию вакансии")
+    skills: list[str] = Field(
+        default_factory=list, description="Навыки, которые должны быть у вакансии (все сразу)"
+    )
+    limit: int = Field(default=10, ge=1, le=100, description="Размер страницы")
+    cursor: str | None = Field(
+        default=None, description="Курсор следующей страницы из предыдущего результата поиска"
+    )
+
+
+class VacancySearchPageDTO(BaseDTO):
+    items: list[VacancyEntity] = Field(default_factory=list)
+    next_cursor: str | None = Field(
+        default=None, description="Курсор следующей страницы, None - страница последняя"
+    )
+
+
+class VacancyMatchQueryDTO(VacancySearchDTO):
+    resume_hh_id: str = Field(description="Резюме, с навыками которого сравниваются вакансии")
+    limit: int = Field(
+        default=1000, ge=1, le=10000, description="Сколько найденных вакансий ранжировать"
+    )
+    top: int = Field(default=10, ge=1, le=100, description="Сколько лучших вакансий вернуть")
+
+
+class SkillMatchDTO(BaseDTO):
+    vacancy: VacancyEntity
+    score: float | None = Field(
+        description="Доля навыков вакансии, которые есть в резюме; None - у вакансии нет навыков"
+    )
+    matched_skills: list[str] = Field(default_factory=list)
+    missing_skills: list[str] = Field(default_factory=list)
+
+
+class VacancyMatchPageDTO(BaseDTO):
+    items: list[SkillMatchDTO] = Field(default_factory=list)
+    next_cursor: str | None = Field(
+        default=None, description="Курсор следующей порции найденных вакансий для ранжирования"
+    )
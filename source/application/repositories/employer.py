@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from source.application.repositories.base import ISQLRepository
+from source.domain.entities.employer import EmployerEntity
+
+
+class IEmployerRepository[ET: EmployerEntity](ISQLRepository[EmployerEntity], ABC):
+    @abstractmethod
+    async def get_by_hh_id(self, hh_id: str) -> tuple[ET, datetime] | None:
+        """Работодатель и время его загрузки с hh.ru"""
+
+    @abstractmethod
+    async def upsert(self, entity: ET, fetched_at: datetime) -> None:
+        """Сохраняет загруженного с hh.ru работодателя (или обновляет сохраненного)"""
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from source.application.dtos.search import VacancySearchDTO, VacancySearchPageDTO
+from source.application.repositories.base import ISQLRepository
+from source.domain.entities.vacancy import VacancyEntity
+
+
+class IVacancyRepository[ET: VacancyEntity](ISQLRepository[VacancyEntity], ABC):
+    @abstractmethod
+    async def get_by_hh_id(self, hh_id: str) -> tuple[ET, datetime] | None:
+        """Вакансия и время ее загрузки с hh.ru"""
+
+    @abstractmethod
+    async def upsert(self, entity: ET, fetched_at: datetime) -> None:
+        """Сохраняет загруженную с hh.ru вакансию (или обновляет сохраненную)"""
+
+    @abstractmethod
+    async def search(self, query: VacancySearchDTO) -> VacancySearchPageDTO:
+        """
+        Поиск по сохраненным вакансиям: по тексту (название и описание) и навыкам.
+
+        Результаты упорядочены по релевантности, страницы запрашиваются по курсору
+        (next_cursor из предыдущей страницы).
+        """
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from enum import IntEnum
 from typing import TypedDict
 
 from source.domain.entities.employer import EmployerEntity
@@ -15,10 +17,33 @@ class GenerateResponseData(TypedDict):
     user_rules: dict
 
 
+class LLMPriority(IntEnum):
+    """Класс приоритета запроса к LLM: чем меньше значение, тем раньше запрос будет обслужен"""
+
+    INTERACTIVE = 0  # пользователь ждет ответ (бот, API)
+    BATCH = 1  # пакетная генерация
+    BACKGROUND = 2  # фоновые задачи
+
+
+# Элемент потока генерации: части текста по мере генерации, последним приходит итоговый отклик
+type ResponseStreamChunk = str | ResponseToVacancyEntity
+
+
 class IAIService(ABC):
     @abstractmethod
-    async def generate_response(self, data: GenerateResponseData) -> ResponseToVacancyEntity:
-        """Метод для генерации отклика на вакансию"""
+    async def generate_response(
+        self,
+        data: GenerateResponseData,
+        *,
+        bypass_cache: bool = False,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        isolated: bool = False,
+    ) -> ResponseToVacancyEntity:
+        """Метод для генерации отклика на вакансию.
+        bypass_cache - принудительно сгенерировать новый отклик, минуя кэш,
+        priority - класс приоритета запроса к LLM,
+        isolated - сохранить состояние отдельно для вакансии, не затрагивая текущий диалог
+        пользователя (для пакетной генерации)"""
         ...
 
     @abstractmethod
@@ -28,6 +53,33 @@ class IAIService(ABC):
         response: str,
         user_comments: str,
         data: GenerateResponseData | None = None,
+        *,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
     ) -> ResponseToVacancyEntity:
         """Метод для исправления ранее сгенерированного отклика"""
         ...
+
+    @abstractmethod
+    def stream_response(
+        self,
+        data: GenerateResponseData,
+        *,
+        bypass_cache: bool = False,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> AsyncIterator[ResponseStreamChunk]:
+        """Метод для потоковой генерации отклика.
+        Отдает части текста по мере генерации, последним элементом - итоговый отклик"""
+        ...
+
+    @abstractmethod
+    def stream_regenerate_response(
+        self,
+        user_id: int,
+        response: str,
+        user_comments: str,
+        data: GenerateResponseData | None = None,
+        *,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> AsyncIterator[ResponseStreamChunk]:
+        """Метод для потокового исправления ранее сгенерированного отклика"""
+        ...
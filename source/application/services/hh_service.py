@@ -1,5 +1,6 @@
 import re
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import TypedDict
 
 from source.application.services.ai_service import GenerateResponseData
@@ -139,6 +140,16 @@ class IHHService(ABC):
         """Метод для поиска вакансий по фильтрам"""
         ...
 
+    @abstractmethod
+    def iter_vacancies(
+        self, subject: int | str, max_results: int | None = None, **filter_query
+    ) -> AsyncIterator[VacancyEntity]:
+        """
+        Метод для постраничного поиска вакансий по фильтрам.
+        Вакансии отдаются по мере загрузки, не больше max_results (None - все найденные)
+        """
+        ...
+
     @abstractmethod
     async def get_vacancy_data(self, subject: int | str, vacancy_id: str) -> VacancyEntity:
         """Метод для получения информации о вакансии"""
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+
+from source.application.dtos.job import BotReplyTarget, ResponseJobDTO
+from source.application.dtos.query import QueryCreateDTO
+
+
+class IJobQueue(ABC):
+    @abstractmethod
+    async def enqueue(
+        self, query: QueryCreateDTO, reply_to: BotReplyTarget | None = None
+    ) -> ResponseJobDTO:
+        """Метод для постановки генерации отклика в очередь.
+        Если такая же задача уже ожидает или выполняется - возвращает ее, а не создает новую.
+        reply_to - сообщение бота, в которое воркер отправит результат"""
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> ResponseJobDTO | None:
+        """Метод для получения статуса и результата задачи"""
+        ...
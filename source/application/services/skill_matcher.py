@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from source.application.dtos.search import SkillMatchDTO
+from source.domain.entities.resume import ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+
+
+class ISkillMatcher(ABC):
+    @abstractmethod
+    def rank(
+        self, resume: ResumeEntity, vacancies: Sequence[VacancyEntity], top: int | None = None
+    ) -> list[SkillMatchDTO]:
+        """
+        Ранжирует вакансии по совпадению их навыков с навыками резюме (лучшие первыми).
+
+        top - сколько лучших вакансий вернуть (None - все).
+        """
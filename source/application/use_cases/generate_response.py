@@ -1,7 +1,9 @@
 import logging
+from collections.abc import AsyncIterator
 
+from source.application.deadline import bind_deadline, deadline_scope
 from source.application.dtos.query import QueryCreateDTO
-from source.application.services.ai_service import IAIService
+from source.application.services.ai_service import IAIService, ResponseStreamChunk
 from source.application.services.hh_service import IHHService
 from source.domain.entities.response import ResponseToVacancyEntity
 
@@ -9,17 +11,44 @@ logger = logging.getLogger(__name__)
 
 
 class GenerateResponseUseCase:
-    def __init__(self, hh_service: IHHService, ai_service: IAIService):
+    """
+    Генерация отклика на вакансию.
+
+    timeout - общий срок (в секундах) на сбор данных с hh.ru и генерацию. Сервисы сокращают
+    свои таймауты и повторы до оставшегося времени, по истечении срока работа отменяется
+    (DeadlineExceededError). При потоковой генерации срок соблюдается без принудительной
+    отмены: новые запросы и повторы после его истечения не выполняются.
+    """
+
+    def __init__(
+        self, hh_service: IHHService, ai_service: IAIService, timeout: float | None = None
+    ):
         self.hh_service = hh_service
         self.ai_service = ai_service
+        self.timeout = timeout
 
     async def __call__(self, query: QueryCreateDTO) -> ResponseToVacancyEntity:
-        logger.debug("Input vacancy url: %s", query.url_vacancy)
-        vacancy_id = self.hh_service.extract_vacancy_id_from_url(query.url_vacancy)
-        logger.debug("Extracted vacancy id: %s", vacancy_id)
-        data = await self.hh_service.data_collect_for_llm(
-            query.subject, query.user_id, vacancy_id, query.resume_hh_id
-        )
-        response = await self.ai_service.generate_response(data)
-        logger.debug("Generated ai response: %s", response.message)
-        return response
+        async with deadline_scope(self.timeout):
+            logger.debug("Input vacancy url: %s", query.url_vacancy)
+            vacancy_id = self.hh_service.extract_vacancy_id_from_url(query.url_vacancy)
+            logger.debug("Extracted vacancy id: %s", vacancy_id)
+            data = await self.hh_service.data_collect_for_llm(
+                query.subject, query.user_id, vacancy_id, query.resume_hh_id
+            )
+            response = await self.ai_service.generate_response(
+                data, bypass_cache=query.bypass_cache
+            )
+            logger.debug("Generated ai response: %s", response.message)
+            return response
+
+    async def stream(self, query: QueryCreateDTO) -> AsyncIterator[ResponseStreamChunk]:
+        with bind_deadline(self.timeout):
+            logger.debug("Input vacancy url for streaming: %s", query.url_vacancy)
+            vacancy_id = self.hh_service.extract_vacancy_id_from_url(query.url_vacancy)
+            data = await self.hh_service.data_collect_for_llm(
+                query.subject, query.user_id, vacancy_id, query.resume_hh_id
+            )
+            async for chunk in self.ai_service.stream_response(
+                data, bypass_cache=query.bypass_cache
+            ):
+                yield chunk
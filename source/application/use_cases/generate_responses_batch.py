@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+from source.application.dtos.query import QueryBatchCreateDTO
+from source.application.dtos.response import BatchResponseItemDTO
+from source.application.services.ai_service import (
+    GenerateResponseData,
+    IAIService,
+    LLMPriority,
+)
+from source.application.services.hh_service import IHHService
+from source.domain.entities.employer import EmployerEntity
+from source.domain.entities.resume import ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+
+logger = logging.getLogger(__name__)
+
+
+class GenerateResponsesBatchUseCase:
+    """
+    Пакетная генерация откликов на несколько вакансий одним резюме.
+
+    Резюме и правила пользователя загружаются один раз на весь пакет, работодатели -
+    один раз на каждого уникального работодателя. Сбор данных и генерация выполняются
+    параллельно с ограничением max_concurrency, результаты отдаются по мере готовности.
+    Вакансии из поиска обрабатываются по мере загрузки страниц (не больше max_vacancies),
+    ошибка загрузки страницы поиска отдается последним элементом без url_vacancy.
+    """
+
+    def __init__(self, hh_service: IHHService, ai_service: IAIService, max_concurrency: int):
+        self.hh_service = hh_service
+        self.ai_service = ai_service
+        self.max_concurrency = max_concurrency
+
+    async def __call__(self, query: QueryBatchCreateDTO) -> AsyncIterator[BatchResponseItemDTO]:
+        """
+        Загружает резюме и правила пользователя и возвращает поток результатов.
+
+        Ошибки загрузки резюме выбрасываются сразу, до начала потока, чтобы их можно было
+        вернуть клиенту статусом ответа.
+        """
+        logger.info(
+            "Пакетная генерация откликов: user_id=%s, ссылок=%s, фильтры=%s",
+            query.user_id,
+            len(query.urls_vacancy),
+            query.search_filter,
+        )
+        resume, user_rules = await asyncio.gather(
+            self.hh_service.get_resume_data(query.subject, query.resume_hh_id),
+            self.hh_service.get_user_rules(),
+        )
+        return self._stream(query, resume, user_rules)
+
+    async def _stream(
+        self, query: QueryBatchCreateDTO, resume: ResumeEntity, user_rules: dict
+    ) -> AsyncIterator[BatchResponseItemDTO]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        employers: dict[str, asyncio.Task[EmployerEntity]] = {}
+
+        def get_employer(employer_id: str) -> asyncio.Task[EmployerEntity]:
+            # вакансии одного работодателя используют один и тот же запрос
+            if employer_id not in employers:
+                employers[employer_id] = asyncio.create_task(
+                    self.hh_service.get_employer_data(query.subject, employer_id)
+                )
+            return employers[employer_id]
+
+        async def process(
+            url_vacancy: str, vacancy: VacancyEntity | None = None
+        ) -> BatchResponseItemDTO:
+            item = BatchResponseItemDTO(url_vacancy=url_vacancy)
+            async with semaphore:
+                try:
+                    if vacancy is None:
+                        item.vacancy_hh_id = self.hh_service.extract_vacancy_id_from_url(
+                            url_vacancy
+                        )
+                        vacancy = await self.hh_service.get_vacancy_data(
+                            query.subject, item.vacancy_hh_id
+                        )
+                    item.vacancy_hh_id = vacancy.hh_id
+                    item.response = await self._generate(
+                        query, vacancy, await get_employer(vacancy.employer_id), resume, user_rules
+                    )
+                except Exception as e:
+                    logger.exception("Не удалось сгенерировать отклик на вакансию %s", url_vacancy)
+                    item.error = str(e) or e.__class__.__name__
+            return item
+
+        tasks: set[asyncio.Task[BatchResponseItemDTO]] = set()
+        total = 0
+        # вакансии из поиска приходят по мере загрузки, генерация начинается сразу
+        search: AsyncIterator[VacancyEntity] | None = None
+        next_vacancy: asyncio.Task[VacancyEntity | None] | None = None
+        search_error: BatchResponseItemDTO | None = None
+        if query.urls_vacancy:
+            tasks = {asyncio.create_task(process(url)) for url in query.urls_vacancy}
+        else:
+            search = self.hh_service.iter_vacancies(
+                query.subject, max_results=query.max_vacancies, **query.search_filter
+            )
+            next_vacancy = asyncio.create_task(anext(search, None))
+
+        try:
+            while tasks or next_vacancy:
+                done, _ = await asyncio.wait(
+                    {*tasks, *([next_vacancy] if next_vacancy else [])},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for future in done:
+                    if future is next_vacancy:
+                        next_vacancy = None
+                        try:
+                            vacancy = future.result()
+                        except Exception as e:
+                            # уже запущенные генерации завершаются, ошибка поиска - в конце
+                            logger.exception("Не удалось загрузить вакансии из поиска")
+                            search_error = BatchResponseItemDTO(
+                                error=str(e) or e.__class__.__name__
+                            )
+                            continue
+                        if vacancy is not None:
+                            tasks.add(asyncio.create_task(process(vacancy.url_vacancy, vacancy)))
+                            next_vacancy = asyncio.create_task(anext(search, None))
+                        continue
+                    tasks.discard(future)
+                    total += 1
+                    yield future.result()
+            if search_error is not None:
+                yield search_error
+        finally:
+            # клиент мог отключиться - незавершенные генерации больше не нужны
+            for task in [*tasks, *employers.values(), *([next_vacancy] if next_vacancy else [])]:
+                task.cancel()
+            if search is not None:
+                # генератор нельзя закрыть, пока отмененный anext еще выполняется
+                if next_vacancy is not None:
+                    await asyncio.gather(next_vacancy, return_exceptions=True)
+                await search.aclose()
+        logger.info("Пакетная генерация завершена: user_id=%s, вакансий=%s", query.user_id, total)
+
+    async def _generate(
+        self,
+        query: QueryBatchCreateDTO,
+        vacancy: VacancyEntity,
+        employer: EmployerEntity,
+        resume: ResumeEntity,
+        user_rules: dict,
+    ):
+        data = GenerateResponseData(
+            user_id=query.user_id,
+            vacancy=vacancy,
+            employer=employer,
+            resume=resume,
+            user_rules=user_rules,
+        )
+        return await self.ai_service.generate_response(
+            data,
+            bypass_cache=query.bypass_cache,
+            priority=LLMPriority.BATCH,
+            isolated=True,
+        )
@@ -1,7 +1,9 @@
 import logging
+from collections.abc import AsyncIterator
 
+from source.application.deadline import bind_deadline, deadline_scope
 from source.application.dtos.query import QueryRecreateDTO
-from source.application.services.ai_service import IAIService
+from source.application.services.ai_service import IAIService, ResponseStreamChunk
 from source.application.services.hh_service import IHHService
 from source.domain.entities.response import ResponseToVacancyEntity
 
@@ -9,11 +11,25 @@ logger = logging.getLogger(__name__)
 
 
 class RegenerateResponseUseCase:
-    def __init__(self, hh_service: IHHService, ai_service: IAIService):
+    """
+    Исправление отклика по замечаниям пользователя.
+
+    timeout - общий срок (в секундах) на исправление, включая повторный сбор данных с hh.ru,
+    если состояние диалога устарело (см. GenerateResponseUseCase).
+    """
+
+    def __init__(
+        self, hh_service: IHHService, ai_service: IAIService, timeout: float | None = None
+    ):
         self.hh_service = hh_service
         self.ai_service = ai_service
+        self.timeout = timeout
 
     async def __call__(self, query: QueryRecreateDTO) -> ResponseToVacancyEntity:
+        async with deadline_scope(self.timeout):
+            return await self._regenerate(query)
+
+    async def _regenerate(self, query: QueryRecreateDTO) -> ResponseToVacancyEntity:
         try:
             logger.debug(
                 "Input url vacancy and ai response: url=%s, response=%s",
@@ -40,3 +56,35 @@ class RegenerateResponseUseCase:
             )
             logger.debug("Generated ai response: %s", new_response.message)
             return new_response
+
+    async def stream(self, query: QueryRecreateDTO) -> AsyncIterator[ResponseStreamChunk]:
+        with bind_deadline(self.timeout):
+            async for chunk in self._stream(query):
+                yield chunk
+
+    async def _stream(self, query: QueryRecreateDTO) -> AsyncIterator[ResponseStreamChunk]:
+        started = False
+        try:
+            async for chunk in self.ai_service.stream_regenerate_response(
+                query.user_id, query.response, query.user_comments
+            ):
+                started = True
+                yield chunk
+            return
+        except ValueError:
+            # состояние отсутствует - это выясняется до первого токена,
+            # ошибки посреди генерации пробрасываем как есть
+            if started:
+                raise
+        logger.debug("Input vacancy url: %s", query.url_vacancy)
+        vacancy_id = self.hh_service.extract_vacancy_id_from_url(query.url_vacancy)
+        data = await self.hh_service.data_collect_for_llm(
+            query.subject,
+            query.user_id,
+            vacancy_id,
+            query.resume_hh_id,
+        )
+        async for chunk in self.ai_service.stream_regenerate_response(
+            query.user_id, query.response, query.user_comments, data=data
+        ):
+            yield chunk
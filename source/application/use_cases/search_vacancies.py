@@ -0,0 +1,66 @@
+import logging
+
+from source.application.dtos.search import (
+    VacancyMatchPageDTO,
+    VacancyMatchQueryDTO,
+    VacancySearchDTO,
+    VacancySearchPageDTO,
+)
+from source.application.repositories.base import IUnitOfWork
+from source.application.repositories.resume import IResumeRepository
+from source.application.repositories.vacancy import IVacancyRepository
+from source.application.services.skill_matcher import ISkillMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeNotFoundError(LookupError):
+    """Резюме, под которое подбираются вакансии, не найдено"""
+
+
+class SearchVacanciesUseCase:
+    """
+    Поиск по сохраненным вакансиям (полнотекстовый и по навыкам) без запросов к hh.ru.
+    """
+
+    def __init__(self, uow: IUnitOfWork, class_repo: type[IVacancyRepository]):
+        self.uow = uow
+        self.class_repo = class_repo
+
+    async def __call__(self, query: VacancySearchDTO) -> VacancySearchPageDTO:
+        logger.debug("Поиск вакансий: text=%s, skills=%s", query.text, query.skills)
+        async with self.uow as session:
+            return await self.class_repo(session).search(query)
+
+
+class RankVacanciesUseCase:
+    """
+    Подбор вакансий под резюме: найденные сохраненные вакансии (до limit штук)
+    ранжируются по совпадению навыков с резюме, возвращаются top лучших.
+
+    Позволяет отсеять неподходящие вакансии до генерации откликов.
+    """
+
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        vacancy_repo: type[IVacancyRepository],
+        resume_repo: type[IResumeRepository],
+        matcher: ISkillMatcher,
+    ):
+        self.uow = uow
+        self.vacancy_repo = vacancy_repo
+        self.resume_repo = resume_repo
+        self.matcher = matcher
+
+    async def __call__(self, query: VacancyMatchQueryDTO) -> VacancyMatchPageDTO:
+        async with self.uow as session:
+            resume = await self.resume_repo(session).get(hh_id=query.resume_hh_id)
+            if resume is None:
+                raise ResumeNotFoundError(f"Резюме {query.resume_hh_id} не найдено")
+            page = await self.vacancy_repo(session).search(query)
+        logger.debug("Ранжирование %s вакансий под резюме %s", len(page.items), resume.hh_id)
+        return VacancyMatchPageDTO(
+            items=self.matcher.rank(resume, page.items, top=query.top),
+            next_cursor=page.next_cursor,
+        )
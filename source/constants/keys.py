@@ -8,6 +8,7 @@ class StorageKeys:
     AI_RESPONSE = "ai_response"
     CURRENT_VACANCY_URL = "current_vacancy_url"
     CURRENT_VACANCY_HH_ID = "current_vacancy_hh_id"
+    VACANCY_SEARCH = "vacancy_search"
 
 
 class CallbackKeys:
@@ -18,3 +19,4 @@ class CallbackKeys:
     LOGOUT = "logout"
     REGENERATE_AI_RESPONSE = "regenerate_response"
     SEND_AI_RESPONSE = "send"
+    MORE_VACANCIES = "more_vacancies"
@@ -1,4 +1,8 @@
+from html import escape
+
+from source.application.dtos.search import SkillMatchDTO
 from source.domain.entities.user import UserEntity
+from source.domain.entities.vacancy import VacancyEntity
 
 
 class StartMessages:
@@ -55,3 +59,57 @@ class AIMessages:
     @staticmethod
     def request_user_comments() -> str:
         return "Что нужно изменить в отклике?"
+
+    @staticmethod
+    def generation_in_progress() -> str:
+        return "✍️ Генерирую отклик..."
+
+    @staticmethod
+    def generation_queued() -> str:
+        return "⏳ Запрос в очереди, пришлю отклик, как только он будет готов..."
+
+    @staticmethod
+    def generation_already_queued() -> str:
+        return "⏳ Отклик на эту вакансию уже генерируется, дождитесь результата"
+
+    @staticmethod
+    def generation_failed() -> str:
+        return "❌ Не удалось сгенерировать отклик, попробуйте отправить ссылку еще раз"
+
+
+class VacancyMessages:
+    @staticmethod
+    def search_usage() -> str:
+        return (
+            "🔎 Поиск по сохраненным вакансиям\n\n"
+            "Используйте: /vacancies запрос навыки: навык1, навык2\n"
+            "Например: /vacancies python backend навыки: Django, PostgreSQL"
+        )
+
+    @staticmethod
+    def nothing_found() -> str:
+        return "Ничего не найдено, попробуйте изменить запрос"
+
+    @staticmethod
+    def search_expired() -> str:
+        return "Поиск устарел, повторите его командой /vacancies"
+
+    @staticmethod
+    def search_page(vacancies: list[VacancyEntity]) -> str:
+        lines = [
+            f"• <a href='{escape(vacancy.url_vacancy)}'>{escape(vacancy.name)}</a>"
+            for vacancy in vacancies
+        ]
+        return "💼 <b>Найденные вакансии</b>\n\n" + "\n".join(lines)
+
+    @staticmethod
+    def ranked_page(matches: list[SkillMatchDTO]) -> str:
+        lines = []
+        for match in matches:
+            line = (
+                f"• <a href='{escape(match.vacancy.url_vacancy)}'>{escape(match.vacancy.name)}</a>"
+            )
+            if match.score is not None:
+                line += f" - совпадение навыков {match.score:.0%}"
+            lines.append(line)
+        return "💼 <b>Найденные вакансии</b> (по совпадению с резюме)\n\n" + "\n".join(lines)
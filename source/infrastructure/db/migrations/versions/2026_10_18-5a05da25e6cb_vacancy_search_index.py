@@ -0,0 +1,62 @@
+"""vacancy search index
+
+Revision ID: 5a05da25e6cb
+Revises: 5acb9cedee58
+Create Date: 2026-10-18 14:37:05.204913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a05da25e6cb"
+down_revision: Union[str, Sequence[str], None] = "5acb9cedee58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "vacancies",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_vacancies_search_vector",
+        "vacancies",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_vacancies_key_skills",
+        "vacancies",
+        ["key_skills"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    # ранее сохраненные записи содержат сокращенное описание: помечаем их устаревшими,
+    # чтобы при следующем запросе они перезагрузились с hh.ru с полным описанием
+    op.execute("UPDATE vacancies SET fetched_at = 'epoch'")
+    op.execute("UPDATE employers SET fetched_at = 'epoch'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vacancies_key_skills", table_name="vacancies", postgresql_using="gin")
+    op.drop_index("ix_vacancies_search_vector", table_name="vacancies", postgresql_using="gin")
+    op.drop_column("vacancies", "search_vector")
@@ -0,0 +1,86 @@
+"""store hh records
+
+Revision ID: 5acb9cedee58
+Revises: 21086b7df9c1
+Create Date: 2026-10-18 09:12:41.518302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5acb9cedee58"
+down_revision: Union[str, Sequence[str], None] = "21086b7df9c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # вакансии ссылаются на работодателя по hh_id и сохраняются раньше него
+    op.drop_constraint(op.f("vacancies_employer_id_fkey"), "vacancies", type_="foreignkey")
+    op.alter_column(
+        "vacancies",
+        "employer_id",
+        existing_type=sa.Integer(),
+        type_=sa.String(),
+        existing_nullable=False,
+        postgresql_using="employer_id::varchar",
+    )
+    # ссылки на первичный ключ работодателя заменяются на его hh_id
+    op.execute(
+        "UPDATE vacancies v SET employer_id = e.hh_id FROM employers e "
+        "WHERE v.employer_id = e.id::varchar"
+    )
+    op.create_index(op.f("ix_vacancies_employer_id"), "vacancies", ["employer_id"], unique=False)
+    op.add_column(
+        "vacancies",
+        sa.Column(
+            "fetched_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "employers",
+        sa.Column(
+            "fetched_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("employers", "fetched_at")
+    op.drop_column("vacancies", "fetched_at")
+    op.drop_index(op.f("ix_vacancies_employer_id"), table_name="vacancies")
+    # hh_id работодателя заменяется на его первичный ключ. Вакансии работодателей, которые
+    # не сохранены в employers, в старой схеме (NOT NULL FK) храниться не могут - это копия
+    # данных hh.ru, при необходимости она будет загружена заново
+    op.execute(
+        "DELETE FROM vacancies v WHERE NOT EXISTS "
+        "(SELECT 1 FROM employers e WHERE e.hh_id = v.employer_id)"
+    )
+    op.execute(
+        "UPDATE vacancies v SET employer_id = e.id::varchar FROM employers e "
+        "WHERE v.employer_id = e.hh_id"
+    )
+    op.alter_column(
+        "vacancies",
+        "employer_id",
+        existing_type=sa.String(),
+        type_=sa.Integer(),
+        existing_nullable=False,
+        postgresql_using="employer_id::integer",
+    )
+    op.create_foreign_key(
+        op.f("vacancies_employer_id_fkey"), "vacancies", "employers", ["employer_id"], ["id"]
+    )
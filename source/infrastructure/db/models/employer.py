@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String
+from sqlalchemy import DateTime, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import func
 
 from source.infrastructure.db.models.base import BaseModel
 
@@ -18,6 +20,12 @@ class EmployerModel(BaseModel):
 
     vacancies: Mapped[list["VacancyModel"]] = relationship(
         back_populates="employer",
-        cascade="all, delete-orphan",
+        primaryjoin="EmployerModel.hh_id == foreign(VacancyModel.employer_id)",
+        viewonly=True,
         lazy="selectin",
     )
+
+    # время загрузки с hh.ru, по нему определяется актуальность записи
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
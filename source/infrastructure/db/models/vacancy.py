@@ -1,17 +1,26 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy import Computed, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import func
 
 from source.infrastructure.db.models.base import BaseModel
 
 if TYPE_CHECKING:
     from .employer import EmployerModel
 
+# конфигурация полнотекстового поиска по вакансиям (вакансии hh.ru в основном на русском)
+SEARCH_CONFIG = "russian"
+
 
 class VacancyModel(BaseModel):
     __tablename__ = "vacancies"
+    __table_args__ = (
+        Index("ix_vacancies_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_vacancies_key_skills", "key_skills", postgresql_using="gin"),
+    )
 
     hh_id: Mapped[str] = mapped_column(String, index=True, unique=True)
     url_vacancy: Mapped[str] = mapped_column(String, nullable=False)
@@ -23,5 +32,29 @@ class VacancyModel(BaseModel):
     description: Mapped[str] = mapped_column(String, nullable=False)
     key_skills: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
 
-    employer_id: Mapped[str] = mapped_column(ForeignKey("employers.id"))
-    employer: Mapped["EmployerModel"] = relationship(back_populates="vacancies", lazy="selectin")
+    # hh_id работодателя: вакансия сохраняется до загрузки работодателя, поэтому без FK
+    employer_id: Mapped[str] = mapped_column(String, index=True)
+    employer: Mapped["EmployerModel"] = relationship(
+        back_populates="vacancies",
+        primaryjoin="foreign(VacancyModel.employer_id) == EmployerModel.hh_id",
+        viewonly=True,
+        lazy="selectin",
+    )
+
+    # время загрузки с hh.ru, по нему определяется актуальность записи
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    # поисковый вектор по полному нормализованному описанию (сокращение до бюджета токенов
+    # применяется только при подготовке промпта): совпадения в названии весят больше
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        # нужен только в условиях запросов, в сущность не загружается
+        deferred=True,
+    )
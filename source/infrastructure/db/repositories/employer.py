@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import raiseload
+
+from source.application.repositories.employer import IEmployerRepository
+from source.domain.entities.employer import EmployerEntity
+from source.infrastructure.db.models.employer import EmployerModel
+from source.infrastructure.db.repositories.base import SQLAlchemyRepository
+
+
+class EmployerRepository[ET: EmployerEntity, DBModel: EmployerModel](
+    SQLAlchemyRepository, IEmployerRepository
+):
+    model_class = EmployerModel
+    entity_class = EmployerEntity
+
+    async def _check_exist_entity(self, data: ET) -> DBModel | None:
+        stmt = select(self.model_class).where(self.model_class.hh_id == data.hh_id)
+        return await self.session.scalar(stmt.options(raiseload("*")))
+
+    async def get_by_hh_id(self, hh_id: str) -> tuple[ET, datetime] | None:
+        stmt = select(self.model_class).where(self.model_class.hh_id == hh_id)
+        model = await self.session.scalar(stmt.options(raiseload("*")))
+        if model is None:
+            return None
+        entity = self.entity_class(
+            id=model.id,
+            created_at=model.created_at,
+            hh_id=model.hh_id,
+            name=model.name,
+            description=model.description,
+        )
+        return entity, model.fetched_at
+
+    async def upsert(self, entity: ET, fetched_at: datetime) -> None:
+        values = {
+            "hh_id": entity.hh_id,
+            "name": entity.name,
+            "description": entity.description,
+            "fetched_at": fetched_at,
+        }
+        stmt = insert(self.model_class).values(created_at=entity.created_at, **values)
+        await self.session.execute(
+            stmt.on_conflict_do_update(index_elements=[self.model_class.hh_id], set_=values)
+        )
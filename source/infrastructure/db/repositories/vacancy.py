@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import REAL, Select, cast, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import raiseload
+
+from source.application.dtos.search import VacancySearchDTO, VacancySearchPageDTO
+from source.application.repositories.vacancy import IVacancyRepository
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.db.models.vacancy import SEARCH_CONFIG, VacancyModel
+from source.infrastructure.db.repositories.base import SQLAlchemyRepository
+
+
+def encode_cursor(rank: float, id_vacancy: int) -> str:
+    """Курсор страницы поиска: релевантность и id последней вакансии страницы"""
+    return base64.urlsafe_b64encode(json.dumps([rank, id_vacancy]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        rank, id_vacancy = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(id_vacancy)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Некорректный курсор поиска: {cursor}") from e
+
+
+class VacancyRepository[ET: VacancyEntity, DBModel: VacancyModel](
+    SQLAlchemyRepository, IVacancyRepository
+):
+    model_class = VacancyModel
+    entity_class = VacancyEntity
+
+    async def _check_exist_entity(self, data: ET) -> DBModel | None:
+        stmt = select(self.model_class).where(self.model_class.hh_id == data.hh_id)
+        return await self.session.scalar(stmt.options(raiseload("*")))
+
+    def _to_entity(self, model: DBModel) -> ET:
+        return self.entity_class(
+            id=model.id,
+            created_at=model.created_at,
+            hh_id=model.hh_id,
+            url_vacancy=model.url_vacancy,
+            name=model.name,
+            experience=model.experience,
+            description=model.description,
+            # в БД хранятся только названия навыков
+            key_skills=[{"name": name} for name in model.key_skills or []],
+            employer_id=model.employer_id,
+        )
+
+    async def get_by_hh_id(self, hh_id: str) -> tuple[ET, datetime] | None:
+        stmt = select(self.model_class).where(self.model_class.hh_id == hh_id)
+        model = await self.session.scalar(stmt.options(raiseload("*")))
+        if model is None:
+            return None
+        return self._to_entity(model), model.fetched_at
+
+    async def upsert(self, entity: ET, fetched_at: datetime) -> None:
+        values = {
+            "hh_id": entity.hh_id,
+            "url_vacancy": entity.url_vacancy,
+            "name": entity.name,
+            "experience": dict(entity.experience),
+            "description": entity.description,
+            "key_skills": [skill["name"] for skill in entity.key_skills],
+            "employer_id": entity.employer_id,
+            "fetched_at": fetched_at,
+        }
+        stmt = insert(self.model_class).values(created_at=entity.created_at, **values)
+        await self.session.execute(
+            stmt.on_conflict_do_update(index_elements=[self.model_class.hh_id], set_=values)
+        )
+
+    def search_statement(self, query: VacancySearchDTO) -> Select:
+        """
+        Запрос страницы поиска (на одну вакансию больше limit, чтобы понять, есть ли следующая).
+
+        Текст ищется по search_vector (GIN-индекс), навыки - по key_skills (GIN-индекс,
+        оператор @>). Страницы выбираются по ключу (релевантность, id) без OFFSET,
+        поэтому глубокие страницы не дороже первой.
+        """
+        model = self.model_class
+        stmt = select(model)
+        if query.text:
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query.text)
+            rank = func.ts_rank_cd(model.search_vector, ts_query, type_=REAL)
+            stmt = stmt.where(model.search_vector.bool_op("@@")(ts_query))
+        else:
+            rank = cast(0, REAL)
+        if query.skills:
+            stmt = stmt.where(model.key_skills.contains(query.skills))
+        if query.cursor:
+            last_rank, last_id = decode_cursor(query.cursor)
+            stmt = stmt.where(tuple_(rank, model.id) < tuple_(cast(last_rank, REAL), last_id))
+        return (
+            stmt.add_columns(rank.label("rank"))
+            .options(raiseload("*"))
+            .order_by(rank.desc(), model.id.desc())
+            .limit(query.limit + 1)
+        )
+
+    async def search(self, query: VacancySearchDTO) -> VacancySearchPageDTO:
+        rows = (await self.session.execute(self.search_statement(query))).all()
+        page = rows[: query.limit]
+        next_cursor = None
+        if len(rows) > query.limit:
+            last_model, last_rank = page[-1]
+            next_cursor = encode_cursor(last_rank, last_model.id)
+        return VacancySearchPageDTO(
+            items=[self._to_entity(model) for model, _ in page], next_cursor=next_cursor
+        )
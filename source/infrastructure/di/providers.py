@@ -1,7 +1,8 @@
 from collections.abc import AsyncGenerator
 
+import httpx
 from aiogram.fsm.context import FSMContext
-from dishka import Provider, Scope, provide
+from dishka import AnyOf, Provider, Scope, provide
 from dishka.integrations.aiogram import AiogramMiddlewareData
 from hh_api.auth import KeyedTokenStore, OAuthConfig, RedisKeyedTokenStore
 from langgraph.checkpoint.memory import BaseCheckpointSaver
@@ -14,13 +15,21 @@ from source.application.repositories.resume import (
     IResumeRepository,
 )
 from source.application.repositories.user import IUserRepository
+from source.application.repositories.vacancy import IVacancyRepository
 from source.application.services.ai_service import IAIService
 from source.application.services.hh_service import IHHService
+from source.application.services.job_queue import IJobQueue
+from source.application.services.skill_matcher import ISkillMatcher
 from source.application.services.state_manager import IStateManager
 from source.application.use_cases.auth_hh import OAuthHHUseCase
 from source.application.use_cases.bot.authorization import AuthUseCase
 from source.application.use_cases.generate_response import GenerateResponseUseCase
+from source.application.use_cases.generate_responses_batch import GenerateResponsesBatchUseCase
 from source.application.use_cases.regenerate_response import RegenerateResponseUseCase
+from source.application.use_cases.search_vacancies import (
+    RankVacanciesUseCase,
+    SearchVacanciesUseCase,
+)
 from source.constants.keys import StorageKeys
 from source.domain.entities.resume import ResumeEntity
 from source.domain.entities.user import UserEntity
@@ -30,11 +39,38 @@ from source.infrastructure.db.repositories.resume import (
     ResumeRepository,
 )
 from source.infrastructure.db.repositories.user import UserRepository
+from source.infrastructure.db.repositories.vacancy import VacancyRepository
 from source.infrastructure.db.uow import UnitOfWork
 from source.infrastructure.services.ai_service import AIService
+from source.infrastructure.services.checkpoint_serde import CheckpointSerializer
+from source.infrastructure.services.entity_store import EntityStore
+from source.infrastructure.services.hh_cache import HHResponseCache
 from source.infrastructure.services.hh_service import CustomTokenManager, HHService
+from source.infrastructure.services.hh_store import HHRecordStore
+from source.infrastructure.services.hh_tokens import RedisLockProvider
+from source.infrastructure.services.job_queue import RedisJobQueue
+from source.infrastructure.services.llm_admission import LLMAdmissionController
+from source.infrastructure.services.llm_endpoints import build_llm_endpoints
+from source.infrastructure.services.response_cache import ResponseCache
+from source.infrastructure.services.skill_matcher import SkillMatcher
 from source.infrastructure.services.state_manager import StateManager
+from source.infrastructure.services.text_preprocessing import DescriptionPreprocessor
+from source.infrastructure.services.text_summarizer import ExtractiveSummarizer
 from source.infrastructure.settings.app import app_settings
+from source.infrastructure.utils.cache import TieredCache
+from source.infrastructure.utils.fetch_executor import FairFetchExecutor
+from source.infrastructure.utils.http_transport import InstrumentedTransport
+from source.infrastructure.utils.retry import RetryBudget, RetryPolicy
+from source.infrastructure.utils.single_flight import RedisFlightLock
+
+
+def retry_budget(upstream: str) -> RetryBudget:
+    return RetryBudget(
+        upstream,
+        ratio=app_settings.RETRY_BUDGET_RATIO,
+        window=app_settings.RETRY_BUDGET_WINDOW,
+        min_retries=app_settings.RETRY_BUDGET_MIN_RETRIES,
+    )
 
 
 class ServicesProviders(Provider):
@@ -50,25 +86,88 @@ class ServicesProviders(Provider):
         )
 
     @provide
-    def keyed_store(self) -> KeyedTokenStore:
+    async def redis_client(self) -> AsyncGenerator[Redis, None]:
         redis_client = Redis.from_url(app_settings.redis_url)
+        try:
+            yield redis_client
+        finally:
+            await redis_client.aclose()
+
+    @provide
+    def keyed_store(self, redis_client: Redis) -> KeyedTokenStore:
         return RedisKeyedTokenStore(redis_client)
 
     @provide
-    def custom_token_manager(
-        self, config: OAuthConfig, keyed_store: KeyedTokenStore
-    ) -> CustomTokenManager:
-        return CustomTokenManager(
+    async def custom_token_manager(
+        self, config: OAuthConfig, keyed_store: KeyedTokenStore, redis_client: Redis
+    ) -> AsyncGenerator[CustomTokenManager, None]:
+        token_manager = CustomTokenManager(
             config=config,
             store=keyed_store,
             user_agent="AI HR/1.0 (bykov100898@yandex.ru)",
+            lock_provider=RedisLockProvider(
+                RedisFlightLock(redis_client, "hh_tokens", ttl=app_settings.HH_TOKEN_LOCK_TTL)
+            ),
+            cache_size=app_settings.HH_TOKEN_CACHE_SIZE,
+            cache_ttl=app_settings.HH_TOKEN_CACHE_TTL,
+            refresh_ahead=app_settings.HH_TOKEN_REFRESH_AHEAD,
+        )
+        try:
+            yield token_manager
+        finally:
+            await token_manager.aclose()
+
+    @provide
+    def get_hh_response_cache(self, redis_client: Redis) -> HHResponseCache:
+        cache = TieredCache(
+            redis_client,
+            namespace="hh",
+            ttl=max(app_settings.HH_CACHE_TTLS.values(), default=0)
+            + app_settings.HH_CACHE_RETENTION,
+            lru_size=app_settings.HH_CACHE_LRU_SIZE,
+        )
+        return HHResponseCache(
+            cache, ttls=app_settings.HH_CACHE_TTLS, retention=app_settings.HH_CACHE_RETENTION
         )
 
     @provide
     async def get_hh_service(
-        self, token_manager: CustomTokenManager
+        self, token_manager: CustomTokenManager, hh_cache: HHResponseCache, redis_client: Redis
     ) -> AsyncGenerator[IHHService, None]:
-        hh_service = HHService(token_manager)
+        flight_lock = None
+        if app_settings.HH_SINGLE_FLIGHT_REDIS:
+            flight_lock = RedisFlightLock(redis_client, namespace="hh")
+        hh_service = HHService(
+            token_manager,
+            DescriptionPreprocessor(cache_size=app_settings.HH_DESCRIPTION_CACHE_SIZE),
+            ExtractiveSummarizer(cache_size=app_settings.HH_DESCRIPTION_CACHE_SIZE),
+            vacancy_token_budget=app_settings.HH_VACANCY_TOKEN_BUDGET,
+            employer_token_budget=app_settings.HH_EMPLOYER_TOKEN_BUDGET,
+            hh_cache=hh_cache,
+            flight_lock=flight_lock,
+            executor=FairFetchExecutor(
+                limit_per_host=app_settings.HH_CONCURRENCY_PER_HOST,
+                max_backoff=app_settings.HH_MAX_BACKOFF,
+            ),
+            transport=InstrumentedTransport(
+                "hh",
+                http2=app_settings.HH_HTTP2,
+                max_connections=app_settings.HH_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=app_settings.HH_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=app_settings.HH_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                app_settings.HH_READ_TIMEOUT, connect=app_settings.HH_CONNECT_TIMEOUT
+            ),
+            record_store=HHRecordStore(
+                async_session_maker,
+                refresh_after=app_settings.HH_STORE_REFRESH_AFTER,
+                max_staleness=app_settings.HH_STORE_MAX_STALENESS,
+            )
+            if app_settings.HH_STORE_ENABLED
+            else None,
+            retry_policy=RetryPolicy("hh", budget=retry_budget("hh")),
+        )
         try:
             yield hh_service
         finally:
@@ -80,13 +179,70 @@ class ServicesProviders(Provider):
             app_settings.redis_url,
             ttl={"default_ttl": app_settings.REDIS_CHECKPOINT_TTL},
         ) as checkpointer:
+            checkpointer.serde = CheckpointSerializer(
+                compress_threshold=app_settings.CHECKPOINT_COMPRESS_THRESHOLD
+            )
             await checkpointer.asetup()
             yield checkpointer
             await checkpointer.aclose()
 
     @provide
-    def get_ai_service(self, checkpointer: BaseCheckpointSaver) -> IAIService:
-        return AIService(checkpointer)
+    def get_response_cache(self, redis_client: Redis) -> ResponseCache:
+        cache = TieredCache(
+            redis_client,
+            namespace="responses",
+            ttl=app_settings.RESPONSE_CACHE_TTL,
+            lru_size=app_settings.RESPONSE_CACHE_LRU_SIZE,
+        )
+        return ResponseCache(cache)
+
+    @provide
+    def get_llm_admission(self, redis_client: Redis) -> LLMAdmissionController:
+        return LLMAdmissionController(
+            redis_client,
+            limits=app_settings.LLM_CONCURRENCY_LIMITS,
+            default_limit=app_settings.LLM_DEFAULT_CONCURRENCY,
+            lease_ttl=app_settings.LLM_SLOT_LEASE_TTL,
+            timeout=app_settings.LLM_ADMISSION_TIMEOUT,
+        )
+
+    @provide
+    def get_ai_service(
+        self,
+        checkpointer: BaseCheckpointSaver,
+        response_cache: ResponseCache,
+        admission: LLMAdmissionController,
+        redis_client: Redis,
+    ) -> IAIService:
+        endpoints = build_llm_endpoints(app_settings.llm_endpoints, redis_client)
+        entity_store = None
+        if app_settings.AI_STATE_ENTITY_REFS:
+            entity_store = EntityStore(
+                redis_client,
+                ttl=app_settings.AI_ENTITY_STORE_TTL,
+                lru_size=app_settings.AI_ENTITY_STORE_LRU_SIZE,
+            )
+        return AIService(
+            checkpointer,
+            response_cache,
+            admission,
+            endpoints=endpoints,
+            entity_store=entity_store,
+            retry_policy=RetryPolicy("llm", budget=retry_budget("llm")),
+        )
+
+    @provide(provides=AnyOf[IJobQueue, RedisJobQueue])
+    def get_job_queue(self, redis_client: Redis) -> RedisJobQueue:
+        return RedisJobQueue(
+            redis_client,
+            result_ttl=app_settings.JOB_RESULT_TTL,
+            visibility_timeout=app_settings.JOB_VISIBILITY_TIMEOUT,
+        )
+
+    @provide
+    def get_skill_matcher(self) -> ISkillMatcher:
+        # словарь навыков общий для процесса (сбрасывается при превышении max_entries)
+        return SkillMatcher()
 
     @provide
     def get_generate_urls_service(self) -> IStateManager:
@@ -102,7 +258,19 @@ class UseCasesProviders(Provider):
         hh_service: IHHService,
         ai_service: IAIService,
     ) -> GenerateResponseUseCase:
-        return GenerateResponseUseCase(hh_service, ai_service)
+        return GenerateResponseUseCase(
+            hh_service, ai_service, timeout=app_settings.AI_REQUEST_DEADLINE
+        )
+
+    @provide
+    def get_generate_responses_batch_use_case(
+        self,
+        hh_service: IHHService,
+        ai_service: IAIService,
+    ) -> GenerateResponsesBatchUseCase:
+        return GenerateResponsesBatchUseCase(
+            hh_service, ai_service, max_concurrency=app_settings.BATCH_MAX_CONCURRENCY
+        )
 
     @provide
     def get_regenerate_response_use_case(
@@ -110,7 +278,9 @@ class UseCasesProviders(Provider):
         hh_service: IHHService,
         ai_service: IAIService,
     ) -> RegenerateResponseUseCase:
-        return RegenerateResponseUseCase(hh_service, ai_service)
+        return RegenerateResponseUseCase(
+            hh_service, ai_service, timeout=app_settings.AI_REQUEST_DEADLINE
+        )
 
     @provide
     def get_oauth_hh_use_case(
@@ -122,6 +292,24 @@ class UseCasesProviders(Provider):
     ) -> OAuthHHUseCase:
         return OAuthHHUseCase(hh_service, state_manager, repository, uow)
 
+    @provide
+    def get_search_vacancies_use_case(
+        self,
+        uow: IUnitOfWork,
+        repository: type[IVacancyRepository],
+    ) -> SearchVacanciesUseCase:
+        return SearchVacanciesUseCase(uow, repository)
+
+    @provide
+    def get_rank_vacancies_use_case(
+        self,
+        uow: IUnitOfWork,
+        vacancy_repository: type[IVacancyRepository],
+        resume_repository: type[IResumeRepository],
+        matcher: ISkillMatcher,
+    ) -> RankVacanciesUseCase:
+        return RankVacanciesUseCase(uow, vacancy_repository, resume_repository, matcher)
+
 
 class RepositoriesProviders(Provider):
     scope = Scope.REQUEST
@@ -143,6 +331,10 @@ class RepositoriesProviders(Provider):
     def get_job_experience_repository(self) -> type[IJobExperienceRepository]:
         return JobExperienceRepository
 
+    @provide
+    def get_vacancy_repository(self) -> type[IVacancyRepository]:
+        return VacancyRepository
+
 
 class BotProvider(Provider):
     scope = Scope.REQUEST
@@ -0,0 +1,248 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from source.infrastructure.settings.app import app_settings
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkflowRun:
+    """Сводка одного запуска графа"""
+
+    user_id: int | None
+    vacancy_id: str | None
+    started: float
+    nodes: dict[str, float] = field(default_factory=dict)
+    llm_seconds: float = 0.0
+    llm_calls: dict[str, int] = field(default_factory=dict)
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+
+@dataclass
+class TrackedRun:
+    """Узел графа или вызов LLM внутри запуска"""
+
+    root_id: UUID
+    node: str | None
+    started: float
+    model: str | None = None
+
+
+class WorkflowInstrumentation(AsyncCallbackHandler):
+    """
+    Сбор метрик выполнения графа AIService через callbacks LangChain.
+
+    Для каждого узла записывается время выполнения (ai_node_seconds), для вызовов LLM -
+    время, токены, ошибки и оценка стоимости по ценам из LLM_PRICES.
+    Накладные расходы графа (checkpoint'ы, маршрутизация) - разница между временем всего
+    запуска и суммой времени узлов (ai_workflow_overhead_seconds).
+    Метрики агрегируются по узлам и моделям, сводка запуска с user_id и id вакансии
+    пишется в debug лог.
+
+    Запуски, для которых не пришло ни завершения, ни ошибки (например, отменённые по дедлайну
+    или при отключении клиента), удаляются спустя ttl секунд при старте следующего запуска.
+    """
+
+    def __init__(self, ttl: float = 3600.0):
+        self._ttl = ttl
+        self._workflows: dict[UUID, WorkflowRun] = {}
+        self._runs: dict[UUID, TrackedRun] = {}
+
+    def _evict_stale(self, now: float) -> None:
+        stale = {
+            run_id
+            for run_id, workflow in self._workflows.items()
+            if now - workflow.started > self._ttl
+        }
+        for run_id in stale:
+            del self._workflows[run_id]
+        if stale:
+            metrics.inc("ai_workflow_abandoned_total", len(stale))
+        for run_id in [
+            run_id
+            for run_id, run in self._runs.items()
+            if run.root_id in stale or now - run.started > self._ttl
+        ]:
+            del self._runs[run_id]
+
+    def _root_id(self, run_id: UUID, parent_run_id: UUID | None) -> UUID | None:
+        if parent_run_id is None:
+            return run_id
+        if parent_run_id in self._workflows:
+            return parent_run_id
+        parent = self._runs.get(parent_run_id)
+        return parent.root_id if parent else None
+
+    async def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        if parent_run_id is None:
+            now = time.perf_counter()
+            self._evict_stale(now)
+            vacancy = inputs.get("vacancy") if isinstance(inputs, dict) else None
+            self._workflows[run_id] = WorkflowRun(
+                user_id=metadata.get("user_id"),
+                vacancy_id=metadata.get("vacancy_id") or getattr(vacancy, "hh_id", None),
+                started=now,
+            )
+            return
+        root_id = self._root_id(run_id, parent_run_id)
+        if root_id is None:
+            return
+        node = metadata.get("langgraph_node")
+        # узлом считается только сам запуск узла, а не вложенные в него цепочки
+        is_node = node is not None and kwargs.get("name") == node
+        self._runs[run_id] = TrackedRun(root_id, node if is_node else None, time.perf_counter())
+
+    async def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        workflow = self._workflows.pop(run_id, None)
+        if workflow is not None:
+            self._finish_workflow(workflow)
+            return
+        run = self._runs.pop(run_id, None)
+        if run is None or run.node is None:
+            return
+        elapsed = time.perf_counter() - run.started
+        metrics.observe("ai_node_seconds", elapsed, node=run.node)
+        workflow = self._workflows.get(run.root_id)
+        if workflow is not None:
+            workflow.nodes[run.node] = workflow.nodes.get(run.node, 0.0) + elapsed
+
+    async def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        workflow = self._workflows.pop(run_id, None)
+        if workflow is not None:
+            metrics.inc("ai_workflow_errors_total", error=type(error).__name__)
+            return
+        run = self._runs.pop(run_id, None)
+        if run is not None and run.node is not None:
+            metrics.inc("ai_node_errors_total", node=run.node, error=type(error).__name__)
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any] | None,
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        root_id = self._root_id(run_id, parent_run_id)
+        if root_id is None:
+            return
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node")
+        self._runs[run_id] = TrackedRun(
+            root_id, node, time.perf_counter(), model=metadata.get("ls_model_name")
+        )
+        workflow = self._workflows.get(root_id)
+        if workflow is not None and node is not None:
+            workflow.llm_calls[node] = workflow.llm_calls.get(node, 0) + 1
+            if workflow.llm_calls[node] > 1:
+                # повторный вызов LLM в том же узле - повтор или переключение эндпоинта
+                metrics.inc("ai_llm_retries_total", node=node)
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        elapsed = time.perf_counter() - run.started
+        model = run.model or "unknown"
+        usage = self._usage(response)
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        cost = self.estimate_cost(model, input_tokens, cached_tokens, output_tokens)
+        # вызовы вне узлов графа не попадают в метрики по узлам, но учитываются в сводке запуска
+        if run.node is not None:
+            labels = {"node": run.node, "model": model}
+            metrics.observe("ai_llm_seconds", elapsed, **labels)
+            metrics.inc("ai_llm_prompt_tokens_total", input_tokens, **labels)
+            metrics.inc("ai_llm_completion_tokens_total", output_tokens, **labels)
+            # часть входных токенов, взятая из кэша промптов провайдера
+            metrics.inc("ai_llm_cached_tokens_total", cached_tokens, **labels)
+            metrics.inc("ai_llm_cost_usd_total", cost, **labels)
+        workflow = self._workflows.get(run.root_id)
+        if workflow is not None:
+            workflow.llm_seconds += elapsed
+            workflow.input_tokens += input_tokens
+            workflow.cached_tokens += cached_tokens
+            workflow.output_tokens += output_tokens
+            workflow.cost += cost
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is not None and run.node is not None:
+            metrics.inc(
+                "ai_llm_errors_total",
+                node=run.node,
+                model=run.model or "unknown",
+                error=type(error).__name__,
+            )
+
+    @staticmethod
+    def _usage(response: LLMResult) -> dict[str, Any]:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    return usage
+        return {}
+
+    @staticmethod
+    def estimate_cost(
+        model: str, input_tokens: int, cached_tokens: int, output_tokens: int
+    ) -> float:
+        """Оценка стоимости вызова в долларах по ценам из LLM_PRICES (за 1 млн токенов)"""
+        prices = app_settings.LLM_PRICES.get(model)
+        if not prices:
+            return 0.0
+        input_price = prices.get("input", 0.0)
+        cached_price = prices.get("cached_input", input_price)
+        return (
+            (input_tokens - cached_tokens) * input_price
+            + cached_tokens * cached_price
+            + output_tokens * prices.get("output", 0.0)
+        ) / 1_000_000
+
+    @staticmethod
+    def _finish_workflow(workflow: WorkflowRun) -> None:
+        elapsed = time.perf_counter() - workflow.started
+        overhead = max(elapsed - sum(workflow.nodes.values()), 0.0)
+        metrics.observe("ai_workflow_seconds", elapsed)
+        metrics.observe("ai_workflow_overhead_seconds", overhead)
+        logger.debug(
+            "Workflow finished: user_id=%s, vacancy_id=%s, total=%.3fs, overhead=%.3fs, "
+            "nodes=%s, llm=%.3fs (calls=%s), tokens: input=%s (cached=%s), output=%s, "
+            "cost=$%.6f",
+            workflow.user_id,
+            workflow.vacancy_id,
+            elapsed,
+            overhead,
+            {node: round(seconds, 3) for node, seconds in workflow.nodes.items()},
+            workflow.llm_seconds,
+            sum(workflow.llm_calls.values()),
+            workflow.input_tokens,
+            workflow.cached_tokens,
+            workflow.output_tokens,
+            workflow.cost,
+        )
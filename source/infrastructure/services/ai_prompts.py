@@ -0,0 +1,117 @@
+from collections.abc import Mapping
+from typing import Any
+
+from langchain.prompts import PromptTemplate
+from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage
+
+# Версия промптов. Нужно увеличивать при любом изменении шаблонов,
+# так как она входит в ключ кэша сгенерированных откликов
+PROMPT_VERSION = "3"
+
+# Стабильная часть промпта: одинакова для всех вакансий одного пользователя,
+# поэтому провайдер может переиспользовать ее между запросами (prefix caching)
+SYSTEM_PROMPT = PromptTemplate(
+    input_variables=["resume", "user_rules"],
+    template="""
+            Ты мой помощник в написании сопроводительных писем к вакансиям.
+            Письмо составляй учитывая следующую информацию: \n
+
+            1. мое резюме {resume};\n
+            2. описание вакансии и работодателя (если оно есть) из моего сообщения;\n
+            3. мои правила по составлению сопроводительного {user_rules};\n
+
+            Также в конце нужно обязательно добавить абзац про мою мотивацию работы у работодателя
+            опираясь на информацию из вакансии и описание работодателя (если оно есть).
+            """,
+)
+
+# Переменная часть промпта: своя для каждой вакансии
+VACANCY_PROMPT = PromptTemplate(
+    input_variables=["vacancy", "employer"],
+    template="""
+            Составь сопроводительное письмо к этой вакансии: {vacancy}\n
+            Описание работодателя: {employer}\n
+            """,
+)
+
+REGENERATE_PROMPT = PromptTemplate(
+    input_variables=["user_comments"],
+    template="""
+            Скорректируй последний вариант сопроводительного письма с учетом моих замечаний:
+            {user_comments}\n
+            По-прежнему учитывай вакансию, мое резюме, описание работодателя и мои правила.
+            В ответе верни только исправленное письмо.
+            """,
+)
+
+SUMMARIZE_PROMPT = PromptTemplate(
+    input_variables=[],
+    template="""
+            Выше история исправлений сопроводительного письма.
+            Кратко перечисли все мои замечания, которые нужно соблюдать в следующих вариантах
+            письма. Верни только список замечаний, без текста самого письма.
+            """,
+)
+
+# Короткий запрос на исправление письма, которое не удалось привести к правилам локально.
+# Контекст (резюме, вакансия) не передается - нужно только поправить готовый текст
+FIX_RULES_PROMPT = PromptTemplate(
+    input_variables=["response", "violations"],
+    template="""
+            Исправь сопроводительное письмо, в нем нарушены правила: {violations}.\n
+            Сохрани смысл, стиль и последний абзац про мотивацию, ничего не добавляй.
+            В ответе верни только исправленное письмо.\n
+            Письмо:\n{response}
+            """,
+)
+
+
+class PromptBuilder:
+    """
+    Сборка сообщений для LLM.
+
+    Контекст генерации состоит из двух сообщений: системного (инструкции, резюме и правила -
+    общий префикс для всех вакансий пользователя) и пользовательского (вакансия и работодатель).
+    Шаблоны создаются один раз при импорте модуля.
+    """
+
+    @staticmethod
+    def context(state: Mapping[str, Any]) -> list[AnyMessage]:
+        return [
+            SystemMessage(content=SYSTEM_PROMPT.format(**state)),
+            HumanMessage(content=VACANCY_PROMPT.format(**state)),
+        ]
+
+    @staticmethod
+    def regenerate(state: Mapping[str, Any]) -> HumanMessage:
+        return HumanMessage(content=REGENERATE_PROMPT.format(**state))
+
+    @staticmethod
+    def summarize() -> HumanMessage:
+        return HumanMessage(content=SUMMARIZE_PROMPT.format())
+
+    @staticmethod
+    def fix_rules(response: str, violations: list[str]) -> HumanMessage:
+        return HumanMessage(
+            content=FIX_RULES_PROMPT.format(response=response, violations="; ".join(violations))
+        )
+
+    @staticmethod
+    def with_cache_control(messages: list[AnyMessage]) -> list[AnyMessage]:
+        """
+        Помечает системное сообщение маркером cache_control.
+
+        Нужен провайдерам с явным кэшированием промптов (Anthropic, Gemini через OpenRouter),
+        OpenAI кэширует префикс автоматически. Сохраненная история не изменяется.
+        """
+        marked = []
+        for message in messages:
+            if isinstance(message, SystemMessage) and isinstance(message.content, str):
+                block = {
+                    "type": "text",
+                    "text": message.content,
+                    "cache_control": {"type": "ephemeral"},
+                }
+                message = message.model_copy(update={"content": [block]})
+            marked.append(message)
+        return marked
@@ -1,35 +1,67 @@
-import asyncio
+import contextlib
 import logging
-import random
-from typing import TypedDict
+import time
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager
+from typing import Annotated, Any, TypedDict
 
 import openai
-from langchain.prompts import PromptTemplate
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    AnyMessage,
+    HumanMessage,
+    RemoveMessage,
+)
 from langchain_core.messages.base import BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
 from langchain_core.runnables import RunnableConfig
-from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.memory import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import REMOVE_ALL_MESSAGES, add_messages
 from langgraph.graph.state import CompiledStateGraph
 
-from source.application.services.ai_service import GenerateResponseData, IAIService
+from source.application.deadline import DeadlineExceededError, current_deadline
+from source.application.services.ai_service import (
+    GenerateResponseData,
+    IAIService,
+    LLMPriority,
+    ResponseStreamChunk,
+)
 from source.domain.entities.employer import EmployerEntity
 from source.domain.entities.response import ResponseToVacancyEntity
 from source.domain.entities.resume import ResumeEntity
 from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.ai_instrumentation import WorkflowInstrumentation
+from source.infrastructure.services.ai_prompts import PROMPT_VERSION, PromptBuilder
+from source.infrastructure.services.entity_store import EntityNotFoundError, EntityStore
+from source.infrastructure.services.llm_admission import LLMAdmissionController
+from source.infrastructure.services.llm_endpoints import LLMEndpoint, build_llm_endpoints
+from source.infrastructure.services.response_cache import ResponseCache
+from source.infrastructure.services.response_rules import ResponseRules, ResponseRulesEnforcer
 from source.infrastructure.settings.app import app_settings
+from source.infrastructure.utils.circuit_breaker import CircuitOpenError, CircuitPermit
+from source.infrastructure.utils.distributed_semaphore import AdmissionTimeoutError
+from source.infrastructure.utils.metrics import metrics
+from source.infrastructure.utils.retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+ENTITY_FIELDS = ("vacancy", "resume", "employer")
+
 
 class AIServiceState(TypedDict):
-    vacancy: VacancyEntity
-    resume: ResumeEntity
-    employer: EmployerEntity
+    # сущности или ссылки на них в EntityStore (если хранилище подключено)
+    vacancy: VacancyEntity | str
+    resume: ResumeEntity | str
+    employer: EmployerEntity | str
     user_rules: dict
     response: str | None
     user_comments: str | None
+    # Диалог с LLM после контекста: варианты письма и замечания пользователя.
+    # Контекст (вакансия, резюме, работодатель, правила) не хранится, а каждый раз
+    # собирается из сущностей. Исправление отправляет в LLM историю и только новые замечания
+    messages: Annotated[list[AnyMessage], add_messages]
 
 
 def gen_png_graph(app_obj, schema_path: str = f"{app_settings.BASE_DIR}/schema_graph.png") -> None:
@@ -46,29 +78,52 @@ def gen_png_graph(app_obj, schema_path: str = f"{app_settings.BASE_DIR}/schema_g
 
 
 class AIService(IAIService):
-    def __init__(self, checkpointer: BaseCheckpointSaver, create_png_graph: bool = False):
+    # узлы графа, токены которых отдаются клиенту при потоковой генерации
+    STREAMING_NODES = frozenset({"generate_response", "regenerate_response"})
+
+    def __init__(
+        self,
+        checkpointer: BaseCheckpointSaver,
+        response_cache: ResponseCache | None = None,
+        admission: LLMAdmissionController | None = None,
+        endpoints: list[LLMEndpoint] | None = None,
+        entity_store: EntityStore | None = None,
+        rules_enforcer: ResponseRulesEnforcer | None = None,
+        retry_policy: RetryPolicy | None = None,
+        create_png_graph: bool = False,
+    ):
+        self._endpoints = endpoints or build_llm_endpoints(app_settings.llm_endpoints)
         logger.debug(
-            "Инициализация LLM модели: %s\nBase URL модели: %s",
-            app_settings.OPENAI_MODEL,
-            app_settings.OPENROUTER_BASE_URL,
-        )
-        self.llm = ChatOpenAI(
-            model=app_settings.OPENAI_MODEL,
-            temperature=0.7,
-            api_key=app_settings.OPENROUTER_API_KEY,
-            base_url=app_settings.OPENROUTER_BASE_URL,
+            "Инициализация LLM эндпоинтов: %s",
+            ", ".join(f"{endpoint.name} ({endpoint.model})" for endpoint in self._endpoints),
         )
+        self._response_cache = response_cache
+        self._admission = admission
+        self._entity_store = entity_store
+        self._rules_enforcer = rules_enforcer or ResponseRulesEnforcer()
+        self._retry_policy = retry_policy or RetryPolicy("llm", max_attempts=3)
+        self._instrumentation = WorkflowInstrumentation()
         self._workflow = self._build_workflow(checkpointer)
         logger.debug("The workflow is built")
         if create_png_graph:
             gen_png_graph(self._workflow)
 
     @staticmethod
-    def _get_config(user_id: int) -> RunnableConfig:
+    def _get_config(
+        user_id: int,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        vacancy_id: str | None = None,
+        isolated: bool = False,
+    ) -> RunnableConfig:
+        thread_id = f"user_{user_id}"
+        if isolated:
+            thread_id = f"{thread_id}_vacancy_{vacancy_id}"
         return RunnableConfig(
             configurable={
-                "thread_id": f"user_{user_id}",
-            }
+                "thread_id": thread_id,
+                "priority": priority,
+            },
+            metadata={"user_id": user_id, "vacancy_id": vacancy_id},
         )
 
     def _build_workflow(self, checkpointer: BaseCheckpointSaver) -> CompiledStateGraph:
@@ -76,208 +131,553 @@ class AIService(IAIService):
         workflow.add_node("fake_node", lambda x: x)
         workflow.add_node("generate_response", self._generate_response_node)
         workflow.add_node("regenerate_response", self._regenerate_response_node)
+        workflow.add_node("summarize_history", self._summarize_history_node)
+        workflow.add_node("enforce_rules", self._enforce_rules_node)
 
         workflow.add_conditional_edges(
             "fake_node",
             self._check_exist_response,
             {
                 "generate_response": "generate_response",
+                "summarize_history": "summarize_history",
                 "regenerate_response": "regenerate_response",
             },
         )
         workflow.add_edge(START, "fake_node")
-        workflow.add_edge("generate_response", END)
-        workflow.add_edge("regenerate_response", END)
-        return workflow.compile(checkpointer=checkpointer)
+        workflow.add_edge("summarize_history", "regenerate_response")
+        workflow.add_edge("generate_response", "enforce_rules")
+        workflow.add_edge("regenerate_response", "enforce_rules")
+        workflow.add_edge("enforce_rules", END)
+        compiled = workflow.compile(checkpointer=checkpointer)
+        return compiled.with_config(callbacks=[self._instrumentation])
 
-    @staticmethod
-    def _check_exist_response(state: AIServiceState) -> str:
-        if "response" in state and "user_comments" in state:
+    @classmethod
+    def _check_exist_response(cls, state: AIServiceState) -> str:
+        if state.get("response") and state.get("user_comments"):
+            # контекст в бюджет не входит - он нужен всегда
+            history_tokens = count_tokens_approximately(cls._history(state))
+            if history_tokens > app_settings.AI_HISTORY_TOKEN_BUDGET:
+                logger.debug("History is over budget: ~%s tokens", history_tokens)
+                return "summarize_history"
             return "regenerate_response"
         return "generate_response"
 
-    async def _request_llm(self, messages: list[BaseMessage]) -> BaseMessage | None:
+    @classmethod
+    def _history(cls, state: AIServiceState) -> list[AnyMessage]:
+        """
+        История диалога, которая заканчивается исправляемым вариантом письма.
+
+        Если истории нет (состояние собрано заново) или она не совпадает с присланным
+        вариантом письма, история начинается заново с этого варианта.
+        """
+        messages = state.get("messages") or []
+        if messages and isinstance(messages[-1], AIMessage):
+            if messages[-1].content == state["response"]:
+                return messages
+        return [AIMessage(content=state["response"])]
+
+    async def _context(self, state: AIServiceState) -> list[AnyMessage]:
+        entities = await self._load_entities(state)
+        return PromptBuilder.context({**state, **entities})
+
+    def _llm_slot(
+        self, endpoint: LLMEndpoint, priority: LLMPriority, timeout: float | None = None
+    ) -> AbstractAsyncContextManager:
+        if self._admission is None:
+            return contextlib.nullcontext()
+        return self._admission.slot(endpoint.name, priority, timeout)
+
+    @staticmethod
+    def _retry_after(error: openai.APIStatusError, default: float) -> float:
+        """Время ожидания из заголовка Retry-After ответа провайдера"""
+        try:
+            return float(error.response.headers.get("retry-after", default))
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    async def _report(
+        endpoint: LLMEndpoint,
+        permit: CircuitPermit | None,
+        outcome: str,
+        duration: float = 0.0,
+    ) -> None:
+        """
+        Учитывает результат запроса к эндпоинту в метриках и circuit breaker'е.
+
+        success - эндпоинт ответил, failure - сбой эндпоинта, остальные исходы
+        (429, ожидание слота, ошибка в самом запросе) не говорят о его неисправности.
+        """
+        metrics.inc("llm_endpoint_requests_total", endpoint=endpoint.name, outcome=outcome)
+        if outcome == "success":
+            metrics.observe("llm_endpoint_request_seconds", duration, endpoint=endpoint.name)
+        if endpoint.breaker is None or permit is None:
+            return
+        if outcome == "success":
+            await endpoint.breaker.record_success(permit, duration)
+        elif outcome == "failure":
+            await endpoint.breaker.record_failure(permit)
+        else:
+            await endpoint.breaker.release(permit)
+
+    async def _request_llm(
+        self, messages: list[BaseMessage], config: RunnableConfig
+    ) -> BaseMessage:
         """
-        Отправляет запрос к LLM с экспоненциальными ретраями и,
-        где это возможно, восстанавливается после временных сбоев.
+        Отправляет запрос к LLM, перебирая эндпоинты в порядке приоритета.
+
+        Эндпоинт, отключенный circuit breaker'ом, пропускается без ожидания таймаутов.
+        При сбое эндпоинта запрос сразу переходит к следующему, а пауза с backoff делается
+        только после того, как не ответил ни один эндпоинт.
+
+        Каждый запрос проходит через контроль допуска (общий для всех процессов лимит
+        одновременных запросов с приоритетами). При 429 допуск к эндпоинту приостанавливается
+        для всех процессов на время из Retry-After.
+
+        Если задан срок обработки запроса (current_deadline), ожидание слота и таймаут запроса
+        сокращаются до оставшегося времени, а повторы, не укладывающиеся в срок, не выполняются.
         """
-        max_attempts = 5
-        base_delay = 0.5
-        max_delay = 8.0
+        priority = config["configurable"].get("priority", LLMPriority.INTERACTIVE)
+        deadline = current_deadline()
+        max_attempts = self._retry_policy.max_attempts
+        last_exc: Exception | None = None
+        # эндпоинты с ошибкой конфигурации (ключ, модель) не повторяем в рамках запроса
+        excluded: set[str] = set()
 
+        self._retry_policy.record_request()
         for attempt in range(1, max_attempts + 1):
-            try:
-                logger.debug("LLM request attempt=%s", attempt)
-                return await self.llm.ainvoke(messages)
-            except openai.BadRequestError as e:
-                logger.error(
-                    "LLM отклонил запрос: вероятно, ошибка в промпте или параметрах. request_id=%s",
-                    getattr(e, "request_id", None),
-                    exc_info=e,
-                )
-                raise
-            except openai.AuthenticationError as e:
-                logger.critical(
-                    "LLM отклонил запрос из-за авторизации. Проверь API-ключ/лимиты. request_id=%s",
-                    getattr(e, "request_id", None),
-                    exc_info=e,
-                )
-                raise
-            except openai.NotFoundError as e:
-                logger.error(
-                    "LLM не смог найти указанный ресурс (модель или эндпоинт). request_id=%s",
-                    getattr(e, "request_id", None),
-                    exc_info=e,
-                )
-                raise
-            except openai.APIStatusError as e:
-                status_code = e.status_code or 0
-                if status_code < 500:
+            tried = False
+            rate_limit_delay = 0.0
+            for endpoint in self._endpoints:
+                if endpoint.name in excluded:
+                    continue
+                timeout = deadline.timeout(endpoint.timeout) if deadline else None
+                permit = await endpoint.breaker.allow() if endpoint.breaker else None
+                if endpoint.breaker and permit is None:
+                    logger.debug("LLM endpoint=%s отключен circuit breaker'ом", endpoint.name)
+                    continue
+                tried = True
+                started = time.monotonic()
+                try:
+                    logger.debug(
+                        "LLM request endpoint=%s, attempt=%s, priority=%s",
+                        endpoint.name,
+                        attempt,
+                        priority.name,
+                    )
+                    request = messages
+                    if endpoint.cache_control:
+                        request = PromptBuilder.with_cache_control(messages)
+                    async with self._llm_slot(endpoint, priority, timeout):
+                        started = time.monotonic()
+                        if deadline is None:
+                            response = await endpoint.llm.ainvoke(request)
+                        else:
+                            response = await endpoint.llm.ainvoke(
+                                request, timeout=deadline.timeout(endpoint.timeout)
+                            )
+                except openai.BadRequestError as e:
+                    await self._report(endpoint, permit, "bad_request")
                     logger.error(
-                        "LLM вернул контролируемый статус %s, повтор не имеет смысла. "
-                        "request_id=%s",
+                        "LLM отклонил запрос: вероятно, ошибка в промпте или параметрах. "
+                        "endpoint=%s, request_id=%s",
+                        endpoint.name,
+                        getattr(e, "request_id", None),
+                        exc_info=e,
+                    )
+                    raise
+                except (
+                    openai.AuthenticationError,
+                    openai.PermissionDeniedError,
+                    openai.NotFoundError,
+                ) as e:
+                    await self._report(endpoint, permit, "failure")
+                    last_exc = e
+                    excluded.add(endpoint.name)
+                    logger.critical(
+                        "LLM endpoint=%s отклонил запрос (статус %s). Проверь API-ключ, лимиты "
+                        "и имя модели. request_id=%s",
+                        endpoint.name,
+                        e.status_code,
+                        getattr(e, "request_id", None),
+                        exc_info=e,
+                    )
+                except openai.RateLimitError as e:
+                    await self._report(endpoint, permit, "rate_limited")
+                    last_exc = e
+                    retry_after = self._retry_after(
+                        e, default=self._retry_policy.delay(attempt + 1)
+                    )
+                    rate_limit_delay = max(rate_limit_delay, retry_after)
+                    logger.warning(
+                        "LLM endpoint=%s ограничил частоту запросов (attempt=%s/%s). request_id=%s",
+                        endpoint.name,
+                        attempt,
+                        max_attempts,
+                        getattr(e, "request_id", None),
+                    )
+                    if self._admission is not None:
+                        await self._admission.cooldown(endpoint.name, retry_after)
+                except AdmissionTimeoutError as e:
+                    await self._report(endpoint, permit, "admission_timeout")
+                    if deadline is not None and deadline.expired:
+                        raise DeadlineExceededError("Время обработки запроса истекло") from e
+                    last_exc = e
+                    logger.warning("Не дождались слота LLM endpoint=%s", endpoint.name)
+                except openai.APIStatusError as e:
+                    status_code = e.status_code or 0
+                    if status_code < 500:
+                        await self._report(endpoint, permit, "client_error")
+                        logger.error(
+                            "LLM endpoint=%s вернул контролируемый статус %s, повтор не имеет "
+                            "смысла. request_id=%s",
+                            endpoint.name,
+                            status_code,
+                            getattr(e, "request_id", None),
+                            exc_info=e,
+                        )
+                        raise
+                    await self._report(endpoint, permit, "failure")
+                    last_exc = e
+                    logger.warning(
+                        "LLM endpoint=%s вернул статус %s (attempt=%s/%s). request_id=%s",
+                        endpoint.name,
                         status_code,
+                        attempt,
+                        max_attempts,
                         getattr(e, "request_id", None),
                         exc_info=e,
                     )
+                except (
+                    TimeoutError,
+                    openai.APIConnectionError,
+                    openai.APITimeoutError,
+                ) as e:
+                    if deadline is not None and deadline.expired:
+                        # таймаут сокращен до срока запроса - эндпоинт в этом не виноват
+                        await self._report(endpoint, permit, "deadline")
+                        raise DeadlineExceededError("Время обработки запроса истекло") from e
+                    await self._report(endpoint, permit, "failure")
+                    last_exc = e
+                    logger.warning(
+                        "Временный сбой при обращении к LLM endpoint=%s (attempt=%s/%s). "
+                        "request_id=%s",
+                        endpoint.name,
+                        attempt,
+                        max_attempts,
+                        getattr(e, "request_id", None),
+                        exc_info=e,
+                    )
+                except openai.OpenAIError as e:
+                    await self._report(endpoint, permit, "error")
+                    logger.exception(
+                        "Непредвиденная ошибка OpenAI SDK. endpoint=%s, request_id=%s",
+                        endpoint.name,
+                        getattr(e, "request_id", None),
+                    )
                     raise
-                logger.warning(
-                    "LLM вернул статус %s. Повтор запроса (attempt=%s/%s). request_id=%s",
-                    status_code,
-                    attempt,
-                    max_attempts,
-                    getattr(e, "request_id", None),
-                    exc_info=e,
-                )
-            except (
-                TimeoutError,
-                openai.APIConnectionError,
-                openai.APITimeoutError,
-                openai.RateLimitError,
-            ) as e:
-                logger.warning(
-                    "Временный сбой при обращении к LLM. Повтор запроса "
-                    "(attempt=%s/%s). request_id=%s",
-                    attempt,
-                    max_attempts,
-                    getattr(e, "request_id", None),
-                    exc_info=e,
-                )
-            except openai.OpenAIError as e:
-                logger.exception(
-                    "Непредвиденная ошибка OpenAI SDK. request_id=%s",
-                    getattr(e, "request_id", None),
-                )
-                raise
+                except BaseException:
+                    # отмена запроса не должна оставлять занятым пробный запрос breaker'а
+                    await self._report(endpoint, permit, "cancelled")
+                    raise
+                else:
+                    await self._report(endpoint, permit, "success", time.monotonic() - started)
+                    if endpoint is not self._endpoints[0]:
+                        metrics.inc("llm_failover_total", endpoint=endpoint.name)
+                        logger.info("LLM-запрос обслужен резервным endpoint=%s", endpoint.name)
+                    return response
+                logger.info("Переключаемся на следующий LLM endpoint после %s", endpoint.name)
 
-            if attempt == max_attempts:
-                logger.error(
-                    "LLM-запрос не удался после %s попыток. Сообщаем об ошибке наверх.",
-                    max_attempts,
-                )
-                raise
-
-            exponential_delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
-            jitter = random.uniform(0, base_delay)
-            sleep_for = exponential_delay + jitter
-            logger.debug("Ожидаем %.2f секунд перед следующим повтором LLM-запроса", sleep_for)
-            await asyncio.sleep(sleep_for)
-
-        return None
-
-    async def _generate_response_node(self, state: AIServiceState) -> dict[str, str]:
-        prompt = PromptTemplate(
-            input_variables=[
-                "vacancy",
-                "resume",
-                "employer",
-                "user_rules",
-            ],
-            template="""
-            Ты мой помощник в написании сопроводительных писем.
-            Тебе нужно составить сопроводительное письмо к этой вакансии: {vacancy}\n
-            Письмо составляй учитывая следующую информацию: \n
-
-            1. мое резюме {resume};\n
-            2. описание работодателя если оно есть {employer}\n
-            3. мои правила по составлению сопроводительного {user_rules};\n
-
-            Также в конце нужно обязательно добавить абзац про мою мотивацию работы у работодателя
-            опираясь на информацию из вакансии и описание работодателя (если оно есть).
-            """,
+            if not tried:
+                # все эндпоинты отключены - отказываем сразу, не дожидаясь таймаутов
+                logger.error("Нет доступных LLM эндпоинтов (attempt=%s/%s)", attempt, max_attempts)
+                break
+
+            sleep_for = self._retry_policy.delay(attempt)
+            if self._admission is None:
+                # без контроля допуска паузу после 429 выдерживаем сами
+                sleep_for = max(sleep_for, rate_limit_delay)
+            # повтор ограничен числом попыток, бюджетом повторов и сроком обработки запроса
+            if not await self._retry_policy.backoff(attempt, sleep_for):
+                break
+
+        logger.error(
+            "LLM-запрос не удался после %s попыток. Сообщаем об ошибке наверх.",
+            attempt,
         )
-        message = HumanMessage(content=prompt.format(**state))
-        logger.debug("Prompt formatted: %s", message.content[:50])
-        response = await self._request_llm([message])
-        return {"response": response.content}
-
-    async def _regenerate_response_node(self, state: AIServiceState) -> dict[str, str]:
-        prompt = PromptTemplate(
-            input_variables=[
-                "vacancy",
-                "resume",
-                "employer",
-                "user_rules",
-                "response",
-                "user_comments",
+        if last_exc is None:
+            raise CircuitOpenError("Все LLM эндпоинты временно отключены")
+        raise last_exc
+
+    async def _generate_response_node(
+        self, state: AIServiceState, config: RunnableConfig
+    ) -> dict[str, str | list[AnyMessage]]:
+        response = await self._request_llm(await self._context(state), config)
+        return {
+            "response": response.content,
+            # новая генерация начинает диалог заново
+            "messages": [
+                RemoveMessage(id=REMOVE_ALL_MESSAGES),
+                AIMessage(content=response.content),
             ],
-            template="""
-            Ты мой помощник в написании сопроводительных писем.
-            Скорректируй этот ответ: {response}\n
-            В исправлении учитывай следующую информацию: \n
-
-            1. мои замечания {user_comments}\n
-            2. описание вакансии {vacancy}\n
-            3. мое резюме {resume};\n
-            4. описание работодателя если оно есть {employer}\n
-            5. мои правила по составлению сопроводительного {user_rules};\n
-            """,
+        }
+
+    async def _regenerate_response_node(
+        self, state: AIServiceState, config: RunnableConfig
+    ) -> dict[str, str | list[AnyMessage]]:
+        history = self._history(state)
+        message = PromptBuilder.regenerate(state)
+        response = await self._request_llm([*await self._context(state), *history, message], config)
+        new_messages = [message, AIMessage(content=response.content)]
+        if history is not state.get("messages"):
+            new_messages = [RemoveMessage(id=REMOVE_ALL_MESSAGES), *history, *new_messages]
+        return {"response": response.content, "messages": new_messages}
+
+    async def _summarize_history_node(
+        self, state: AIServiceState, config: RunnableConfig
+    ) -> dict[str, list[AnyMessage]]:
+        """
+        Сворачивает прошлые варианты письма и замечания в краткий список замечаний.
+        Контекст и исправляемый вариант письма остаются без изменений.
+        """
+        history = self._history(state)
+        turns, last_response = history[:-1], history[-1]
+        # контекст оставляем первым: диалог должен начинаться с сообщения пользователя,
+        # а общий префикс с остальными запросами переиспользуется провайдером
+        context = await self._context(state)
+        response = await self._request_llm([*context, *turns, PromptBuilder.summarize()], config)
+        logger.debug("History summarized: %s turns -> %s", len(turns), response.content[:100])
+        summary = HumanMessage(
+            content=f"Мои замечания к прошлым вариантам письма:\n{response.content}"
         )
-        message = HumanMessage(content=prompt.format(**state))
-        logger.debug("Prompt formatted: %s", message.content[:50])
-        response = await self._request_llm([message])
-        return {"response": response.content}
-
-    async def generate_response(self, data: GenerateResponseData) -> ResponseToVacancyEntity:
-        start_state = AIServiceState(**data)
-        config = self._get_config(data["user_id"])
-        logger.debug("Generate response to vacancy=%s", start_state["vacancy"].name)
-        result: AIServiceState = await self._workflow.ainvoke(start_state, config=config)  # type: ignore
-        logger.debug("Generated response: %s", result["response"])
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), summary, last_response]}
+
+    async def _enforce_rules_node(
+        self, state: AIServiceState, config: RunnableConfig
+    ) -> dict[str, str | list[AnyMessage]]:
+        """
+        Проверяет письмо по правилам пользователя (длина, запрещенные фразы, обязательный
+        абзац) и исправляет нарушения локально. Короткий запрос к LLM без контекста
+        делается, только если письмо нельзя исправить без потери смысла.
+        """
+        rules = ResponseRules.from_user_rules(state["user_rules"])
+        response = state["response"]
+        result = self._rules_enforcer.enforce(response, rules)
+        outcome = "repaired" if result.repaired else "ok"
+        if result.violations:
+            logger.debug("Response violates rules: %s", "; ".join(result.violations))
+            fixed = await self._request_llm(
+                [PromptBuilder.fix_rules(response, result.violations)], config
+            )
+            # ответ LLM дорабатываем локально без ограничения на объем сокращения
+            result = self._rules_enforcer.enforce(fixed.content, rules, max_trim_ratio=1.0)
+            outcome = "violated" if result.violations else "llm_fixed"
+            if result.violations:
+                logger.warning("Response still violates rules: %s", "; ".join(result.violations))
+        metrics.inc("response_rules_total", result=outcome)
+        if result.text == response:
+            return {}
+        # заменяем последний вариант письма в истории (сообщение с тем же id)
+        last_message = state["messages"][-1]
+        return {
+            "response": result.text,
+            "messages": [AIMessage(content=result.text, id=last_message.id)],
+        }
+
+    async def _load_entities(self, state: AIServiceState) -> dict[str, Any]:
+        """Восстанавливает сущности состояния по ссылкам из EntityStore"""
+        entities = {}
+        for field in ENTITY_FIELDS:
+            value = state[field]
+            entities[field] = (
+                await self._entity_store.get(value) if isinstance(value, str) else value
+            )
+        return entities
+
+    async def _response_from_state(self, state: AIServiceState) -> ResponseToVacancyEntity:
+        entities = await self._load_entities(state)
         return ResponseToVacancyEntity(
-            url_vacancy=result["vacancy"].url_vacancy,
-            vacancy_hh_id=result["vacancy"].hh_id,
-            resume_hh_id=result["resume"].hh_id,
-            message=result["response"],
+            url_vacancy=entities["vacancy"].url_vacancy,
+            vacancy_hh_id=entities["vacancy"].hh_id,
+            resume_hh_id=entities["resume"].hh_id,
+            message=state["response"],
         )
 
-    async def regenerate_response(
+    async def _state_from_data(self, data: GenerateResponseData) -> AIServiceState:
+        """
+        Состояние графа из собранных данных. Если подключен EntityStore, сущности
+        сохраняются в нем, а в состояние (и в каждый checkpoint) попадают только ссылки.
+        Если Redis недоступен, сущность остается в состоянии целиком
+        """
+        state = AIServiceState(**data)
+        if self._entity_store is not None:
+            for field in ENTITY_FIELDS:
+                state[field] = await self._entity_store.put(data[field])
+        return state
+
+    async def _start_state(self, data: GenerateResponseData) -> AIServiceState:
+        state = await self._state_from_data(data)
+        # сбрасываем результат прошлой генерации, иначе он подтянется из checkpoint'а
+        state.update({"response": None, "user_comments": None})
+        return state
+
+    async def _regenerate_state(
         self,
-        user_id: int,
+        config: RunnableConfig,
         response: str,
         user_comments: str,
         data: GenerateResponseData | None = None,
-    ) -> ResponseToVacancyEntity:
-        config = self._get_config(user_id)
+    ) -> AIServiceState:
         if not data:
             state = await self._workflow.aget_state(config)
 
             if not state.values:
-                logger.warning("Not saved state for user: id=%s", user_id)
+                logger.warning(
+                    "Not saved state for thread: %s", config["configurable"]["thread_id"]
+                )
                 raise ValueError(
                     "Не найдено сохраненного состояния. Необходимо собрать актуальную информацию"
                 )
             state_data = state.values
+            try:
+                # сущности могли быть удалены из хранилища раньше checkpoint'а
+                vacancy = (await self._load_entities(state_data))["vacancy"]
+            except EntityNotFoundError as e:
+                raise ValueError(
+                    "Данные для генерации устарели. Необходимо собрать актуальную информацию"
+                ) from e
         else:
-            state_data = AIServiceState(**data)
+            state_data = await self._state_from_data(data)
+            vacancy = data["vacancy"]
 
+        # вакансия известна только после загрузки состояния, в метаданные запуска (метрики
+        # и логи) id вакансии попадает здесь, а не из ссылки в состоянии
+        config["metadata"]["vacancy_id"] = vacancy.hh_id
         state_data.update({"response": response, "user_comments": user_comments})
+        return state_data
+
+    async def _stream_workflow(
+        self, state: AIServiceState, config: RunnableConfig
+    ) -> AsyncIterator[ResponseStreamChunk]:
+        """
+        Запускает граф в потоковом режиме.
+        Режим "messages" отдает токены LLM из узлов графа (ChatOpenAI переключается на astream),
+        режим "values" - состояние графа, последнее из которых и есть итоговое (оно же
+        сохраняется в checkpoint, как и при обычном вызове).
+        """
+        result: AIServiceState | None = None
+        async for mode, payload in self._workflow.astream(
+            state, config, stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                result = payload
+                continue
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") not in self.STREAMING_NODES:
+                continue
+            # записанное узлом в состояние сообщение целиком тоже попадает в поток,
+            # его текст уже отдан токенами
+            if not isinstance(chunk, AIMessageChunk):
+                continue
+            if isinstance(chunk.content, str) and chunk.content:
+                yield chunk.content
+        logger.debug("Streamed response: %s", result["response"])
+        yield await self._response_from_state(result)
+
+    async def _get_cached_response(
+        self, data: GenerateResponseData, start_state: AIServiceState, config: RunnableConfig
+    ) -> tuple[str | None, ResponseToVacancyEntity | None]:
+        """
+        Ищет отклик в кэше. При попадании состояние все равно сохраняется в checkpoint,
+        чтобы последующее исправление отклика работало с актуальной вакансией.
+
+        Возвращает ключ кэша (None, если кэш не подключен) и найденный отклик.
+        """
+        if self._response_cache is None:
+            return None, None
+        # ключ строится по основной модели, ответ резервной считается равноценным
+        key = self._response_cache.make_key(data, self._endpoints[0].model, PROMPT_VERSION)
+        message = await self._response_cache.get(key)
+        if message is None:
+            return key, None
+        state = AIServiceState(**start_state)
+        state["response"] = message
+        state["messages"] = [RemoveMessage(id=REMOVE_ALL_MESSAGES), AIMessage(content=message)]
+        await self._workflow.aupdate_state(config, state, as_node="enforce_rules")
+        return key, await self._response_from_state(state)
+
+    async def generate_response(
+        self,
+        data: GenerateResponseData,
+        *,
+        bypass_cache: bool = False,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        isolated: bool = False,
+    ) -> ResponseToVacancyEntity:
+        start_state = await self._start_state(data)
+        config = self._get_config(data["user_id"], priority, data["vacancy"].hh_id, isolated)
+        cache_key = None
+        if not bypass_cache:
+            cache_key, cached = await self._get_cached_response(data, start_state, config)
+            if cached:
+                logger.debug("Response to vacancy=%s taken from cache", cached.vacancy_hh_id)
+                return cached
+        logger.debug("Generate response to vacancy=%s", data["vacancy"].name)
+        result: AIServiceState = await self._workflow.ainvoke(start_state, config=config)  # type: ignore
+        logger.debug("Generated response: %s", result["response"])
+        if cache_key:
+            await self._response_cache.set(cache_key, result["response"])
+        return await self._response_from_state(result)
+
+    async def stream_response(
+        self,
+        data: GenerateResponseData,
+        *,
+        bypass_cache: bool = False,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> AsyncIterator[ResponseStreamChunk]:
+        start_state = await self._start_state(data)
+        config = self._get_config(data["user_id"], priority, data["vacancy"].hh_id)
+        cache_key = None
+        if not bypass_cache:
+            cache_key, cached = await self._get_cached_response(data, start_state, config)
+            if cached:
+                yield cached.message
+                yield cached
+                return
+        logger.debug("Stream response to vacancy=%s", data["vacancy"].name)
+        async for chunk in self._stream_workflow(start_state, config):
+            if cache_key and isinstance(chunk, ResponseToVacancyEntity):
+                await self._response_cache.set(cache_key, chunk.message)
+            yield chunk
+
+    async def regenerate_response(
+        self,
+        user_id: int,
+        response: str,
+        user_comments: str,
+        data: GenerateResponseData | None = None,
+        *,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> ResponseToVacancyEntity:
+        config = self._get_config(user_id, priority)
+        state_data = await self._regenerate_state(config, response, user_comments, data)
         logger.debug("Regenerate response to vacancy with user comments: %s", user_comments)
         result: AIServiceState = await self._workflow.ainvoke(state_data, config)
         logger.debug("Regenerated response: %s", result["response"])
-        return ResponseToVacancyEntity(
-            url_vacancy=result["vacancy"].url_vacancy,
-            vacancy_hh_id=result["vacancy"].hh_id,
-            resume_hh_id=result["resume"].hh_id,
-            message=result["response"],
-        )
+        return await self._response_from_state(result)
+
+    async def stream_regenerate_response(
+        self,
+        user_id: int,
+        response: str,
+        user_comments: str,
+        data: GenerateResponseData | None = None,
+        *,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> AsyncIterator[ResponseStreamChunk]:
+        config = self._get_config(user_id, priority)
+        state_data = await self._regenerate_state(config, response, user_comments, data)
+        logger.debug("Stream regenerated response with user comments: %s", user_comments)
+        async for chunk in self._stream_workflow(state_data, config):
+            yield chunk
@@ -0,0 +1,111 @@
+import logging
+from typing import Any
+
+import ormsgpack
+import zstandard
+from langgraph.checkpoint.redis.jsonplus_redis import JsonPlusRedisSerializer
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from pydantic import BaseModel
+
+from source.domain.entities.employer import EmployerEntity
+from source.domain.entities.response import ResponseToVacancyEntity
+from source.domain.entities.resume import JobExperienceEntity, ResumeEntity
+from source.domain.entities.user import UserEntity
+from source.domain.entities.vacancy import VacancyEntity
+
+logger = logging.getLogger(__name__)
+
+# Теги msgpack ext для доменных сущностей. Коды нельзя менять и переиспользовать,
+# иначе сохраненные checkpoint'ы не прочитаются
+ENTITY_TAGS: dict[int, type[BaseModel]] = {
+    64: VacancyEntity,
+    65: ResumeEntity,
+    66: EmployerEntity,
+    67: JobExperienceEntity,
+    68: ResponseToVacancyEntity,
+    69: UserEntity,
+}
+# Тег для остальных объектов: внутри - результат публичного dumps_typed LangGraph
+LANGGRAPH_TAG = 127
+
+MSGPACK_OPTIONS = (
+    ormsgpack.OPT_NON_STR_KEYS
+    | ormsgpack.OPT_PASSTHROUGH_DATACLASS
+    | ormsgpack.OPT_PASSTHROUGH_DATETIME
+    | ormsgpack.OPT_PASSTHROUGH_ENUM
+    | ormsgpack.OPT_PASSTHROUGH_UUID
+)
+
+
+class CheckpointSerializer(JsonPlusRedisSerializer):
+    """
+    Бинарный сериализатор checkpoint'ов LangGraph.
+
+    Доменные сущности кодируются msgpack ext с явным тегом типа вместо универсального
+    пути LangGraph (имя модуля и класса + проверка при восстановлении), остальные объекты
+    (сообщения LangChain и т.п.) сериализуются публичным JsonPlusSerializer.dumps_typed и
+    вкладываются в ext с тегом LANGGRAPH_TAG, без обращения к внутренним функциям LangGraph.
+    Данные больше compress_threshold байт сжимаются zstd.
+
+    AsyncRedisSaver хранит checkpoint и его метаданные как RedisJSON-документы (по ним строится
+    индекс поиска) и ожидает от сериализатора JSON, поэтому они по-прежнему сериализуются
+    родительским классом. Бинарный формат используется для всего, что сохраняется как blob:
+    промежуточных записей узлов (writes) и значений каналов.
+    """
+
+    TYPE = "msgpack-tagged"
+    TYPE_ZSTD = "msgpack-tagged+zstd"
+
+    def __init__(self, compress_threshold: int | None = 4096, compress_level: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        self.compress_threshold = compress_threshold
+        self._codes = {entity_type: code for code, entity_type in ENTITY_TAGS.items()}
+        self._compressor = zstandard.ZstdCompressor(level=compress_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    @staticmethod
+    def _is_document(obj: Any) -> bool:
+        """Документ checkpoint'а или его метаданные"""
+        if not isinstance(obj, dict):
+            return False
+        return "channel_values" in obj or ("source" in obj and "step" in obj)
+
+    def _default(self, obj: Any) -> Any:
+        code = self._codes.get(type(obj))
+        if code is not None:
+            return ormsgpack.Ext(code, ormsgpack.packb(obj.model_dump(mode="json")))
+        # msgpack-путь базового JsonPlusSerializer, а не JSON родительского Redis-сериализатора
+        return ormsgpack.Ext(
+            LANGGRAPH_TAG, ormsgpack.packb(JsonPlusSerializer.dumps_typed(self, obj))
+        )
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        entity_type = ENTITY_TAGS.get(code)
+        if entity_type is not None:
+            return entity_type.model_validate(ormsgpack.unpackb(data))
+        if code == LANGGRAPH_TAG:
+            type_, payload = ormsgpack.unpackb(data)
+            return JsonPlusSerializer.loads_typed(self, (type_, payload))
+        raise ValueError(f"Unknown msgpack ext code in checkpoint: {code}")
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        if obj is None or isinstance(obj, bytes | bytearray) or self._is_document(obj):
+            return super().dumps_typed(obj)
+        try:
+            data = ormsgpack.packb(obj, default=self._default, option=MSGPACK_OPTIONS)
+        except ormsgpack.MsgpackEncodeError as e:
+            logger.warning("Checkpoint value is not msgpack serializable, fallback: %s", e)
+            return super().dumps_typed(obj)
+        if self.compress_threshold is not None and len(data) > self.compress_threshold:
+            return self.TYPE_ZSTD, self._compressor.compress(data)
+        return self.TYPE, data
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ == self.TYPE_ZSTD:
+            payload = self._decompressor.decompress(payload)
+        elif type_ != self.TYPE:
+            return super().loads_typed(data)
+        return ormsgpack.unpackb(
+            payload, ext_hook=self._ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+        )
@@ -0,0 +1,89 @@
+import hashlib
+import logging
+
+from pydantic import BaseModel
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from source.domain.entities.employer import EmployerEntity
+from source.domain.entities.resume import ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.utils.cache import LRUCache
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EntityNotFoundError(LookupError):
+    """Сущность по ссылке не найдена (истек срок хранения)"""
+
+
+class EntityStore:
+    """
+    Общее хранилище сущностей с адресацией по содержимому.
+
+    Вместо полной сущности в состоянии графа хранится ссылка вида "<вид>:<sha256>".
+    Одинаковые сущности (одно резюме во всех checkpoint'ах пользователя, одна вакансия у
+    разных пользователей) хранятся в Redis один раз. Содержимое по ссылке не меняется,
+    поэтому загруженные сущности кэшируются в памяти процесса без инвалидации.
+    Если Redis недоступен при записи, сущность остается в состоянии графа целиком.
+    """
+
+    KINDS: dict[str, type[BaseModel]] = {
+        "vacancy": VacancyEntity,
+        "resume": ResumeEntity,
+        "employer": EmployerEntity,
+    }
+
+    def __init__(self, redis: Redis, ttl: int, lru_size: int = 1024):
+        self.redis = redis
+        self.ttl = ttl
+        self._local: LRUCache[str, BaseModel] = LRUCache(maxsize=lru_size)
+
+    @staticmethod
+    def _redis_key(ref: str) -> str:
+        return f"entity:{ref}"
+
+    @classmethod
+    def _kind(cls, entity: BaseModel) -> str:
+        for kind, entity_type in cls.KINDS.items():
+            if isinstance(entity, entity_type):
+                return kind
+        raise TypeError(f"Неподдерживаемый тип сущности: {type(entity).__name__}")
+
+    async def put(self, entity: BaseModel) -> BaseModel | str:
+        """
+        Сохраняет сущность и возвращает ссылку на нее.
+        При ошибке Redis возвращает саму сущность для хранения в состоянии без ссылки
+        """
+        payload = entity.model_dump_json().encode()
+        ref = f"{self._kind(entity)}:{hashlib.sha256(payload).hexdigest()}"
+        key = self._redis_key(ref)
+        try:
+            if ref in self._local:
+                # сущность уже записана - только продлеваем срок хранения
+                if await self.redis.expire(key, self.ttl):
+                    metrics.inc("entity_store_writes_total", result="dedup")
+                    return ref
+            await self.redis.set(key, payload, ex=self.ttl)
+        except RedisError as error:
+            logger.warning("Entity store unavailable, keeping %s inline: %s", ref, error)
+            metrics.inc("entity_store_writes_total", result="inline")
+            return entity
+        self._local.set(ref, entity)
+        metrics.inc("entity_store_writes_total", result="stored")
+        return ref
+
+    async def get(self, ref: str) -> BaseModel:
+        entity = self._local.get(ref)
+        if entity is not None:
+            metrics.inc("entity_store_reads_total", tier="memory")
+            return entity
+        payload = await self.redis.get(self._redis_key(ref))
+        if payload is None:
+            logger.warning("Entity not found in store: ref=%s", ref)
+            raise EntityNotFoundError(ref)
+        entity = self.KINDS[ref.split(":", 1)[0]].model_validate_json(payload)
+        self._local.set(ref, entity)
+        metrics.inc("entity_store_reads_total", tier="redis")
+        return entity
@@ -0,0 +1,131 @@
+import json
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+import httpx
+
+from source.infrastructure.utils.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HHCacheRule:
+    """
+    Правило кэширования GET-запросов к эндпоинту API hh.ru (TTL задается в настройках по name).
+
+    shared - ответ одинаков для всех пользователей (вакансии, работодатели) и кэшируется
+    под общим ключом, иначе - отдельно для каждого subject (резюме).
+    """
+
+    name: str
+    pattern: re.Pattern[str]
+    shared: bool
+
+
+# Эндпоинты, ответы которых кэшируются. Остальные запросы идут в hh.ru напрямую
+HH_CACHE_RULES = (
+    HHCacheRule("vacancy", re.compile(r"/vacancies/\d+"), shared=True),
+    HHCacheRule("employer", re.compile(r"/employers/\d+"), shared=True),
+    HHCacheRule("resume", re.compile(r"/resumes/(?!mine$)[\w-]+"), shared=False),
+)
+
+
+def find_cache_rule(path: str) -> HHCacheRule | None:
+    for rule in HH_CACHE_RULES:
+        if rule.pattern.fullmatch(path):
+            return rule
+    return None
+
+
+@dataclass(frozen=True)
+class CachedHHResponse:
+    content: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float  # unix time: запись общая для всех процессов
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "CachedHHResponse":
+        return cls(
+            content=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.time(),
+        )
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self) -> dict[str, str]:
+        """Заголовки условного запроса: hh.ru ответит 304, если данные не изменились"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def revalidated(self) -> "CachedHHResponse":
+        return replace(self, fetched_at=time.time())
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=self.content.encode(),
+            headers={"Content-Type": "application/json; charset=utf-8"},
+            request=request,
+        )
+
+
+class HHResponseCache:
+    """
+    Кэш ответов API hh.ru: in-process LRU и общий для всех воркеров Redis (TieredCache).
+
+    Свежий ответ (моложе TTL эндпоинта) отдается без запроса к hh.ru. Устаревший ответ
+    хранится еще retention секунд и используется для условного запроса (ETag /
+    If-Modified-Since): при 304 hh.ru не передает тело, а запись снова становится свежей.
+    """
+
+    def __init__(self, cache: TieredCache, ttls: dict[str, int], retention: int):
+        self._cache = cache
+        self.ttls = ttls
+        self.retention = retention
+
+    def rule(self, path: str) -> HHCacheRule | None:
+        rule = find_cache_rule(path)
+        return rule if rule is not None and self.caches(rule) else None
+
+    def caches(self, rule: HHCacheRule) -> bool:
+        return rule.name in self.ttls
+
+    def ttl(self, rule: HHCacheRule) -> int:
+        return self.ttls[rule.name]
+
+    @staticmethod
+    def key(
+        rule: HHCacheRule, path: str, params: dict[str, Any] | None, subject: Any | None
+    ) -> str:
+        key = path
+        if params:
+            key = f"{key}?{httpx.QueryParams(sorted(params.items()))}"
+        if not rule.shared:
+            key = f"subject:{subject}:{key}"
+        return key
+
+    async def get(self, key: str) -> CachedHHResponse | None:
+        raw = await self._cache.get(key)
+        if raw is None:
+            return None
+        try:
+            return CachedHHResponse(**json.loads(raw))
+        except (TypeError, ValueError) as e:
+            logger.warning("Поврежденная запись кэша hh.ru key=%s: %s", key, e)
+            return None
+
+    async def set(self, key: str, rule: HHCacheRule, entry: CachedHHResponse) -> None:
+        raw = json.dumps(asdict(entry), ensure_ascii=False).encode()
+        await self._cache.set(key, raw, ttl=self.ttl(rule) + self.retention)
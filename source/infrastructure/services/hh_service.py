@@ -1,13 +1,21 @@
 import asyncio
+import contextlib
+import functools
 import logging
+import time
+from collections.abc import AsyncIterator, Hashable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 import httpx
 from hh_api.auth import TokenPair
+from hh_api.auth.utils import is_expired, now_utc
 from hh_api.client import HHClient, Subject, TokenManager
 from hh_api.exceptions import HHAPIError, HHAuthError, HHNetworkError
 from httpx import Response
 
+from source.application.deadline import DeadlineExceededError, current_deadline
 from source.application.services.ai_service import GenerateResponseData
 from source.application.services.hh_service import AuthTokens, IHHService
 from source.domain.entities.employer import EmployerEntity
@@ -15,11 +23,281 @@ from source.domain.entities.response import ResponseToVacancyEntity
 from source.domain.entities.resume import ResumeEntity
 from source.domain.entities.user import UserEntity
 from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.hh_cache import (
+    CachedHHResponse,
+    HHCacheRule,
+    HHResponseCache,
+    find_cache_rule,
+)
+from source.infrastructure.services.hh_store import HHRecordStore
+from source.infrastructure.services.text_preprocessing import DescriptionPreprocessor
+from source.infrastructure.services.text_summarizer import ExtractiveSummarizer
+from source.infrastructure.utils.cache import LRUCache
+from source.infrastructure.utils.distributed_semaphore import AdmissionTimeoutError
+from source.infrastructure.utils.fetch_executor import FairFetchExecutor
+from source.infrastructure.utils.metrics import metrics
+from source.infrastructure.utils.retry import RetryPolicy
+from source.infrastructure.utils.single_flight import RedisFlightLock, SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Ответы hh.ru, после которых запросы к API нужно приостановить
+THROTTLE_STATUSES = frozenset({429, 503})
+# Запас (в секундах) до истечения access_token, после которого токен считается истекшим
+TOKEN_EXPIRY_SKEW = 30
+
 
 class CustomHHClient(HHClient):
+    """
+    Клиент API hh.ru с учетом срока обработки запроса (current_deadline):
+    таймаут HTTP-запроса сокращается до оставшегося времени, а повтор не выполняется,
+    если пауза перед ним не укладывается в срок.
+
+    Если передан cache, GET-запросы к вакансиям, работодателям и резюме кэшируются
+    (см. HHResponseCache). Одновременные одинаковые запросы публичных данных (вакансии,
+    работодатели) объединяются в один: в процессе через single_flight, между процессами -
+    через flight_lock (остальные процессы ждут ответ в общем кэше).
+    """
+
+    def __init__(
+        self,
+        tm: TokenManager,
+        *,
+        cache: HHResponseCache | None = None,
+        single_flight: SingleFlight[str, Response] | None = None,
+        flight_lock: RedisFlightLock | None = None,
+        executor: FairFetchExecutor | None = None,
+        retry_policy: RetryPolicy | None = None,
+        **kwargs,
+    ):
+        super().__init__(tm, **kwargs)
+        self._cache = cache
+        self._single_flight = single_flight
+        self._flight_lock = flight_lock
+        self._executor = executor or FairFetchExecutor()
+        self._host = httpx.URL(self.base_url).host
+        self._retry_policy = retry_policy or RetryPolicy(
+            "hh", max_attempts=self.retries, base_delay=self.backoff_base
+        )
+
+    def _request_timeout(self) -> float | None:
+        deadline = current_deadline()
+        default = self._client.timeout.read
+        return default if deadline is None else deadline.timeout(default)
+
+    def _timeouts(self) -> httpx.Timeout:
+        """Таймауты клиента, сокращенные до оставшегося срока обработки запроса"""
+        limit = self._request_timeout()
+        timeout = self._client.timeout
+
+        def cap(value: float | None) -> float | None:
+            return limit if value is None else value if limit is None else min(value, limit)
+
+        return httpx.Timeout(
+            connect=cap(timeout.connect),
+            read=limit,
+            write=cap(timeout.write),
+            pool=cap(timeout.pool),
+        )
+
+    async def _backoff(self, attempt: int, throttled: bool = False) -> bool:
+        """
+        Пауза перед повтором. False - повтор не выполняется (см. RetryPolicy.allow).
+
+        После 429/503 (throttled) пауза общая для всех запросов к hh.ru и выдерживается
+        исполнителем запросов, здесь только проверяется, что повтор допустим.
+        """
+        if throttled:
+            return self._retry_policy.allow(attempt, self._executor.cooldown(self._host))
+        return await self._retry_policy.backoff(attempt)
+
+    async def _retry(self, error: HHAPIError, attempt: int) -> bool:
+        """Можно ли повторить запрос после ошибки API: 5xx и 429"""
+        status = getattr(error, "status_code", 0)
+        if not (status == 429 or 500 <= status < 600):
+            return False
+        return await self._backoff(attempt, throttled=status in THROTTLE_STATUSES)
+
+    @staticmethod
+    def _retry_after(response: Response) -> float | None:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            with contextlib.suppress(TypeError, ValueError):
+                return max((parsedate_to_datetime(value) - datetime.now(UTC)).total_seconds(), 0)
+        return None
+
+    async def _perform(
+        self, method: str, url: str, *, fair_key: Hashable, **kwargs: Any
+    ) -> Response:
+        """
+        HTTP-запрос через общий исполнитель: не больше заданного числа одновременных запросов
+        к hh.ru, очередь - по кругу между пользователями (fair_key), пауза после 429/503
+        """
+        deadline = current_deadline()
+        slot_timeout = None if deadline is None else deadline.timeout()
+        try:
+            async with self._executor.slot(self._host, fair_key, slot_timeout):
+                response = await self._client.request(
+                    method, url, timeout=self._timeouts(), **kwargs
+                )
+        except AdmissionTimeoutError as e:
+            raise DeadlineExceededError("Время обработки запроса истекло") from e
+        if response.status_code in THROTTLE_STATUSES:
+            self._executor.throttled(self._host, self._retry_after(response))
+        elif response.status_code < 500:
+            self._executor.succeeded(self._host)
+        return response
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        subject: Subject | None = None,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        rule = find_cache_rule(path) if method == "GET" else None
+        if rule is None:
+            return await self._send(
+                method, path, subject=subject, params=params, data=data, json=json, headers=headers
+            )
+        fetch = functools.partial(
+            self._get, rule, path, subject=subject, params=params, headers=headers
+        )
+        # одновременные запросы одних и тех же публичных данных выполняются один раз
+        if rule.shared and self._single_flight is not None:
+            key = HHResponseCache.key(rule, path, params, None)
+            return await self._single_flight.do(key, fetch)
+        return await fetch()
+
+    async def _get(
+        self,
+        rule: HHCacheRule,
+        path: str,
+        *,
+        subject: Subject | None,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+    ) -> Response:
+        if self._cache is None or not self._cache.caches(rule):
+            return await self._send("GET", path, subject=subject, params=params, headers=headers)
+
+        key = self._cache.key(rule, path, params, subject if subject is not None else self.subject)
+        request = httpx.Request("GET", f"{self.base_url}{path}", params=params)
+        fetch = functools.partial(
+            self._fetch, rule, key, request, path, subject=subject, params=params, headers=headers
+        )
+        entry = await self._cache.get(key)
+        if entry is not None and entry.is_fresh(self._cache.ttl(rule)):
+            metrics.inc("hh_cache_requests_total", endpoint=rule.name, result="fresh")
+            return entry.to_response(request)
+        if self._flight_lock is None or not rule.shared:
+            return await fetch(entry)
+
+        # запрос выполняет один процесс, остальные дожидаются его результата в общем кэше
+        async with self._flight_lock.hold(key) as owned:
+            if not owned and await self._flight_lock.wait(key, self._request_timeout()):
+                entry = await self._cache.get(key) or entry
+                if entry is not None and entry.is_fresh(self._cache.ttl(rule)):
+                    metrics.inc("single_flight_calls_total", flight="hh", result="collapsed_redis")
+                    return entry.to_response(request)
+            return await fetch(entry)
+
+    async def _fetch(
+        self,
+        rule: HHCacheRule,
+        key: str,
+        request: httpx.Request,
+        path: str,
+        entry: CachedHHResponse | None,
+        *,
+        subject: Subject | None,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+    ) -> Response:
+        """Запрос к hh.ru с обновлением кэша, условный - если есть устаревший ответ"""
+        if entry is not None:
+            headers = {**(headers or {}), **entry.validators()}
+        resp = await self._send("GET", path, subject=subject, params=params, headers=headers)
+        if resp.status_code == 304 and entry is not None:
+            await self._cache.set(key, rule, entry.revalidated())
+            metrics.inc("hh_cache_requests_total", endpoint=rule.name, result="revalidated")
+            return entry.to_response(request)
+
+        await self._cache.set(key, rule, CachedHHResponse.from_response(resp))
+        metrics.inc("hh_cache_requests_total", endpoint=rule.name, result="miss")
+        return resp
+
+    async def _send(
+        self, method: str, path: str, *, subject: Subject | None = None, **kwargs: Any
+    ) -> Response:
+        try:
+            return await self._send_with_retries(method, path, subject=subject, **kwargs)
+        except HHAuthError as e:
+            if e.status_code != 401 or not isinstance(self.tm, CustomTokenManager):
+                raise
+            # токен из кэша процесса мог быть отозван или обновлен другим процессом -
+            # один раз повторяем запрос с токеном из хранилища
+            logger.warning("Токен отклонен hh.ru, повтор с токеном из хранилища: %s", e)
+            self.tm.invalidate(subject if subject is not None else self.subject)
+            return await self._send_with_retries(method, path, subject=subject, **kwargs)
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        path: str,
+        *,
+        subject: Subject | None = None,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        url = f"{self.base_url}{path}"
+        last_exc: Exception | None = None
+
+        self._retry_policy.record_request()
+        for attempt in range(1, self._retry_policy.max_attempts + 1):
+            try:
+                req_headers = await self._auth_headers(subject=subject)
+                if headers:
+                    req_headers.update(headers)
+                resp = await self._perform(
+                    method,
+                    url,
+                    fair_key=subject if subject is not None else self.subject,
+                    params=params,
+                    data=data,
+                    json=json,
+                    headers=req_headers,
+                )
+                self._check_status_code_response(resp)
+                return resp
+
+            except httpx.RequestError as e:
+                logger.warning("Ошибка отправки запроса %s %s: %s", method, path, e)
+                last_exc = e
+                if await self._backoff(attempt):
+                    continue
+                raise HHNetworkError(str(e)) from e
+
+            except HHAPIError as e:
+                last_exc = e
+                # 5xx и 429 — можно попробовать повторить
+                if await self._retry(e, attempt):
+                    continue
+                raise
+
+        assert last_exc is not None
+        raise last_exc
+
     async def get_employer(
         self, employer_id: str, *, subject: Subject | None = None
     ) -> dict[str, Any]:
@@ -35,6 +313,10 @@ class CustomHHClient(HHClient):
     def _check_status_code_response(response: Response) -> None:
         """Проверяет наличие ошибок в запросе"""
         # авторизационные ошибки пробрасываем как HHAuthError
+        if response.status_code == 304:
+            # Not Modified - ответ на условный запрос к закэшированным данным
+            return
+
         if response.status_code in (401, 403):
             # У многих интеграций это значит «нужно переавторизовать пользователя».
             logger.error(
@@ -60,19 +342,20 @@ class CustomHHClient(HHClient):
             "Authorization": f"Bearer {tokens.access_token}",
             "User-Agent": self.user_agent,
         }
-        for attempt in range(1, self.retries + 1):
+        # пользователь до авторизации неизвестен, в очереди запросов его представляет токен
+        fair_key = tokens.access_token
+        self._retry_policy.record_request()
+        for attempt in range(1, self._retry_policy.max_attempts + 1):
             try:
                 logger.debug(
                     "Авторизация пользователя HH. Попытка %s/%s",
                     attempt,
-                    self.retries,
+                    self._retry_policy.max_attempts,
                 )
-                # TODO Запрос информации о пользователе и запрос резюме можно выполнять параллельно через gather
-                # Получаем информацию о пользователе
-                resp_user = await self._client.request(
-                    "GET",
-                    url_user,
-                    headers=req_headers,
+                # Информация о пользователе и список его резюме запрашиваются параллельно
+                resp_user, resp_resumes_user = await asyncio.gather(
+                    self._perform("GET", url_user, fair_key=fair_key, headers=req_headers),
+                    self._perform("GET", url_resumes, fair_key=fair_key, headers=req_headers),
                 )
                 self._check_status_code_response(resp_user)
                 user_data = resp_user.json()
@@ -80,13 +363,6 @@ class CustomHHClient(HHClient):
                     "Информация о пользователе получена. hh_id=%s",
                     user_data.get("id"),
                 )
-
-                # Получаем список резюме пользователя
-                resp_resumes_user = await self._client.request(
-                    "GET",
-                    url_resumes,
-                    headers=req_headers,
-                )
                 self._check_status_code_response(resp_resumes_user)
                 resumes_items = resp_resumes_user.json()["items"]
                 logger.debug(
@@ -96,9 +372,10 @@ class CustomHHClient(HHClient):
                 # Запрашиваем детальную информацию по каждому резюме
                 resumes_data: list[Response] = await asyncio.gather(
                     *[
-                        self._client.request(
+                        self._perform(
                             "GET",
                             f"{self.base_url}/resumes/{data['id']}",
+                            fair_key=fair_key,
                             headers=req_headers,
                         )
                         for data in resumes_items
@@ -118,12 +395,7 @@ class CustomHHClient(HHClient):
             except httpx.RequestError as e:
                 logger.warning("Ошибка отправки запроса: %s", e)
                 last_exc = e
-                if attempt < self.retries:
-                    logger.warning(
-                        "Повторная попытка отправки через %s сек.",
-                        self.backoff_base * (2 ** (attempt - 1)),
-                    )
-                    await asyncio.sleep(self.backoff_base * (2 ** (attempt - 1)))
+                if await self._backoff(attempt):
                     continue
                 logger.error("HHNetworkError: %s", e)
                 raise HHNetworkError(str(e)) from e
@@ -135,16 +407,11 @@ class CustomHHClient(HHClient):
                         "Ответ HH API c ошибкой. status_code=%s, попытка=%s/%s",
                         e.status_code,
                         attempt,
-                        self.retries,
+                        self._retry_policy.max_attempts,
                     )
                 last_exc = e
-                # 5xx — можно попробовать повторить
-                if 500 <= getattr(e, "status_code", 0) < 600 and attempt < self.retries:
-                    logger.warning(
-                        "Повторная попытка отправки через %s сек.",
-                        self.backoff_base * (2 ** (attempt - 1)),
-                    )
-                    await asyncio.sleep(self.backoff_base * (2 ** (attempt - 1)))
+                # 5xx и 429 — можно попробовать повторить
+                if await self._retry(e, attempt):
                     continue
                 raise
 
@@ -185,6 +452,109 @@ class CustomHHClient(HHClient):
 
 
 class CustomTokenManager(TokenManager):
+    """
+    Менеджер токенов hh.ru с in-process кэшем.
+
+    Токены пользователя кэшируются в процессе до истечения access_token, но не дольше
+    cache_ttl секунд, чтобы увидеть токены, обновленные другим процессом (токены, отклоненные
+    hh.ru с 401, удаляются из кэша сразу - см. invalidate). Если access_token
+    истекает в ближайшие refresh_ahead секунд, он обновляется в фоне, а запрос выполняется
+    с текущим токеном. Обновление выполняется под блокировкой locks (RedisLockProvider -
+    одна на все процессы): остальные ждут ее снятия и читают новые токены из хранилища.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+        refresh_ahead: float = 0.0,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.cache_ttl = cache_ttl
+        self.refresh_ahead = refresh_ahead
+        self._tokens: LRUCache[Subject, TokenPair] = LRUCache(cache_size)
+        # неудачное фоновое обновление не повторяется до истечения токена
+        self._ahead_failed: LRUCache[Subject, bool] = LRUCache(cache_size, ttl=refresh_ahead)
+        self._refreshing: dict[Subject, asyncio.Task[None]] = {}
+
+    def _cache_tokens(self, subject: Subject, tokens: TokenPair) -> None:
+        if tokens.expires_at is None:
+            return
+        valid_for = (tokens.expires_at - now_utc()).total_seconds() - TOKEN_EXPIRY_SKEW
+        if valid_for > 0:
+            self._tokens.set(subject, tokens, ttl=min(valid_for, self.cache_ttl))
+
+    async def _get_tokens(self, subject: Subject) -> TokenPair | None:
+        tokens = self._tokens.get(subject)
+        metrics.inc("hh_token_cache_requests_total", result="miss" if tokens is None else "hit")
+        if tokens is None:
+            tokens = await self.store.get_tokens(subject)
+            if tokens is not None:
+                self._cache_tokens(subject, tokens)
+        return tokens
+
+    async def ensure_access(self, subject: Subject) -> str:
+        tokens = await self._get_tokens(subject)
+        if not tokens or not tokens.refresh_token:
+            raise RuntimeError("Нет токенов. Отправьте пользователя на authorization_url().")
+        if tokens.access_token and not is_expired(tokens.expires_at, TOKEN_EXPIRY_SKEW):
+            if self.refresh_ahead and is_expired(tokens.expires_at, int(self.refresh_ahead)):
+                self._refresh_in_background(subject)
+            return tokens.access_token
+        tokens = await self._refresh_locked(subject, TOKEN_EXPIRY_SKEW, mode="expired")
+        return tokens.access_token or ""
+
+    def invalidate(self, subject: Subject) -> None:
+        """Удаляет токены из кэша процесса: следующий запрос прочитает их из хранилища"""
+        if self._tokens.pop(subject) is not None:
+            metrics.inc("hh_token_invalidations_total")
+
+    async def _refresh_locked(self, subject: Subject, skew: int, mode: str) -> TokenPair:
+        """Обновляет токены, если другой процесс не обновил их, пока ждали блокировку"""
+        async with self.locks.acquire(subject):
+            tokens = await self.store.get_tokens(subject)
+            if not tokens or not tokens.refresh_token:
+                raise RuntimeError("Нет refresh_token — требуется повторная авторизация.")
+            if tokens.access_token and not is_expired(tokens.expires_at, skew):
+                self._cache_tokens(subject, tokens)
+                return tokens
+            return await self.refresh(subject, tokens.refresh_token, mode=mode)
+
+    async def refresh(
+        self, subject: Subject, refresh_token: str | None = None, *, mode: str = "expired"
+    ) -> TokenPair:
+        try:
+            tokens = await super().refresh(subject, refresh_token)
+        except Exception:
+            metrics.inc("hh_token_refresh_total", mode=mode, result="error")
+            raise
+        metrics.inc("hh_token_refresh_total", mode=mode, result="ok")
+        logger.debug("Токены пользователя hh_id=%s обновлены (%s)", subject, mode)
+        self._cache_tokens(subject, tokens)
+        return tokens
+
+    def _refresh_in_background(self, subject: Subject) -> None:
+        if subject in self._refreshing or subject in self._ahead_failed:
+            return
+        task = asyncio.create_task(self._refresh_ahead(subject))
+        self._refreshing[subject] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(subject, None))
+
+    async def _refresh_ahead(self, subject: Subject) -> None:
+        try:
+            await self._refresh_locked(subject, int(self.refresh_ahead), mode="ahead")
+        except Exception as e:
+            # текущий токен еще действует - обновим его при истечении
+            self._ahead_failed.set(subject, True)
+            logger.warning("Не удалось заранее обновить токены hh_id=%s: %s", subject, e)
+
+    async def aclose(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await super().aclose()
+
     async def exchange_auth_code(self, code: str) -> TokenPair:
         """Метод для обменя exchange token'а на access_token и refresh_token"""
         data = {
@@ -204,13 +574,69 @@ class CustomTokenManager(TokenManager):
 
     async def save_tokens(self, subject: Subject, tokens: TokenPair) -> None:
         await self.store.set_tokens(subject, tokens)
+        self._cache_tokens(subject, tokens)
         logger.debug("Tokens are saved")
 
 
 class HHService(IHHService):
-    def __init__(self, token_manager: CustomTokenManager):
+    def __init__(
+        self,
+        token_manager: CustomTokenManager,
+        preprocessor: DescriptionPreprocessor | None = None,
+        summarizer: ExtractiveSummarizer | None = None,
+        vacancy_token_budget: int | None = None,
+        employer_token_budget: int | None = None,
+        hh_cache: HHResponseCache | None = None,
+        flight_lock: RedisFlightLock | None = None,
+        executor: FairFetchExecutor | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        timeout: httpx.Timeout | float = 20.0,
+        record_store: HHRecordStore | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
         self._hh_tm = token_manager
-        self.hh_client = CustomHHClient(self._hh_tm)
+        # вакансии и работодатели, сохраненные в Postgres (None - всегда запрос к hh.ru)
+        self._record_store = record_store
+        # клиент (и пул соединений транспорта) живет столько же, сколько сервис
+        self.hh_client = CustomHHClient(
+            self._hh_tm,
+            cache=hh_cache,
+            single_flight=SingleFlight("hh"),
+            flight_lock=flight_lock,
+            executor=executor,
+            transport=transport,
+            timeout=timeout,
+            retry_policy=retry_policy,
+        )
+        # описания вакансий и работодателей приходят в HTML, в промпт идет компактный текст
+        self._preprocessor = preprocessor or DescriptionPreprocessor()
+        # слишком длинные описания сокращаются до бюджета токенов (None - без ограничения)
+        self._summarizer = summarizer or ExtractiveSummarizer()
+        self._vacancy_token_budget = vacancy_token_budget
+        self._employer_token_budget = employer_token_budget
+
+    # В хранилище (и в поисковый индекс) попадает полное нормализованное описание,
+    # сокращение до бюджета токенов применяется при выдаче данных для промпта
+
+    def _serialize_data_vacancy(self, data: dict) -> VacancyEntity:
+        description = self._preprocessor.normalize("vacancy", data["id"], data["description"])
+        return super()._serialize_data_vacancy({**data, "description": description})
+
+    def _serialize_data_employer(self, data: dict) -> EmployerEntity:
+        description = self._preprocessor.normalize("employer", data["id"], data["description"])
+        return super()._serialize_data_employer({**data, "description": description})
+
+    def _summarize_vacancy(self, vacancy: VacancyEntity) -> VacancyEntity:
+        description = self._summarizer.summarize(
+            vacancy.description,
+            self._vacancy_token_budget,
+            keywords=[skill["name"] for skill in vacancy.key_skills],
+        )
+        return vacancy.model_copy(update={"description": description})
+
+    def _summarize_employer(self, employer: EmployerEntity) -> EmployerEntity:
+        description = self._summarizer.summarize(employer.description, self._employer_token_budget)
+        return employer.model_copy(update={"description": description})
 
     def get_auth_url(self, state: str):
         logger.debug("Генерация auth URL для state=%s", state)
@@ -218,6 +644,8 @@ class HHService(IHHService):
 
     async def aclose_hh_client(self):
         logger.debug("Закрытие HTTP-клиента HH")
+        if self._record_store is not None:
+            await self._record_store.aclose()
         await self.hh_client.aclose()
 
     async def auth(self, code: str) -> tuple[UserEntity, AuthTokens]:
@@ -233,10 +661,11 @@ class HHService(IHHService):
         )
 
     async def get_me(self, subject: Subject | None) -> UserEntity:
-        user_data = await self.hh_client.get_me(subject=subject)
         logger.debug("Request user hh profile (hh_id=%s)", subject)
-
-        resumes_data = await self.hh_client.get_resumes_from_url("/resumes/mine", subject=subject)
+        user_data, resumes_data = await asyncio.gather(
+            self.hh_client.get_me(subject=subject),
+            self.hh_client.get_resumes_from_url("/resumes/mine", subject=subject),
+        )
         # отдельный запрос делается, для подгрузки description
         # почему-то при загрузке всех резюме этого поля нет
         logger.debug("Request info about resumes user's")
@@ -271,12 +700,87 @@ class HHService(IHHService):
         logger.info("Загружены вакансии пользователя hh_id=%s", subject)
         return result
 
+    async def iter_vacancies(
+        self, subject: Subject | None, max_results: int | None = None, **filter_query
+    ) -> AsyncIterator[VacancyEntity]:
+        """
+        Постраничный поиск вакансий с загрузкой деталей.
+
+        Страницы поиска запрашиваются по мере необходимости: следующая страница загружается,
+        пока загружаются детали вакансий текущей. Вакансии отдаются по мере готовности
+        (не в порядке выдачи поиска), в памяти находится не больше двух страниц.
+        Недоступные вакансии (например, удаленные из архива) пропускаются и не учитываются
+        в max_results.
+        """
+        logger.info(
+            "Поиск вакансий пользователя hh_id=%s с фильтрами=%s (не больше %s)",
+            subject,
+            filter_query,
+            max_results,
+        )
+        page = int(filter_query.pop("page", 0))
+        next_page: asyncio.Task[dict[str, Any]] | None = asyncio.create_task(
+            self.hh_client.get_vacancies(subject, page=page, **filter_query)
+        )
+        details: set[asyncio.Task[VacancyEntity]] = set()
+        yielded = 0
+        try:
+            while next_page is not None:
+                result = await next_page
+                next_page = None
+                items = result.get("items", [])
+                if max_results is not None:
+                    items = items[: max_results - yielded]
+                logger.debug(
+                    "Страница поиска %s/%s: %s вакансий", page + 1, result.get("pages"), len(items)
+                )
+                details = {
+                    asyncio.create_task(self.get_vacancy_data(subject, item["id"]))
+                    for item in items
+                }
+                page += 1
+                has_next_page = page < result.get("pages", 0)
+                if has_next_page and (max_results is None or yielded + len(items) < max_results):
+                    next_page = asyncio.create_task(
+                        self.hh_client.get_vacancies(subject, page=page, **filter_query)
+                    )
+                while details:
+                    done, details = await asyncio.wait(details, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        try:
+                            vacancy = task.result()
+                        except HHAuthError:
+                            raise
+                        except HHAPIError as e:
+                            logger.warning("Вакансия недоступна, пропускаем: %s", e)
+                            continue
+                        yield vacancy
+                        yielded += 1
+                if next_page is None and has_next_page and yielded < max_results:
+                    # часть вакансий страницы недоступна - добираем до max_results со следующей
+                    next_page = asyncio.create_task(
+                        self.hh_client.get_vacancies(subject, page=page, **filter_query)
+                    )
+        finally:
+            # поиск мог быть прерван потребителем - незавершенные запросы больше не нужны
+            for task in [*details, *([next_page] if next_page else [])]:
+                task.cancel()
+
     async def get_vacancy_data(self, subject: Subject | None, vacancy_id: str) -> VacancyEntity:
         logger.debug(
             "Запрос детальной информации по вакансии vacancy_id=%s (subject=%s)",
             vacancy_id,
             subject,
         )
+        if self._record_store is None:
+            vacancy = await self._fetch_vacancy(subject, vacancy_id)
+        else:
+            vacancy = await self._record_store.get(
+                "vacancy", vacancy_id, functools.partial(self._fetch_vacancy, subject, vacancy_id)
+            )
+        return self._summarize_vacancy(vacancy)
+
+    async def _fetch_vacancy(self, subject: Subject | None, vacancy_id: str) -> VacancyEntity:
         data = await self.hh_client.get_vacancy(vacancy_id, subject=subject)
         return self._serialize_data_vacancy(data)
 
@@ -286,6 +790,17 @@ class HHService(IHHService):
             employer_id,
             subject,
         )
+        if self._record_store is None:
+            employer = await self._fetch_employer(subject, employer_id)
+        else:
+            employer = await self._record_store.get(
+                "employer",
+                employer_id,
+                functools.partial(self._fetch_employer, subject, employer_id),
+            )
+        return self._summarize_employer(employer)
+
+    async def _fetch_employer(self, subject: Subject | None, employer_id: str) -> EmployerEntity:
         data = await self.hh_client.get_employer(employer_id, subject=subject)
         return self._serialize_data_employer(data)
 
@@ -318,6 +833,7 @@ class HHService(IHHService):
             vacancy_id,
             resume_id,
         )
+        started = time.perf_counter()
         vacancy_data = await self.get_vacancy_data(subject, vacancy_id)
         tasks = [
             self.get_employer_data(subject, vacancy_data.employer_id),
@@ -325,6 +841,7 @@ class HHService(IHHService):
             self.get_user_rules(),
         ]
         result = await asyncio.gather(*tasks)
+        metrics.observe("hh_data_collect_seconds", time.perf_counter() - started)
         logger.debug(
             "Данные для генерации отклика собраны. employer_id=%s",
             vacancy_data.employer_id,
@@ -0,0 +1,113 @@
+import asyncio
+import contextvars
+import logging
+from collections.abc import Awaitable, Callable, Coroutine
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from source.application.repositories.employer import IEmployerRepository
+from source.application.repositories.vacancy import IVacancyRepository
+from source.domain.entities.base import BaseEntity
+from source.infrastructure.db.repositories.employer import EmployerRepository
+from source.infrastructure.db.repositories.vacancy import VacancyRepository
+from source.infrastructure.db.uow import UnitOfWork
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+type HHRecordRepository = IVacancyRepository | IEmployerRepository
+
+HH_RECORD_REPOSITORIES: dict[str, Callable[[AsyncSession], HHRecordRepository]] = {
+    "vacancy": VacancyRepository,
+    "employer": EmployerRepository,
+}
+
+
+class HHRecordStore:
+    """
+    Read-through хранилище вакансий и работодателей hh.ru в Postgres.
+
+    Запись младше refresh_after[kind] секунд отдается из БД без запроса к hh.ru. Запись
+    младше max_staleness[kind] секунд тоже отдается из БД, но обновляется с hh.ru в фоне.
+    Более старая запись (или ее отсутствие) - синхронный запрос к hh.ru. Загруженные
+    с hh.ru данные сохраняются в БД в фоне (write-behind) и не задерживают ответ.
+    Ошибки БД не мешают работе: данные просто запрашиваются с hh.ru.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        refresh_after: dict[str, float],
+        max_staleness: dict[str, float],
+        repositories: dict[str, Callable[[AsyncSession], HHRecordRepository]] | None = None,
+    ):
+        self._session_maker = session_maker
+        self.refresh_after = refresh_after
+        self.max_staleness = max_staleness
+        self._repositories = repositories or HH_RECORD_REPOSITORIES
+        # фоновые обновления и записи: по одной на запись
+        self._background: dict[tuple[str, str], asyncio.Task[None]] = {}
+
+    async def get[ET: BaseEntity](
+        self, kind: str, hh_id: str, fetch: Callable[[], Awaitable[ET]]
+    ) -> ET:
+        stored = await self._load(kind, hh_id)
+        if stored is not None:
+            entity, fetched_at = stored
+            age = (datetime.now(UTC) - fetched_at).total_seconds()
+            if age < self.refresh_after.get(kind, 0):
+                metrics.inc("hh_store_requests_total", kind=kind, result="fresh")
+                return entity
+            if age < self.max_staleness.get(kind, 0):
+                metrics.inc("hh_store_requests_total", kind=kind, result="stale")
+                self._in_background(kind, hh_id, self._refresh(kind, fetch))
+                return entity
+
+        metrics.inc("hh_store_requests_total", kind=kind, result="miss")
+        entity = await fetch()
+        self._in_background(kind, hh_id, self._save(kind, entity))
+        return entity
+
+    async def _load(self, kind: str, hh_id: str) -> tuple[BaseEntity, datetime] | None:
+        try:
+            async with self._session_maker() as session:
+                return await self._repositories[kind](session).get_by_hh_id(hh_id)
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("Не удалось прочитать %s %s из БД: %s", kind, hh_id, e)
+            return None
+
+    async def _save(self, kind: str, entity: BaseEntity) -> None:
+        try:
+            async with self._session_maker() as session, UnitOfWork(session):
+                await self._repositories[kind](session).upsert(entity, datetime.now(UTC))
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("Не удалось сохранить %s %s в БД: %s", kind, entity.hh_id, e)
+            return
+        metrics.inc("hh_store_writes_total", kind=kind)
+
+    async def _refresh(self, kind: str, fetch: Callable[[], Awaitable[BaseEntity]]) -> None:
+        try:
+            entity = await fetch()
+        except Exception as e:
+            # устаревшая запись остается в БД, обновим при следующем обращении
+            logger.warning("Не удалось обновить %s с hh.ru: %s", kind, e)
+            return
+        await self._save(kind, entity)
+
+    def _in_background(self, kind: str, hh_id: str, coro: Coroutine[Any, Any, None]) -> None:
+        key = (kind, hh_id)
+        if key in self._background:
+            coro.close()
+            return
+        # пустой контекст: срок обработки запроса на фоновую задачу не распространяется
+        task = asyncio.create_task(coro, context=contextvars.Context())
+        self._background[key] = task
+        task.add_done_callback(lambda _: self._background.pop(key, None))
+
+    async def aclose(self) -> None:
+        """Дожидается фоновых записей (вызывается при остановке приложения)"""
+        if self._background:
+            await asyncio.gather(*self._background.values(), return_exceptions=True)
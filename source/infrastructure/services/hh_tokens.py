@@ -0,0 +1,53 @@
+import asyncio
+import contextlib
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator, Hashable
+
+from hh_api.auth import LockProvider
+
+from source.infrastructure.utils.metrics import metrics
+from source.infrastructure.utils.single_flight import RedisFlightLock
+
+logger = logging.getLogger(__name__)
+
+
+class RedisLockProvider(LockProvider):
+    """
+    Блокировка обновления токенов пользователя, общая для всех процессов.
+
+    Корутины одного процесса ждут друг друга на asyncio.Lock, затем процесс получает
+    блокировку ключа в Redis. Если ее держит другой процесс, ждем снятия и пробуем снова:
+    к этому времени токены уже обновлены и читаются из хранилища. Блокировка выдается
+    на время ttl RedisFlightLock, поэтому упавший процесс не блокирует обновление навсегда.
+    """
+
+    def __init__(self, lock: RedisFlightLock):
+        self._lock = lock
+        self._local: weakref.WeakValueDictionary[Hashable, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def _local_lock(self, subject: Hashable) -> asyncio.Lock:
+        lock = self._local.get(subject)
+        if lock is None:
+            lock = self._local[subject] = asyncio.Lock()
+        return lock
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, subject: Hashable) -> AsyncIterator[None]:
+        started = time.monotonic()
+        local = self._local_lock(subject)
+        if local.locked():
+            metrics.inc("hh_token_lock_contention_total", scope="process")
+        async with local:
+            while True:
+                async with self._lock.hold(str(subject)) as owned:
+                    if owned:
+                        metrics.observe("hh_token_lock_wait_seconds", time.monotonic() - started)
+                        yield
+                        return
+                metrics.inc("hh_token_lock_contention_total", scope="redis")
+                logger.debug("Токены hh_id=%s обновляет другой процесс, ожидание", subject)
+                await self._lock.wait(str(subject))
@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import uuid
+from datetime import datetime
+
+from redis.asyncio.client import Redis
+from redis.exceptions import ResponseError
+
+from source.application.dtos.job import BotReplyTarget, JobStatus, ResponseJobDTO
+from source.application.dtos.query import QueryCreateDTO
+from source.application.services.job_queue import IJobQueue
+from source.domain.entities.response import ResponseToVacancyEntity
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Сообщение потока: id сообщения и id задачи
+type StreamMessage = tuple[str, str]
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisJobQueue(IJobQueue):
+    """
+    Очередь задач генерации откликов на Redis Streams.
+
+    Задача хранится отдельным ключом (статус, результат), в поток пишется только ее id.
+    Воркеры читают поток в consumer group и подтверждают (XACK) сообщение только после
+    сохранения результата, поэтому задача упавшего воркера остается в pending и через
+    visibility_timeout забирается другим воркером (at-least-once). Пока задача выполняется,
+    воркер продлевает ее (touch), чтобы долгая генерация не была забрана повторно.
+
+    Одинаковые запросы, пока задача ожидает или выполняется, не создают новую задачу -
+    возвращается уже существующая.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str = "jobs:responses",
+        group: str = "workers",
+        result_ttl: int = 60 * 60 * 24,
+        visibility_timeout: float = 300.0,
+        stream_maxlen: int = 10_000,
+    ):
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.result_ttl = result_ttl
+        self.visibility_timeout = visibility_timeout
+        self.stream_maxlen = stream_maxlen
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"jobs:{job_id}"
+
+    @staticmethod
+    def _dedupe_key(query: QueryCreateDTO) -> str:
+        digest = hashlib.sha256(query.model_dump_json().encode()).hexdigest()
+        return f"jobs:dedupe:{digest}"
+
+    async def enqueue(
+        self, query: QueryCreateDTO, reply_to: BotReplyTarget | None = None
+    ) -> ResponseJobDTO:
+        job = ResponseJobDTO(job_id=uuid.uuid4().hex, query=query, reply_to=reply_to)
+        dedupe_key = self._dedupe_key(query)
+        if not await self.redis.set(dedupe_key, job.job_id, nx=True, ex=self.result_ttl):
+            existing_id = await self.redis.get(dedupe_key)
+            existing = await self.get(_decode(existing_id)) if existing_id else None
+            if existing and existing.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                logger.info("Задача %s уже в очереди, повторная не создается", existing.job_id)
+                metrics.inc("jobs_enqueued_total", result="dedup")
+                return existing
+            await self.redis.set(dedupe_key, job.job_id, ex=self.result_ttl)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.job_id), job.model_dump_json(), ex=self.result_ttl)
+            pipe.xadd(
+                self.stream,
+                {"job_id": job.job_id},
+                maxlen=self.stream_maxlen,
+                approximate=True,
+            )
+            await pipe.execute()
+        metrics.inc("jobs_enqueued_total", result="queued")
+        logger.info("Задача %s поставлена в очередь: user_id=%s", job.job_id, query.user_id)
+        return job
+
+    async def get(self, job_id: str) -> ResponseJobDTO | None:
+        payload = await self.redis.get(self._job_key(job_id))
+        if payload is None:
+            return None
+        return ResponseJobDTO.model_validate_json(payload)
+
+    async def save(self, job: ResponseJobDTO, **update) -> ResponseJobDTO:
+        job = job.model_copy(update={**update, "updated_at": datetime.now()})
+        await self.redis.set(self._job_key(job.job_id), job.model_dump_json(), ex=self.result_ttl)
+        return job
+
+    async def start(self, job: ResponseJobDTO) -> ResponseJobDTO:
+        return await self.save(job, status=JobStatus.RUNNING, attempts=job.attempts + 1)
+
+    async def complete(
+        self, job: ResponseJobDTO, result: ResponseToVacancyEntity
+    ) -> ResponseJobDTO:
+        await self.redis.delete(self._dedupe_key(job.query))
+        return await self.save(job, status=JobStatus.DONE, result=result, error=None)
+
+    async def fail(self, job: ResponseJobDTO, error: str) -> ResponseJobDTO:
+        await self.redis.delete(self._dedupe_key(job.query))
+        return await self.save(job, status=JobStatus.FAILED, error=error)
+
+    async def retry(self, message_id: str, job: ResponseJobDTO, error: str) -> ResponseJobDTO:
+        """Возвращает задачу в конец очереди и подтверждает текущее сообщение"""
+        job = await self.save(job, status=JobStatus.QUEUED, error=error)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(self.stream, {"job_id": job.job_id})
+            pipe.xack(self.stream, self.group, message_id)
+            await pipe.execute()
+        return job
+
+    async def ensure_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    @staticmethod
+    def _messages(entries) -> list[StreamMessage]:
+        messages = []
+        for message_id, fields in entries:
+            # удаленные из потока (обрезанные по maxlen) сообщения приходят без полей
+            fields = {_decode(key): _decode(value) for key, value in (fields or {}).items()}
+            if "job_id" in fields:
+                messages.append((_decode(message_id), fields["job_id"]))
+        return messages
+
+    async def read(self, consumer: str, count: int = 1) -> list[StreamMessage]:
+        """Новые сообщения для consumer'а"""
+        # ожидание не дольше visibility_timeout, чтобы вовремя забирать зависшие задачи
+        block_ms = int(min(self.visibility_timeout, 5.0) * 1000)
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        messages = []
+        for _, entries in response or []:
+            messages.extend(self._messages(entries))
+        return messages
+
+    async def claim_stale(self, consumer: str, count: int = 1) -> list[StreamMessage]:
+        """Сообщения, которые не подтверждены и не продлевались дольше visibility_timeout"""
+        response = await self.redis.xautoclaim(
+            self.stream,
+            self.group,
+            consumer,
+            min_idle_time=int(self.visibility_timeout * 1000),
+            start_id="0-0",
+            count=count,
+        )
+        messages = self._messages(response[1])
+        if messages:
+            metrics.inc("jobs_reclaimed_total", len(messages))
+            logger.warning("Забраны задачи упавших воркеров: %s", [job for _, job in messages])
+        return messages
+
+    async def touch(self, consumer: str, message_id: str) -> None:
+        """Сбрасывает время простоя сообщения, чтобы его не забрал другой воркер"""
+        await self.redis.xclaim(
+            self.stream,
+            self.group,
+            consumer,
+            min_idle_time=0,
+            message_ids=[message_id],
+            justid=True,
+        )
+
+    async def ack(self, message_id: str) -> None:
+        await self.redis.xack(self.stream, self.group, message_id)
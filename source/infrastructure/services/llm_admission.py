@@ -0,0 +1,87 @@
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+
+from redis.asyncio.client import Redis
+
+from source.application.services.ai_service import LLMPriority
+from source.infrastructure.utils.distributed_semaphore import (
+    AdmissionTimeoutError,
+    RedisPrioritySemaphore,
+)
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LLMAdmissionController:
+    """
+    Контроль допуска запросов к LLM для всего парка процессов.
+
+    Для каждого эндпоинта LLM заводится свой распределенный семафор с лимитом
+    одновременных запросов.
+    Интерактивные генерации (бот, API) обслуживаются раньше пакетных и фоновых.
+    Публикует метрики: глубину очереди (llm_queue_depth) и время ожидания (llm_queue_wait_seconds).
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        limits: dict[str, int],
+        default_limit: int,
+        lease_ttl: float,
+        timeout: float,
+    ):
+        self.redis = redis
+        self.limits = limits
+        self.default_limit = default_limit
+        self.lease_ttl = lease_ttl
+        self.timeout = timeout
+        self._semaphores: dict[str, RedisPrioritySemaphore] = {}
+
+    def _semaphore(self, endpoint: str) -> RedisPrioritySemaphore:
+        if endpoint not in self._semaphores:
+            self._semaphores[endpoint] = RedisPrioritySemaphore(
+                self.redis,
+                name=f"llm:{endpoint}",
+                limit=self.limits.get(endpoint, self.default_limit),
+                lease_ttl=self.lease_ttl,
+            )
+        return self._semaphores[endpoint]
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, endpoint: str, priority: LLMPriority, timeout: float | None = None
+    ) -> AsyncIterator[None]:
+        """timeout - ожидание слота, если оно должно быть меньше стандартного"""
+        semaphore = self._semaphore(endpoint)
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        try:
+            async with semaphore.slot(priority, timeout=timeout) as waited:
+                metrics.set_gauge("llm_queue_depth", semaphore.queue_depth, endpoint=endpoint)
+                metrics.observe(
+                    "llm_queue_wait_seconds",
+                    waited,
+                    endpoint=endpoint,
+                    priority=priority.name.lower(),
+                )
+                logger.debug(
+                    "LLM slot acquired: endpoint=%s, priority=%s, waited=%.3f",
+                    endpoint,
+                    priority.name,
+                    waited,
+                )
+                yield
+        except AdmissionTimeoutError:
+            metrics.inc(
+                "llm_admission_timeouts_total", endpoint=endpoint, priority=priority.name.lower()
+            )
+            raise
+
+    async def cooldown(self, endpoint: str, seconds: float) -> None:
+        """Приостанавливает допуск запросов к эндпоинту, например, после ответа 429"""
+        logger.warning(
+            "LLM endpoint=%s rate limited, admission paused for %.1f sec.", endpoint, seconds
+        )
+        metrics.inc("llm_rate_limited_total", endpoint=endpoint)
+        await self._semaphore(endpoint).cooldown(seconds)
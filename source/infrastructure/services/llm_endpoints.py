@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+from redis.asyncio.client import Redis
+
+from source.infrastructure.settings.app import LLMEndpointSettings, app_settings
+from source.infrastructure.utils.circuit_breaker import RedisCircuitBreaker
+
+
+@dataclass
+class LLMEndpoint:
+    """Провайдер/модель LLM вместе с ее circuit breaker'ом"""
+
+    name: str
+    model: str
+    llm: BaseChatModel
+    breaker: RedisCircuitBreaker | None = None
+    # помечать стабильную часть промпта маркером cache_control
+    cache_control: bool = False
+    timeout: float = 60.0  # таймаут одного запроса (в секундах)
+
+
+def build_llm_endpoints(
+    endpoints_settings: list[LLMEndpointSettings], redis: Redis | None = None
+) -> list[LLMEndpoint]:
+    """
+    Создает эндпоинты LLM в порядке приоритета.
+
+    Повторы внутри SDK отключены: повторами и переключением между эндпоинтами управляет
+    AIService. Без Redis эндпоинты создаются без circuit breaker'а.
+    """
+    endpoints = []
+    for settings in endpoints_settings:
+        breaker = None
+        if redis is not None:
+            breaker = RedisCircuitBreaker(
+                redis,
+                name=f"llm:{settings.key}",
+                window=app_settings.LLM_BREAKER_WINDOW,
+                min_requests=app_settings.LLM_BREAKER_MIN_REQUESTS,
+                failure_rate=app_settings.LLM_BREAKER_FAILURE_RATE,
+                slow_call_seconds=app_settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+                slow_rate=app_settings.LLM_BREAKER_SLOW_RATE,
+                open_seconds=app_settings.LLM_BREAKER_OPEN_SECONDS,
+                probe_timeout=settings.timeout * 2,
+            )
+        llm = ChatOpenAI(
+            model=settings.model,
+            temperature=0.7,
+            api_key=settings.api_key,
+            base_url=settings.base_url,
+            timeout=settings.timeout,
+            max_retries=0,
+            stream_usage=True,
+        )
+        endpoints.append(
+            LLMEndpoint(
+                settings.key,
+                settings.model,
+                llm,
+                breaker,
+                settings.uses_cache_control,
+                settings.timeout,
+            )
+        )
+    return endpoints
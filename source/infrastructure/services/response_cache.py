@@ -0,0 +1,67 @@
+import hashlib
+import json
+import logging
+import re
+from typing import Any
+
+from pydantic import BaseModel
+
+from source.application.services.ai_service import GenerateResponseData
+from source.infrastructure.utils.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+# служебные поля сущностей, которые не влияют на содержание отклика
+EXCLUDED_ENTITY_FIELDS = {"id", "created_at"}
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class ResponseCache:
+    """
+    Кэш сгенерированных откликов с адресацией по содержимому.
+
+    Ключ - хэш нормализованных вакансии, резюме, работодателя, правил пользователя,
+    имени модели и версии промпта, поэтому одинаковые запросы разных пользователей
+    попадают в одну запись, а смена модели или промпта автоматически инвалидирует кэш.
+    """
+
+    def __init__(self, cache: TieredCache):
+        self._cache = cache
+
+    @classmethod
+    def _normalize(cls, value: Any) -> Any:
+        if isinstance(value, BaseModel):
+            return cls._normalize(value.model_dump(exclude=EXCLUDED_ENTITY_FIELDS))
+        if isinstance(value, dict):
+            return {str(key): cls._normalize(item) for key, item in value.items()}
+        if isinstance(value, set | frozenset):
+            return sorted(cls._normalize(item) for item in value)
+        if isinstance(value, list | tuple):
+            return [cls._normalize(item) for item in value]
+        if isinstance(value, str):
+            return WHITESPACE_PATTERN.sub(" ", value).strip()
+        return value
+
+    @classmethod
+    def make_key(cls, data: GenerateResponseData, model: str, prompt_version: str) -> str:
+        payload = {
+            "vacancy": cls._normalize(data["vacancy"]),
+            "resume": cls._normalize(data["resume"]),
+            "employer": cls._normalize(data["employer"]),
+            "user_rules": cls._normalize(data["user_rules"]),
+            "model": model,
+            "prompt_version": prompt_version,
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        value = await self._cache.get(key)
+        if value is None:
+            return None
+        logger.debug("Response cache hit: key=%s", key)
+        return value.decode()
+
+    async def set(self, key: str, message: str) -> None:
+        await self._cache.set(key, message.encode())
+        logger.debug("Response saved to cache: key=%s", key)
@@ -0,0 +1,168 @@
+import re
+from dataclasses import dataclass, field
+
+# "Длина отклика не более 800 символов. Допускается отклонение +- 20 символов"
+MAX_LENGTH_PATTERN = re.compile(r"не более\s+(\d+)\s+символ", re.IGNORECASE)
+TOLERANCE_PATTERN = re.compile(r"(?:\+-|±|\+/-)\s*(\d+)")
+# Заглушки, которые LLM оставляет вместо неизвестных данных: "[Ваше имя]", "[Название компании]"
+PLACEHOLDER_PATTERN = re.compile(r",?[ \t]*\[[^\[\]\n]{1,50}\]")
+PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+# предложение вместе с пробелами и переводами строк после него
+SENTENCE_PATTERN = re.compile(r".+?(?:[.!?…]+(?=\s|$)|$)\s*", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class ResponseRules:
+    """
+    Правила пользователя, которые можно проверить без LLM.
+
+    max_length и length_tolerance разбираются из текста правила о длине, forbidden_phrases
+    и required_paragraph задаются в правилах ключами с теми же именами. required_paragraph -
+    фраза (или основа слова), которая должна встречаться в отдельном абзаце письма.
+    """
+
+    max_length: int | None = None
+    length_tolerance: int = 0
+    forbidden_phrases: tuple[str, ...] = ()
+    required_paragraph: str | None = None
+
+    @classmethod
+    def from_user_rules(cls, user_rules: dict) -> "ResponseRules":
+        max_length, tolerance = None, 0
+        for value in user_rules.values():
+            if not isinstance(value, str) or not (match := MAX_LENGTH_PATTERN.search(value)):
+                continue
+            max_length = int(match.group(1))
+            if tolerance_match := TOLERANCE_PATTERN.search(value):
+                tolerance = int(tolerance_match.group(1))
+        return cls(
+            max_length=max_length,
+            length_tolerance=tolerance,
+            forbidden_phrases=tuple(user_rules.get("forbidden_phrases") or ()),
+            required_paragraph=user_rules.get("required_paragraph"),
+        )
+
+    @property
+    def length_limit(self) -> int | None:
+        return None if self.max_length is None else self.max_length + self.length_tolerance
+
+
+@dataclass
+class RulesCheckResult:
+    text: str
+    violations: list[str] = field(default_factory=list)
+    repaired: bool = False
+
+
+class ResponseRulesEnforcer:
+    """
+    Проверка и детерминированное исправление сгенерированного письма по правилам пользователя.
+
+    Заглушки в квадратных скобках удаляются, предложения с запрещенными фразами выбрасываются,
+    слишком длинное письмо сокращается по границам предложений: удаляются последние
+    предложения самых длинных абзацев, кроме приветствия и последнего абзаца (мотивация).
+    Если для соблюдения длины пришлось бы удалить больше max_trim_ratio текста или абзац
+    с required_paragraph отсутствует, нарушение остается - его исправляет LLM.
+    """
+
+    def __init__(self, max_trim_ratio: float = 0.3):
+        self.max_trim_ratio = max_trim_ratio
+
+    def violations(self, text: str, rules: ResponseRules) -> list[str]:
+        violations = []
+        if rules.length_limit is not None and len(text) > rules.length_limit:
+            violations.append(
+                f"длина письма {len(text)} символов, допустимо не более {rules.length_limit}"
+            )
+        if PLACEHOLDER_PATTERN.search(text):
+            violations.append("в письме есть заглушки в квадратных скобках")
+        found = [phrase for phrase in rules.forbidden_phrases if self._contains(text, phrase)]
+        if found:
+            violations.append(f"в письме есть запрещенные фразы: {', '.join(found)}")
+        if rules.required_paragraph and not any(
+            self._contains(paragraph, rules.required_paragraph)
+            for paragraph in self._paragraphs(text)
+        ):
+            violations.append(f"в письме нет абзаца про {rules.required_paragraph}")
+        return violations
+
+    def enforce(
+        self, text: str, rules: ResponseRules, max_trim_ratio: float | None = None
+    ) -> RulesCheckResult:
+        if not self.violations(text, rules):
+            return RulesCheckResult(text)
+        repaired = self._remove_forbidden(text, rules)
+        if rules.length_limit is not None and len(repaired) > rules.length_limit:
+            ratio = self.max_trim_ratio if max_trim_ratio is None else max_trim_ratio
+            repaired = self._trim(repaired, rules.length_limit, ratio) or repaired
+        return RulesCheckResult(
+            text=repaired,
+            violations=self.violations(repaired, rules),
+            repaired=repaired != text,
+        )
+
+    @staticmethod
+    def _contains(text: str, phrase: str) -> bool:
+        return phrase.casefold() in text.casefold()
+
+    @staticmethod
+    def _paragraphs(text: str) -> list[str]:
+        return [paragraph.strip() for paragraph in PARAGRAPH_SPLIT.split(text) if paragraph.strip()]
+
+    @staticmethod
+    def _render(paragraphs: list[list[str]]) -> str:
+        return "\n\n".join("".join(sentences).strip() for sentences in paragraphs if sentences)
+
+    def _split(self, text: str) -> list[list[str]]:
+        return [SENTENCE_PATTERN.findall(paragraph) for paragraph in self._paragraphs(text)]
+
+    def _remove_forbidden(self, text: str, rules: ResponseRules) -> str:
+        text = PLACEHOLDER_PATTERN.sub("", text)
+        if not rules.forbidden_phrases:
+            return text
+        paragraphs = [
+            [
+                sentence
+                for sentence in sentences
+                if not any(self._contains(sentence, phrase) for phrase in rules.forbidden_phrases)
+            ]
+            for sentences in self._split(text)
+        ]
+        return self._render(paragraphs)
+
+    @staticmethod
+    def _removable(paragraphs: list[list[str]], index: int) -> int | None:
+        """
+        Позиция предложения абзаца, которое можно удалить. Приветствие и последний абзац
+        (мотивация) сохраняются, у письма из одного абзаца - первое и последнее предложения
+        """
+        sentences = paragraphs[index]
+        if len(paragraphs) == 1:
+            return len(sentences) - 2 if len(sentences) > 2 else None
+        if index == len(paragraphs) - 1:
+            return None
+        keep = 1 if index == 0 else 0
+        return len(sentences) - 1 if len(sentences) > keep else None
+
+    def _trim(self, text: str, limit: int, max_trim_ratio: float) -> str | None:
+        """Сокращает текст до limit символов по границам предложений, None - если невозможно"""
+        paragraphs = self._split(text)
+        result = self._render(paragraphs)
+        while len(result) > limit:
+            candidates = [
+                (index, position)
+                for index in range(len(paragraphs))
+                if (position := self._removable(paragraphs, index)) is not None
+            ]
+            if not candidates:
+                return None
+            # сокращаем самый длинный абзац
+            index, position = max(
+                candidates, key=lambda candidate: len("".join(paragraphs[candidate[0]]))
+            )
+            del paragraphs[index][position]
+            result = self._render(paragraphs)
+
+        if len(text) - len(result) > max_trim_ratio * len(text):
+            return None
+        return result
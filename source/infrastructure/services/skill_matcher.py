@@ -0,0 +1,154 @@
+import logging
+import re
+import time
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from source.application.dtos.search import SkillMatchDTO
+from source.application.services.skill_matcher import ISkillMatcher
+from source.domain.entities.resume import ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SPACES = re.compile(r"\s+")
+
+# навыки упаковываются в слова по 64 бита
+WORD_BITS = 64
+
+
+def normalize_skill(skill: str) -> str:
+    """Навыки из резюме и вакансий пишутся по-разному: 'PostgreSQL', 'postgresql ', ..."""
+    return SPACES.sub(" ", skill).strip().casefold()
+
+
+class SkillVocabulary:
+    """
+    Общий словарь навыков: номер навыка - номер бита в битовом множестве.
+
+    Словарь только растет, поэтому ранее закодированные множества остаются верными
+    (недостающие старшие слова считаются нулевыми).
+    """
+
+    def __init__(self):
+        self._index: dict[str, int] = {}
+        # навыки в исходном написании: повторная нормализация не нужна
+        self._raw_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def entries(self) -> int:
+        """Количество навыков в исходном написании (не меньше количества навыков)"""
+        return len(self._raw_index)
+
+    @property
+    def words(self) -> int:
+        return max(-(-len(self._index) // WORD_BITS), 1)
+
+    def ids(self, skills: Iterable[str], add: bool = True) -> list[int]:
+        """Номера навыков. add=False - неизвестные навыки пропускаются, словарь не меняется"""
+        ids = set()
+        for raw_skill in skills:
+            skill_id = self._raw_index.get(raw_skill)
+            if skill_id is None:
+                skill = normalize_skill(raw_skill)
+                if not skill:
+                    continue
+                skill_id = self._index.get(skill)
+                if skill_id is None:
+                    if not add:
+                        continue
+                    skill_id = self._index[skill] = len(self._index)
+                self._raw_index[raw_skill] = skill_id
+            ids.add(skill_id)
+        return list(ids)
+
+
+class SkillMatcher(ISkillMatcher):
+    """
+    Оценка совпадения навыков резюме и вакансий на битовых множествах.
+
+    Навыки вакансий кодируются в матрицу uint64 (строка - вакансия, биты - навыки общего
+    словаря), резюме - в одну такую строку. Оценки всех вакансий считаются одним
+    векторизованным проходом: popcount(вакансия & резюме) / popcount(вакансия).
+
+    Словарь общий для вызовов rank, но rank не хранит закодированные множества между
+    вызовами, поэтому словарь больше max_entries навыков заменяется новым - иначе
+    у долго живущего процесса он рос бы без ограничений вместе с шириной матриц.
+    """
+
+    def __init__(self, vocabulary: SkillVocabulary | None = None, max_entries: int = 50_000):
+        self.vocabulary = vocabulary or SkillVocabulary()
+        self.max_entries = max_entries
+
+    def encode(self, skill_sets: Sequence[Iterable[str]], add: bool = True) -> np.ndarray:
+        """Матрица битовых множеств навыков (len(skill_sets), vocabulary.words)"""
+        rows: list[int] = []
+        ids: list[int] = []
+        for row, skills in enumerate(skill_sets):
+            skill_ids = self.vocabulary.ids(skills, add=add)
+            rows.extend([row] * len(skill_ids))
+            ids.extend(skill_ids)
+        matrix = np.zeros((len(skill_sets), self.vocabulary.words), dtype=np.uint64)
+        bits = np.asarray(ids, dtype=np.uint64)
+        np.bitwise_or.at(
+            matrix,
+            (np.asarray(rows, dtype=np.intp), (bits // WORD_BITS).astype(np.intp)),
+            np.left_shift(np.uint64(1), bits % WORD_BITS),
+        )
+        return matrix
+
+    @staticmethod
+    def score(resume_bits: np.ndarray, vacancies_bits: np.ndarray) -> np.ndarray:
+        """
+        Доля навыков каждой вакансии, которые есть в резюме (NaN - у вакансии нет навыков).
+
+        resume_bits - строка битового множества резюме, vacancies_bits - матрица вакансий;
+        закодированные при разном размере словаря множества дополняются нулевыми словами.
+        """
+        words = max(resume_bits.shape[-1], vacancies_bits.shape[-1])
+        resume_bits = np.pad(resume_bits, (0, words - resume_bits.shape[-1]))
+        vacancies_bits = np.pad(vacancies_bits, ((0, 0), (0, words - vacancies_bits.shape[-1])))
+        matched = np.bitwise_count(vacancies_bits & resume_bits).sum(axis=1, dtype=np.int32)
+        required = np.bitwise_count(vacancies_bits).sum(axis=1, dtype=np.int32)
+        scores = np.full(len(vacancies_bits), np.nan, dtype=np.float32)
+        np.divide(matched, required, out=scores, where=required > 0)
+        return scores
+
+    def rank(
+        self, resume: ResumeEntity, vacancies: Sequence[VacancyEntity], top: int | None = None
+    ) -> list[SkillMatchDTO]:
+        start = time.perf_counter()
+        if self.vocabulary.entries > self.max_entries:
+            logger.debug("Словарь навыков превысил %s записей, сбрасываем", self.max_entries)
+            metrics.inc("skill_vocabulary_resets_total")
+            self.vocabulary = SkillVocabulary()
+        vacancies_bits = self.encode(
+            [[skill["name"] for skill in vacancy.key_skills] for vacancy in vacancies]
+        )
+        # навыков резюме, которых нет ни в одной вакансии, в словарь не добавляем
+        resume_bits = self.encode([resume.skills], add=False)[0]
+        scores = self.score(resume_bits, vacancies_bits)
+        # вакансии без навыков - в конце, при равной оценке сохраняется исходный порядок
+        order = np.argsort(-np.nan_to_num(scores, nan=-1.0), kind="stable")[:top]
+        metrics.observe("skill_match_seconds", time.perf_counter() - start)
+        logger.debug("Ранжировано вакансий по навыкам: %s", len(vacancies))
+
+        resume_skills = {normalize_skill(skill) for skill in resume.skills}
+        result = []
+        for i in order.tolist():
+            vacancy = vacancies[i]
+            names = [skill["name"] for skill in vacancy.key_skills]
+            result.append(
+                SkillMatchDTO(
+                    vacancy=vacancy,
+                    score=None if np.isnan(scores[i]) else round(float(scores[i]), 4),
+                    matched_skills=[n for n in names if normalize_skill(n) in resume_skills],
+                    missing_skills=[n for n in names if normalize_skill(n) not in resume_skills],
+                )
+            )
+        return result
@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import math
+import re
+from html.parser import HTMLParser
+
+from source.infrastructure.utils.cache import LRUCache
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Теги, после которых начинается новая строка текста
+BLOCK_TAGS = frozenset(
+    {"p", "div", "br", "li", "ul", "ol", "tr", "table", "h1", "h2", "h3", "h4", "h5", "h6"}
+)
+# Теги, содержимое которых не является текстом описания
+SKIP_TAGS = frozenset({"script", "style", "noscript", "iframe"})
+
+# Шаблонные строки описаний вакансий hh.ru (призывы откликнуться и т.п.), которые не несут
+# информации для сопроводительного письма. Проверяется вся строка целиком
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"(ждем|ждём) (ваш\w* )?(резюме|отклик\w*)\W*",
+        r"(откликайтесь|присылайте (ваше )?резюме)\W*",
+        r"(будем|будет) рады? (видеть )?(вас|тебя) в (нашей )?команде\W*",
+        r"если (вас|тебя) заинтересовала (эта |наша )?вакансия.*",
+        r"(мы )?(ждем|ждём) (именно )?(вас|тебя)\W*",
+    )
+]
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+            if tag == "li":
+                self.parts.append("- ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Преобразует HTML в текст: блоки - отдельными строками, элементы списков с '- '"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return "".join(parser.parts)
+
+
+def approx_tokens(text: str) -> int:
+    """Оценка количества токенов (~4 символа на токен, как count_tokens_approximately)"""
+    return math.ceil(len(text) / 4)
+
+
+def normalize_description(html: str) -> str:
+    """
+    Компактный текст описания для промпта: без разметки, лишних пробелов, шаблонных
+    фраз и повторяющихся строк. Повторы ищутся в пределах раздела (от заголовка вида
+    "Условия:" до следующего), заголовки разделов без содержимого не выводятся
+    """
+    lines = []
+    heading: str | None = None  # заголовок раздела, еще не добавленный в текст
+    seen: set[str] = set()
+    for line in html_to_text(html).splitlines():
+        line = " ".join(line.split())
+        if not line or line == "-":
+            continue
+        if any(pattern.fullmatch(line.lstrip("- ")) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        if not line.startswith("- ") and line.endswith(":"):
+            heading, seen = line, set()
+            continue
+        key = line.lstrip("- ").casefold()
+        if key in seen:
+            continue
+        seen.add(key)
+        if heading is not None:
+            lines.append(heading)
+            heading = None
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class DescriptionPreprocessor:
+    """
+    Предобработка описаний вакансий и работодателей hh.ru перед передачей в промпт.
+
+    Результат кэшируется в памяти процесса по hh_id (с проверкой хэша исходного текста,
+    чтобы изменение описания на hh.ru не отдавало устаревший текст). Экономия токенов
+    учитывается в метриках description_tokens_total (stage=raw/normalized).
+    """
+
+    def __init__(self, cache_size: int = 2048):
+        self._cache: LRUCache[str, tuple[str, str]] = LRUCache(maxsize=cache_size)
+
+    def normalize(self, kind: str, hh_id: str, html: str | None) -> str:
+        if not html:
+            return ""
+        key = f"{kind}:{hh_id}"
+        digest = hashlib.sha256(html.encode()).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == digest:
+            metrics.inc("description_preprocess_total", kind=kind, result="cached")
+            return cached[1]
+
+        text = normalize_description(html)
+        self._cache.set(key, (digest, text))
+        raw_tokens, tokens = approx_tokens(html), approx_tokens(text)
+        metrics.inc("description_preprocess_total", kind=kind, result="processed")
+        metrics.inc("description_tokens_total", raw_tokens, kind=kind, stage="raw")
+        metrics.inc("description_tokens_total", tokens, kind=kind, stage="normalized")
+        logger.debug(
+            "Описание %s сокращено: ~%s -> ~%s токенов (-%.0f%%)",
+            key,
+            raw_tokens,
+            tokens,
+            100 * (1 - tokens / raw_tokens) if raw_tokens else 0,
+        )
+        return text
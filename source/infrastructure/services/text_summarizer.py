@@ -0,0 +1,200 @@
+import hashlib
+import logging
+import re
+from collections.abc import Iterable
+
+import numpy as np
+
+from source.infrastructure.services.text_preprocessing import approx_tokens
+from source.infrastructure.utils.cache import LRUCache
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?…;])\s+(?=[A-ZА-ЯЁ0-9\"«-])")
+WORD = re.compile(r"\w+", re.UNICODE)
+
+# Основы слов, по которым предложение считается требованием к кандидату или описанием задач.
+# Такие предложения важнее остальных для сопроводительного письма
+REQUIREMENT_STEMS = (
+    "требован",
+    "обязанност",
+    "опыт",
+    "знани",
+    "умени",
+    "навык",
+    "владени",
+    "понимани",
+    "будет плюсом",
+    "задач",
+    "стек",
+    "requirement",
+    "experience",
+    "skill",
+    "knowledge",
+)
+
+STOP_WORDS = frozenset(
+    """
+    и в во не что он на я с со как а то все она так его но да ты к у же вы за бы по только ее
+    мне было вот от меня еще нет о из ему теперь когда даже ну вдруг ли если уже или ни быть был
+    него до вас нибудь опять уж вам ведь там потом себя ничего ей может они тут где есть надо ней
+    для мы тебя их чем была сам чтоб без будто чего раз тоже себе под будет ж тогда кто этот того
+    потому этого какой совсем ним здесь этом один почти мой тем чтобы нее были куда зачем всех
+    можно при наконец два об другой хоть после над больше тот через эти нас про всего них какая
+    много разве три эту моя впрочем хорошо свою этой перед иногда лучше чуть том нельзя такой им
+    более всегда конечно всю между наш наши наша нашей нашей вашей ваш
+    the a an and or of to in on for with is are be as at by from this that it we you our your
+    """.split()
+)
+
+
+def split_sentences(text: str) -> list[str]:
+    """Строки текста (пункты списков, заголовки) и предложения внутри них"""
+    sentences = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            sentences.extend(part for part in SENTENCE_SPLIT.split(line) if part.strip())
+    return sentences
+
+
+def _words(sentence: str) -> list[str]:
+    return [
+        word
+        for word in WORD.findall(sentence.casefold())
+        if len(word) > 2 and word not in STOP_WORDS and not word.isdigit()
+    ]
+
+
+def textrank_scores(
+    sentences: list[str], damping: float = 0.85, iterations: int = 50
+) -> np.ndarray:
+    """
+    Важность предложений по TextRank на графе TF-IDF сходства предложений.
+
+    Вершины - предложения, вес ребра - косинусное сходство их TF-IDF векторов.
+    """
+    n = len(sentences)
+    if n < 2:
+        return np.ones(n)
+    tokenized = [_words(sentence) for sentence in sentences]
+    vocabulary = {word: i for i, word in enumerate({w for words in tokenized for w in words})}
+    if not vocabulary:
+        return np.ones(n)
+
+    tf = np.zeros((n, len(vocabulary)))
+    for row, words in enumerate(tokenized):
+        for word in words:
+            tf[row, vocabulary[word]] += 1
+    lengths = tf.sum(axis=1, keepdims=True)
+    tf = np.divide(tf, lengths, out=np.zeros_like(tf), where=lengths > 0)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1 + n) / (1 + df)) + 1
+    tfidf = tf * idf
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf = np.divide(tfidf, norms, out=np.zeros_like(tfidf), where=norms > 0)
+
+    similarity = tfidf @ tfidf.T
+    np.fill_diagonal(similarity, 0.0)
+    weights = similarity.sum(axis=1, keepdims=True)
+    # предложение без общих слов с остальными "ссылается" на все одинаково
+    transition = np.divide(
+        similarity, weights, out=np.full_like(similarity, 1 / n), where=weights > 0
+    )
+
+    scores = np.full(n, 1 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def truncate_to_budget(text: str, token_budget: int) -> str:
+    """Начало текста в пределах бюджета токенов, обрезанное по границе слова"""
+    limit = token_budget * 4  # approx_tokens: ~4 символа на токен
+    if len(text) <= limit:
+        return text
+    head = text[:limit]
+    if not text[limit].isspace():
+        # последнее слово обрезано - отбрасываем его, если оно не единственное
+        words = head.rsplit(maxsplit=1)
+        if len(words) == 2:
+            head = words[0]
+    return head.rstrip()
+
+
+class ExtractiveSummarizer:
+    """
+    Локальное извлекающее сокращение длинных описаний до бюджета токенов без обращения к LLM.
+
+    Текст разбивается на строки и предложения, их важность оценивается TextRank (TF-IDF
+    сходство, NumPy). В первую очередь сохраняются предложения с требованиями, задачами и
+    навыками (включая переданные ключевые навыки вакансии), затем - самые важные из остальных,
+    пока не исчерпан бюджет. Порядок предложений в результате исходный.
+    Результаты кэшируются в памяти процесса по хэшу содержимого.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self._cache: LRUCache[str, str] = LRUCache(maxsize=cache_size)
+
+    @staticmethod
+    def _cache_key(text: str, token_budget: int, keywords: list[str]) -> str:
+        payload = "\x00".join([str(token_budget), *keywords, text])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def summarize(self, text: str, token_budget: int | None, keywords: Iterable[str] = ()) -> str:
+        if token_budget is None or approx_tokens(text) <= token_budget:
+            return text
+        keywords = sorted({keyword.casefold() for keyword in keywords if keyword})
+        key = self._cache_key(text, token_budget, keywords)
+        cached = self._cache.get(key)
+        if cached is not None:
+            metrics.inc("summarizer_requests_total", result="cached")
+            return cached
+
+        summary = self._summarize(text, token_budget, keywords)
+        self._cache.set(key, summary)
+        metrics.inc("summarizer_requests_total", result="summarized")
+        metrics.inc("summarizer_tokens_total", approx_tokens(text), stage="raw")
+        metrics.inc("summarizer_tokens_total", approx_tokens(summary), stage="summary")
+        logger.debug(
+            "Текст сокращен: ~%s -> ~%s токенов (бюджет %s)",
+            approx_tokens(text),
+            approx_tokens(summary),
+            token_budget,
+        )
+        return summary
+
+    @staticmethod
+    def _is_priority(sentence: str, keywords: list[str]) -> bool:
+        lowered = sentence.casefold()
+        return any(stem in lowered for stem in REQUIREMENT_STEMS) or any(
+            keyword in lowered for keyword in keywords
+        )
+
+    def _summarize(self, text: str, token_budget: int, keywords: list[str]) -> str:
+        sentences = split_sentences(text)
+        if not sentences:
+            return ""
+        scores = textrank_scores(sentences)
+        priority = np.array([self._is_priority(sentence, keywords) for sentence in sentences])
+        # сначала приоритетные предложения, внутри групп - по убыванию важности
+        order = np.lexsort((-scores, ~priority))
+
+        selected: list[int] = []
+        used = 0
+        for index in order:
+            tokens = approx_tokens(sentences[index]) + 1  # +1 - перевод строки
+            if used + tokens > token_budget:
+                continue
+            selected.append(int(index))
+            used += tokens
+        if not selected:
+            # ни одно предложение не помещается (например, текст без знаков препинания) -
+            # вместо пустого описания оставляем начало самого важного предложения
+            return truncate_to_budget(sentences[order[0]], token_budget)
+        return "\n".join(sentences[index] for index in sorted(selected))
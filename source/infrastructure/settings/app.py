@@ -1,8 +1,32 @@
 from pathlib import Path
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class LLMEndpointSettings(BaseModel):
+    """Провайдер/модель LLM, на которую можно отправить запрос"""
+
+    model: str
+    base_url: str
+    api_key: str
+    name: str | None = None  # Имя для логов, метрик и лимитов (по умолчанию - модель)
+    timeout: float = 60.0  # Таймаут одного запроса к эндпоинту (в секундах)
+    # Явные маркеры кэширования промпта (cache_control). По умолчанию включаются для моделей,
+    # которым они нужны (Anthropic и Gemini через OpenRouter)
+    prompt_cache_control: bool | None = None
+
+    @property
+    def key(self) -> str:
+        return self.name or self.model
+
+    @property
+    def uses_cache_control(self) -> bool:
+        if self.prompt_cache_control is not None:
+            return self.prompt_cache_control
+        return self.model.startswith(("anthropic/", "google/gemini"))
+
+
 class AppSettings(BaseSettings):
     # Базовые настройки приложения
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent.parent
@@ -15,6 +39,8 @@ class AppSettings(BaseSettings):
     BOT_APP_PORT: int
     BACKEND_HOST: str
     BACKEND_PORT: int
+    # Минимальный интервал (в секундах) между редактированиями сообщения при потоковой генерации
+    BOT_STREAM_EDIT_INTERVAL: float = 1.0
     # Настройки базы данных
     DB_USER: str
     DB_PASS: str
@@ -32,13 +58,109 @@ class AppSettings(BaseSettings):
     HH_CLIENT_SECRET: str
     HH_REDIRECT_URI: str
     HH_TOKEN_URL: str = "https://api.hh.ru/token"
+    HH_TOKEN_CACHE_SIZE: int = 1024  # Количество пользователей, чьи токены хранятся в процессе
+    # Максимальное время (в секундах) использования токенов из кэша процесса без чтения Redis
+    HH_TOKEN_CACHE_TTL: float = 60.0
+    # За сколько секунд до истечения access_token обновлять его в фоне (0 - при истечении).
+    # Если hh.ru отклонит раннее обновление, токен обновится после истечения
+    HH_TOKEN_REFRESH_AHEAD: float = 0.0
+    HH_TOKEN_LOCK_TTL: float = 30.0  # Максимальное время блокировки обновления токенов
+    # Количество предобработанных описаний вакансий и работодателей в in-process кэше
+    HH_DESCRIPTION_CACHE_SIZE: int = 2048
+    # Бюджет токенов описаний вакансии и работодателя в промпте, длинные описания сокращаются
+    # локально (извлечением важных предложений). None - без сокращения
+    HH_VACANCY_TOKEN_BUDGET: int | None = 1000
+    HH_EMPLOYER_TOKEN_BUDGET: int | None = 400
+    # Хранить загруженные вакансии и работодателей в Postgres и отдавать их оттуда
+    HH_STORE_ENABLED: bool = True
+    # Возраст записи в БД (в секундах), после которого она обновляется с hh.ru в фоне
+    HH_STORE_REFRESH_AFTER: dict[str, int] = {
+        "vacancy": 60 * 60,
+        "employer": 60 * 60 * 24,
+    }
+    # Возраст записи (в секундах), после которого она не отдается без запроса к hh.ru
+    HH_STORE_MAX_STALENESS: dict[str, int] = {
+        "vacancy": 60 * 60 * 24,
+        "employer": 60 * 60 * 24 * 7,
+    }
+    # Время (в секундах), в течение которого ответы hh.ru отдаются из кэша без запроса.
+    # Эндпоинты без TTL не кэшируются
+    HH_CACHE_TTLS: dict[str, int] = {
+        "vacancy": 60 * 10,
+        "employer": 60 * 60 * 24,
+        "resume": 60 * 5,
+    }
+    # Сколько еще хранить устаревший ответ для условного запроса (ETag/If-Modified-Since)
+    HH_CACHE_RETENTION: int = 60 * 60 * 24 * 7
+    HH_CACHE_LRU_SIZE: int = 1024  # Количество ответов hh.ru в in-process кэше
+    # Объединять одинаковые запросы к hh.ru между процессами (блокировка в Redis)
+    HH_SINGLE_FLIGHT_REDIS: bool = True
+    # Одновременных запросов к hh.ru из одного процесса, уменьшается после ответов 429/503
+    HH_CONCURRENCY_PER_HOST: int = 8
+    HH_MAX_BACKOFF: float = 30.0  # Максимальная пауза после 429/503 без Retry-After (в секундах)
+    HH_HTTP2: bool = True  # HTTP/2: запросы к hh.ru идут параллельно по одному соединению
+    HH_POOL_MAX_CONNECTIONS: int = 20  # Максимум соединений с hh.ru в пуле процесса
+    HH_POOL_MAX_KEEPALIVE: int = 10  # Количество открытых соединений, ожидающих запросов
+    HH_KEEPALIVE_EXPIRY: float = 30.0  # Время жизни простаивающего соединения (в секундах)
+    HH_CONNECT_TIMEOUT: float = 5.0  # Таймаут установки соединения (в секундах)
+    HH_READ_TIMEOUT: float = 20.0  # Таймаут ответа hh.ru (в секундах)
+    # Бюджет повторов запросов к hh.ru и LLM: повторов за RETRY_BUDGET_WINDOW секунд не больше
+    # RETRY_BUDGET_RATIO от числа запросов плюс RETRY_BUDGET_MIN_RETRIES
+    RETRY_BUDGET_RATIO: float = 0.1
+    RETRY_BUDGET_WINDOW: float = 10.0
+    RETRY_BUDGET_MIN_RETRIES: int = 5
     # Настройки для работы с llm
     OPENAI_MODEL: str
     OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
     OPENROUTER_API_KEY: str
+    OPENAI_TIMEOUT: float = 60.0  # Таймаут запроса к основной модели (в секундах)
+    # Общий срок генерации отклика: сбор данных с hh.ru, запросы к LLM и все повторы
+    # (в секундах). None - без ограничения
+    AI_REQUEST_DEADLINE: float | None = 120.0
+    # Упорядоченный список эндпоинтов LLM (JSON). Если не задан - используется только
+    # основная модель OPENAI_MODEL через OpenRouter
+    LLM_ENDPOINTS: list[LLMEndpointSettings] = []
+    # Circuit breaker эндпоинтов LLM (состояние общее для всех процессов)
+    LLM_BREAKER_WINDOW: float = 60.0  # Окно подсчета ошибок (в секундах)
+    LLM_BREAKER_MIN_REQUESTS: int = 5  # Минимум запросов в окне для оценки эндпоинта
+    LLM_BREAKER_FAILURE_RATE: float = 0.5  # Доля ошибок, при которой эндпоинт отключается
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 45.0  # Запрос дольше этого времени считается медленным
+    LLM_BREAKER_SLOW_RATE: float = 0.8  # Доля медленных запросов, при которой эндпоинт отключается
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0  # Время до пробного запроса к отключенному эндпоинту
+    # Цены моделей в долларах за 1 млн токенов для оценки стоимости запросов, например:
+    # {"openai/gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.6}}
+    LLM_PRICES: dict[str, dict[str, float]] = {}
+    # Контроль допуска запросов к LLM (общий для всех процессов)
+    LLM_CONCURRENCY_LIMITS: dict[str, int] = {}  # Лимит одновременных запросов по эндпоинтам
+    LLM_DEFAULT_CONCURRENCY: int = 8  # Лимит для эндпоинтов, не указанных в LLM_CONCURRENCY_LIMITS
+    LLM_ADMISSION_TIMEOUT: float = 120.0  # Максимальное ожидание слота (в секундах)
+    LLM_SLOT_LEASE_TTL: float = 120.0  # Время аренды слота, продлевается во время запроса
+    # Бюджет (в токенах) истории исправлений отклика, после которого она сворачивается в краткое
+    # описание замечаний. Контекст (вакансия, резюме, работодатель, правила) в бюджет не входит
+    AI_HISTORY_TOKEN_BUDGET: int = 3000
+    # Количество вакансий, обрабатываемых одновременно при пакетной генерации
+    BATCH_MAX_CONCURRENCY: int = 4
+    # Фоновая генерация откликов воркерами (очередь на Redis Streams)
+    AI_JOBS_ENABLED: bool = False  # Бот ставит генерацию в очередь, а не ждет ее в обработчике
+    JOB_WORKER_CONCURRENCY: int = 4  # Количество задач, выполняемых одним воркером одновременно
+    JOB_MAX_ATTEMPTS: int = 3  # Количество запусков задачи до признания ее неудачной
+    # Время (в секундах), после которого задача без продления забирается другим воркером
+    JOB_VISIBILITY_TIMEOUT: float = 300.0
+    JOB_RESULT_TTL: int = 60 * 60 * 24  # Время хранения задачи и ее результата (в секундах)
     # настройки TTL для Redis checkpoints (в минутах)
     REDIS_CHECKPOINT_NUM_DB: int
     REDIS_CHECKPOINT_TTL: int = 60  # Время жизни сейфпоинтов по умолчанию (1 час)
+    # Хранить в checkpoint'ах ссылки на сущности (вакансия, резюме, работодатель) вместо
+    # полных сущностей. Сами сущности хранятся в Redis один раз
+    AI_STATE_ENTITY_REFS: bool = True
+    # Время жизни сущностей в хранилище (в секундах), должно быть больше REDIS_CHECKPOINT_TTL
+    AI_ENTITY_STORE_TTL: int = 60 * 60 * 24
+    AI_ENTITY_STORE_LRU_SIZE: int = 1024  # Количество сущностей в in-process кэше
+    # Размер (в байтах), начиная с которого значения checkpoint'ов сжимаются zstd
+    CHECKPOINT_COMPRESS_THRESHOLD: int | None = 4096
+    # Настройки кэша сгенерированных откликов
+    RESPONSE_CACHE_TTL: int = 60 * 60 * 24  # Время жизни записи в Redis (в секундах)
+    RESPONSE_CACHE_LRU_SIZE: int = 512  # Количество откликов в in-process кэше
 
     model_config = SettingsConfigDict(env_file=f"/{BASE_DIR}/.env", extra="ignore")
 
@@ -48,6 +170,19 @@ class AppSettings(BaseSettings):
             f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:5432/{self.DB_NAME}"
         )
 
+    @property
+    def llm_endpoints(self) -> list[LLMEndpointSettings]:
+        if self.LLM_ENDPOINTS:
+            return self.LLM_ENDPOINTS
+        return [
+            LLMEndpointSettings(
+                model=self.OPENAI_MODEL,
+                base_url=self.OPENROUTER_BASE_URL,
+                api_key=self.OPENROUTER_API_KEY,
+                timeout=self.OPENAI_TIMEOUT,
+            )
+        ]
+
     @property
     def redis_url(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_CHECKPOINT_NUM_DB}"
@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import OrderedDict
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache[K, V]:
+    """
+    Ограниченный по размеру in-process кэш с вытеснением давно неиспользуемых записей
+    и опциональным временем жизни записей (в секундах).
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class TieredCache:
+    """
+    Двухуровневый кэш: ограниченный LRU в памяти процесса и общий для всех воркеров Redis с TTL.
+
+    Ошибки Redis не прерывают работу - запись считается промахом,
+    так как кэш не должен влиять на доступность основного сценария.
+    Попадания и промахи учитываются в метриках cache_hits_total/cache_misses_total.
+    """
+
+    def __init__(self, redis: Redis, namespace: str, ttl: int, lru_size: int):
+        self.redis = redis
+        self.namespace = namespace
+        self.ttl = ttl
+        self._local: LRUCache[str, bytes] = LRUCache(lru_size, ttl=ttl)
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> bytes | None:
+        value = self._local.get(key)
+        if value is not None:
+            metrics.inc("cache_hits_total", cache=self.namespace, tier="memory")
+            return value
+
+        try:
+            value = await self.redis.get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning("Кэш %s недоступен в Redis: %s", self.namespace, e)
+            value = None
+
+        if value is None:
+            metrics.inc("cache_misses_total", cache=self.namespace)
+            return None
+
+        metrics.inc("cache_hits_total", cache=self.namespace, tier="redis")
+        self._local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        ttl = ttl or self.ttl
+        self._local.set(key, value, ttl=ttl)
+        try:
+            await self.redis.set(self._redis_key(key), value, ex=ttl)
+        except RedisError as e:
+            logger.warning("Не удалось сохранить запись кэша %s в Redis: %s", self.namespace, e)
+
+    async def delete(self, key: str) -> None:
+        self._local.pop(key)
+        try:
+            await self.redis.delete(self._redis_key(key))
+        except RedisError as e:
+            logger.warning("Не удалось удалить запись кэша %s из Redis: %s", self.namespace, e)
@@ -0,0 +1,214 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from enum import StrEnum
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Разрешение на запрос. Если эндпоинт отключен (ключ open еще жив) - отказ.
+# Если время отключения истекло (остался ключ tripped) - пропускается один пробный запрос.
+# KEYS: open, tripped, probe
+# ARGV: token, probe_ms
+ALLOW_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return {0, 'open'}
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    if redis.call('SET', KEYS[3], ARGV[1], 'NX', 'PX', tonumber(ARGV[2])) then
+        return {1, 'half_open'}
+    end
+    return {0, 'half_open'}
+end
+return {1, 'closed'}
+"""
+
+# Учет результата запроса в скользящем окне из корзин (поля хэша "<корзина>:<счетчик>").
+# Результат пробного запроса сразу закрывает или снова отключает эндпоинт.
+# KEYS: stats, open, tripped, probe
+# ARGV: failed, slow, bucket_ms, buckets, min_requests, failure_rate, slow_rate, open_ms, probe
+RECORD_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+if ARGV[9] == '1' then
+    redis.call('DEL', KEYS[4])
+    if ARGV[1] == '0' and ARGV[2] == '0' then
+        redis.call('DEL', KEYS[1], KEYS[3])
+        return 'closed'
+    end
+    redis.call('SET', KEYS[2], 1, 'PX', tonumber(ARGV[8]))
+    return 'open'
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        return 'open'
+    end
+    return 'half_open'
+end
+local bucket_ms = tonumber(ARGV[3])
+local bucket = math.floor(now / bucket_ms)
+redis.call('HINCRBY', KEYS[1], bucket .. ':total', 1)
+if ARGV[1] == '1' then
+    redis.call('HINCRBY', KEYS[1], bucket .. ':failed', 1)
+end
+if ARGV[2] == '1' then
+    redis.call('HINCRBY', KEYS[1], bucket .. ':slow', 1)
+end
+redis.call('PEXPIRE', KEYS[1], bucket_ms * tonumber(ARGV[4]))
+local oldest = bucket - tonumber(ARGV[4]) + 1
+local counters = {total = 0, failed = 0, slow = 0}
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    local sep = string.find(fields[i], ':', 1, true)
+    if tonumber(string.sub(fields[i], 1, sep - 1)) < oldest then
+        redis.call('HDEL', KEYS[1], fields[i])
+    else
+        local name = string.sub(fields[i], sep + 1)
+        counters[name] = counters[name] + tonumber(fields[i + 1])
+    end
+end
+if counters.total >= tonumber(ARGV[5]) and (
+    counters.failed / counters.total >= tonumber(ARGV[6])
+    or counters.slow / counters.total >= tonumber(ARGV[7])
+) then
+    redis.call('DEL', KEYS[1])
+    redis.call('SET', KEYS[2], 1, 'PX', tonumber(ARGV[8]))
+    redis.call('SET', KEYS[3], 1)
+    return 'open'
+end
+return 'closed'
+"""
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+# значения gauge circuit_breaker_state
+STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Запрос отклонен: все доступные эндпоинты отключены circuit breaker'ом"""
+
+
+@dataclass(frozen=True)
+class CircuitPermit:
+    """Разрешение на один запрос через circuit breaker"""
+
+    token: str
+    probe: bool = False
+
+
+class RedisCircuitBreaker:
+    """
+    Circuit breaker с общим для всех процессов состоянием в Redis.
+
+    Результаты запросов копятся в скользящем окне window секунд. Если в окне набралось
+    не меньше min_requests запросов и доля ошибок (или медленных запросов) превысила порог,
+    эндпоинт отключается (open) на open_seconds во всех процессах. После этого пропускается
+    ровно один пробный запрос (half-open): успех закрывает breaker, ошибка - снова отключает.
+
+    Публикует метрики: circuit_breaker_state (0 - closed, 1 - half-open, 2 - open),
+    circuit_breaker_rejected_total и circuit_breaker_transitions_total.
+    При недоступности Redis breaker пропускает все запросы.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: str,
+        *,
+        window: float = 60.0,
+        buckets: int = 10,
+        min_requests: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 45.0,
+        slow_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        probe_timeout: float = 120.0,
+    ):
+        self.redis = redis
+        self.name = name
+        self.buckets = buckets
+        self.bucket_ms = max(int(window * 1000 / buckets), 1)
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_ms = int(open_seconds * 1000)
+        self.probe_ms = int(probe_timeout * 1000)
+        self._stats_key = f"breaker:{name}:stats"
+        self._open_key = f"breaker:{name}:open"
+        self._tripped_key = f"breaker:{name}:tripped"
+        self._probe_key = f"breaker:{name}:probe"
+        self._allow = redis.register_script(ALLOW_SCRIPT)
+        self._record = redis.register_script(RECORD_SCRIPT)
+        self.state = CircuitState.CLOSED
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self.state:
+            logger.warning("Circuit breaker %s: %s -> %s", self.name, self.state, state)
+            metrics.inc("circuit_breaker_transitions_total", breaker=self.name, state=state)
+        self.state = state
+        metrics.set_gauge("circuit_breaker_state", STATE_GAUGE_VALUES[state], breaker=self.name)
+
+    async def allow(self) -> CircuitPermit | None:
+        """Возвращает разрешение на запрос или None, если эндпоинт отключен"""
+        token = uuid.uuid4().hex
+        try:
+            allowed, state = await self._allow(
+                keys=[self._open_key, self._tripped_key, self._probe_key],
+                args=[token, self.probe_ms],
+            )
+        except RedisError as e:
+            logger.warning("Circuit breaker %s недоступен, запрос пропущен: %s", self.name, e)
+            return CircuitPermit(token)
+        state = CircuitState(state.decode() if isinstance(state, bytes) else state)
+        self._set_state(state)
+        if not allowed:
+            metrics.inc("circuit_breaker_rejected_total", breaker=self.name)
+            return None
+        return CircuitPermit(token, probe=state == CircuitState.HALF_OPEN)
+
+    async def _save_result(self, permit: CircuitPermit, failed: bool, slow: bool) -> None:
+        try:
+            state = await self._record(
+                keys=[self._stats_key, self._open_key, self._tripped_key, self._probe_key],
+                args=[
+                    int(failed),
+                    int(slow),
+                    self.bucket_ms,
+                    self.buckets,
+                    self.min_requests,
+                    self.failure_rate,
+                    self.slow_rate,
+                    self.open_ms,
+                    int(permit.probe),
+                ],
+            )
+        except RedisError as e:
+            logger.warning("Не удалось сохранить результат в circuit breaker %s: %s", self.name, e)
+            return
+        self._set_state(CircuitState(state.decode() if isinstance(state, bytes) else state))
+
+    async def record_success(self, permit: CircuitPermit, duration: float) -> None:
+        await self._save_result(permit, failed=False, slow=duration >= self.slow_call_seconds)
+
+    async def record_failure(self, permit: CircuitPermit) -> None:
+        await self._save_result(permit, failed=True, slow=False)
+
+    async def release(self, permit: CircuitPermit) -> None:
+        """Освобождает разрешение без учета результата (запрос не дошел до эндпоинта)"""
+        if not permit.probe:
+            return
+        try:
+            await self.redis.delete(self._probe_key)
+        except RedisError as e:
+            logger.warning("Не удалось освободить пробный запрос %s: %s", self.name, e)
@@ -0,0 +1,170 @@
+import asyncio
+import contextlib
+import logging
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Порядок очереди: сначала приоритет (меньше - важнее), затем время постановки в очередь.
+# Время в миллисекундах (~1.7e12) всегда меньше множителя 1e13, поэтому классы не смешиваются
+# KEYS: holders, waiters, heartbeats, cooldown
+# ARGV: token, limit, lease_ms, priority, stale_ms
+ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local stale = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now - tonumber(ARGV[5]))
+for _, waiter in ipairs(stale) do
+    redis.call('ZREM', KEYS[2], waiter)
+    redis.call('ZREM', KEYS[3], waiter)
+end
+redis.call('ZADD', KEYS[2], 'NX', tonumber(ARGV[4]) * 10000000000000 + now, ARGV[1])
+redis.call('ZADD', KEYS[3], now, ARGV[1])
+local depth = redis.call('ZCARD', KEYS[2])
+if redis.call('EXISTS', KEYS[4]) == 1 then
+    return {0, depth}
+end
+local free = tonumber(ARGV[2]) - redis.call('ZCARD', KEYS[1])
+if free > 0 and redis.call('ZRANK', KEYS[2], ARGV[1]) < free then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    redis.call('ZREM', KEYS[3], ARGV[1])
+    return {1, depth - 1}
+end
+return {0, depth}
+"""
+
+# KEYS: holders; ARGV: token, lease_ms
+RENEW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', now + tonumber(ARGV[2]), ARGV[1])
+"""
+
+
+class AdmissionTimeoutError(Exception):
+    """
+    Не удалось получить слот за отведенное время.
+
+    Не наследуется от TimeoutError: это не сбой эндпоинта, и обработчики временных сбоев
+    не должны повторять запрос, снова ставя его в очередь.
+    """
+
+
+class RedisPrioritySemaphore:
+    """
+    Распределенный семафор с приоритетной очередью на Redis.
+
+    Ограничивает число одновременных операций во всех процессах (воркеры gunicorn, бот).
+    Ожидающие упорядочены по приоритету, внутри приоритета - по времени постановки в очередь.
+    Слот выдается в аренду (lease) и продлевается, пока операция выполняется, поэтому
+    упавший процесс не блокирует слот навсегда. Семафор можно поставить на паузу (cooldown),
+    например, после ответа 429 от провайдера.
+
+    Все операции выполняются атомарно Lua-скриптами.
+    При недоступности Redis семафор пропускает запросы, чтобы не блокировать работу сервиса.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: str,
+        limit: int,
+        lease_ttl: float = 120.0,
+        poll_interval: float = 0.1,
+    ):
+        self.redis = redis
+        self.name = name
+        self.limit = limit
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self._holders_key = f"semaphore:{name}:holders"
+        self._waiters_key = f"semaphore:{name}:waiters"
+        self._heartbeats_key = f"semaphore:{name}:heartbeats"
+        self._cooldown_key = f"semaphore:{name}:cooldown"
+        self._acquire = redis.register_script(ACQUIRE_SCRIPT)
+        self._renew = redis.register_script(RENEW_SCRIPT)
+        self.queue_depth = 0
+
+    async def _try_acquire(self, token: str, priority: int) -> bool:
+        # ожидающий считается брошенным, если не опрашивал очередь дольше нескольких интервалов
+        stale_ms = int(max(self.poll_interval * 20, 5) * 1000)
+        acquired, depth = await self._acquire(
+            keys=[
+                self._holders_key,
+                self._waiters_key,
+                self._heartbeats_key,
+                self._cooldown_key,
+            ],
+            args=[token, self.limit, int(self.lease_ttl * 1000), int(priority), stale_ms],
+        )
+        self.queue_depth = int(depth)
+        return bool(acquired)
+
+    async def _leave_queue(self, token: str) -> None:
+        with contextlib.suppress(RedisError):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zrem(self._waiters_key, token)
+                pipe.zrem(self._heartbeats_key, token)
+                pipe.zrem(self._holders_key, token)
+                await pipe.execute()
+
+    async def _keep_lease(self, token: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                await self._renew(
+                    keys=[self._holders_key], args=[token, int(self.lease_ttl * 1000)]
+                )
+            except RedisError as e:
+                logger.warning("Не удалось продлить слот семафора %s: %s", self.name, e)
+
+    async def cooldown(self, seconds: float) -> None:
+        """Приостанавливает выдачу новых слотов во всех процессах на заданное время"""
+        try:
+            await self.redis.set(self._cooldown_key, 1, px=max(int(seconds * 1000), 1))
+        except RedisError as e:
+            logger.warning("Не удалось поставить семафор %s на паузу: %s", self.name, e)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int = 0, timeout: float | None = None) -> AsyncIterator[float]:
+        """
+        Ожидает свободный слот и удерживает его до выхода из контекста.
+
+        Возвращает время ожидания в очереди (в секундах).
+        Если слот не получен за timeout секунд - AdmissionTimeoutError.
+        """
+        token = uuid.uuid4().hex
+        started = time.monotonic()
+        acquired = False
+        try:
+            while True:
+                try:
+                    acquired = await self._try_acquire(token, priority)
+                except RedisError as e:
+                    logger.warning(
+                        "Семафор %s недоступен, запрос пропущен без очереди: %s", self.name, e
+                    )
+                    break
+                if acquired:
+                    break
+                if timeout is not None and time.monotonic() - started >= timeout:
+                    raise AdmissionTimeoutError(
+                        f"Не удалось получить слот семафора {self.name} за {timeout} сек."
+                    )
+                await asyncio.sleep(self.poll_interval * random.uniform(0.5, 1.5))
+
+            renew_task = asyncio.create_task(self._keep_lease(token)) if acquired else None
+            try:
+                yield time.monotonic() - started
+            finally:
+                if renew_task:
+                    renew_task.cancel()
+        finally:
+            await self._leave_queue(token)
@@ -0,0 +1,154 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Hashable
+from dataclasses import dataclass, field
+
+from source.infrastructure.utils.distributed_semaphore import AdmissionTimeoutError
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _HostState:
+    limit: int  # текущий лимит, уменьшается при 429/503 и восстанавливается после успехов
+    active: int = 0
+    paused_until: float = 0.0  # по time.monotonic()
+    throttles: int = 0  # ответов 429/503 подряд
+    # очереди ожидающих по ключам справедливости, порядок ключей - очередь обхода
+    waiters: OrderedDict[Hashable, deque[asyncio.Future[None]]] = field(default_factory=OrderedDict)
+    wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self.waiters.values())
+
+
+class FairFetchExecutor:
+    """
+    Общий для процесса ограничитель исходящих HTTP-запросов.
+
+    Одновременно к одному хосту выполняется не больше limit_per_host запросов. Ожидающие
+    запросы группируются по ключу (пользователю) и получают слоты по кругу, поэтому пакетная
+    загрузка сотни вакансий одного пользователя не задерживает запросы остальных.
+
+    После ответа 429/503 (throttled) выдача слотов хосту приостанавливается на Retry-After
+    (или экспоненциальную паузу, если заголовка нет), а лимит уменьшается вдвое. Каждый
+    успешный ответ (succeeded) увеличивает лимит на единицу до limit_per_host.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = 8,
+        backoff_base: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.limit_per_host = limit_per_host
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._hosts: dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(limit=self.limit_per_host)
+        return state
+
+    def cooldown(self, host: str) -> float:
+        """Сколько секунд хост еще на паузе после 429/503"""
+        state = self._hosts.get(host)
+        return 0.0 if state is None else max(state.paused_until - time.monotonic(), 0.0)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, host: str, key: Hashable = None, timeout: float | None = None
+    ) -> AsyncIterator[float]:
+        """
+        Ожидает слот хоста и удерживает его до выхода из контекста.
+
+        Возвращает время ожидания (в секундах).
+        Если слот не получен за timeout секунд - AdmissionTimeoutError.
+        """
+        state = self._state(host)
+        started = time.monotonic()
+        if not state.waiters and state.active < state.limit and not self.cooldown(host):
+            state.active += 1
+        else:
+            await self._wait(host, state, key, timeout)
+        waited = time.monotonic() - started
+        metrics.observe("fetch_slot_wait_seconds", waited, host=host)
+        try:
+            yield waited
+        finally:
+            state.active -= 1
+            self._dispatch(host, state)
+
+    async def _wait(
+        self, host: str, state: _HostState, key: Hashable, timeout: float | None
+    ) -> None:
+        future = asyncio.get_running_loop().create_future()
+        state.waiters.setdefault(key, deque()).append(future)
+        metrics.set_gauge("fetch_queue_depth", state.queued, host=host)
+        self._dispatch(host, state)
+        try:
+            async with asyncio.timeout(timeout):
+                await future
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # слот уже выдан, но ожидающий отменен - возвращаем слот
+                state.active -= 1
+                self._dispatch(host, state)
+            else:
+                future.cancel()
+            if isinstance(e, TimeoutError):
+                raise AdmissionTimeoutError(
+                    f"Не удалось получить слот для запроса к {host} за {timeout} сек."
+                ) from e
+            raise
+
+    def _dispatch(self, host: str, state: _HostState) -> None:
+        """Выдает свободные слоты ожидающим, обходя ключи по кругу"""
+        pause = self.cooldown(host)
+        if pause:
+            if state.wakeup is None and state.waiters:
+                loop = asyncio.get_running_loop()
+                state.wakeup = loop.call_later(pause, self._wake, host, state)
+            return
+        while state.waiters and state.active < state.limit:
+            key, queue = state.waiters.popitem(last=False)
+            future = queue.popleft()
+            if queue:
+                state.waiters[key] = queue  # следующий запрос ключа - в конец круга
+            if future.done():  # ожидающий отменен
+                continue
+            future.set_result(None)
+            state.active += 1
+        metrics.set_gauge("fetch_queue_depth", state.queued, host=host)
+
+    def _wake(self, host: str, state: _HostState) -> None:
+        state.wakeup = None
+        self._dispatch(host, state)
+
+    def throttled(self, host: str, retry_after: float | None = None) -> None:
+        """Хост ответил 429/503: пауза для всех запросов к хосту и снижение лимита"""
+        state = self._state(host)
+        state.throttles += 1
+        delay = retry_after
+        if delay is None:
+            delay = min(self.backoff_base * 2 ** (state.throttles - 1), self.max_backoff)
+        state.paused_until = max(state.paused_until, time.monotonic() + delay)
+        state.limit = max(state.limit // 2, 1)
+        metrics.inc("fetch_throttled_total", host=host)
+        logger.warning(
+            "Хост %s ограничивает запросы: пауза %.1f сек., лимит %s", host, delay, state.limit
+        )
+
+    def succeeded(self, host: str) -> None:
+        state = self._state(host)
+        state.throttles = 0
+        if state.limit < self.limit_per_host:
+            state.limit += 1
+            self._dispatch(host, state)
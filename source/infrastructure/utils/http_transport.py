@@ -0,0 +1,104 @@
+import inspect
+import time
+from typing import Any
+
+import httpx
+
+from source.infrastructure.utils.metrics import LabelsKey, metrics
+
+# события httpcore при установке нового соединения (при переиспользовании открытого их нет)
+CONNECT_STARTED = "connection.connect_tcp.started"
+CONNECT_COMPLETE_EVENTS = frozenset(
+    {"connection.connect_tcp.complete", "connection.start_tls.complete"}
+)
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    Транспорт httpx с пулом соединений и метриками их использования.
+
+    Транспорт создается один раз на клиент и живет вместе с ним, поэтому соединения
+    (в том числе HTTP/2, где несколько запросов идут по одному соединению) переиспользуются
+    между запросами и не требуют повторного TLS-рукопожатия.
+
+    Метрики:
+        http_client_requests_total{client, http_version, connection=new|reused}
+        http_client_connect_seconds{client} - время установки соединения (TCP + TLS)
+        http_client_pool_connections{client, state=active|idle} - снимается в момент запроса
+        метрик, пока транспорт не закрыт
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        http2: bool = True,
+        max_connections: int | None = 20,
+        max_keepalive_connections: int | None = 10,
+        keepalive_expiry: float | None = 30.0,
+        **kwargs: Any,
+    ):
+        super().__init__(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            **kwargs,
+        )
+        self.name = name
+        metrics.register_gauge_callback("http_client_pool_connections", self.pool_state)
+
+    def pool_state(self) -> dict[LabelsKey, float]:
+        """Количество открытых соединений пула: занятых запросами и простаивающих"""
+        active = idle = 0
+        for connection in self._pool.connections:
+            if connection.is_idle():
+                idle += 1
+            elif not connection.is_closed():
+                active += 1
+        return {
+            (("client", self.name), ("state", "active")): active,
+            (("client", self.name), ("state", "idle")): idle,
+        }
+
+    async def __aexit__(self, *args: Any) -> None:
+        # httpx.AsyncClient при выходе из контекста закрывает транспорт без вызова aclose()
+        metrics.unregister_gauge_callback("http_client_pool_connections", self.pool_state)
+        await super().__aexit__(*args)
+
+    async def aclose(self) -> None:
+        metrics.unregister_gauge_callback("http_client_pool_connections", self.pool_state)
+        await super().aclose()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        connect_started: float | None = None
+        connected_at: float | None = None
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal connect_started, connected_at
+            if event_name == CONNECT_STARTED:
+                connect_started = time.monotonic()
+            elif event_name in CONNECT_COMPLETE_EVENTS:
+                connected_at = time.monotonic()
+            if outer_trace is not None:
+                result = outer_trace(event_name, info)
+                if inspect.isawaitable(result):
+                    await result
+
+        request.extensions["trace"] = trace
+        response = await super().handle_async_request(request)
+        connected = connect_started is not None
+        if connected and connected_at is not None:
+            metrics.observe(
+                "http_client_connect_seconds", connected_at - connect_started, client=self.name
+            )
+        metrics.inc(
+            "http_client_requests_total",
+            client=self.name,
+            http_version=response.extensions.get("http_version", b"").decode() or "unknown",
+            connection="new" if connected else "reused",
+        )
+        return response
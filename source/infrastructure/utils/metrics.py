@@ -0,0 +1,125 @@
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+type LabelsKey = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Summary:
+    """Агрегат наблюдений (длительности, размеры и т.п.)"""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def dump(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """
+    Простой in-process реестр метрик: счетчики, gauge'и и summary.
+
+    Метрики адресуются именем и набором меток, например:
+        metrics.inc("cache_hits_total", cache="responses", tier="redis")
+    Снимок реестра отдается через эндпоинт /metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelsKey, float]] = defaultdict(lambda: defaultdict(float))
+        self._gauges: dict[str, dict[LabelsKey, float]] = defaultdict(dict)
+        self._summaries: dict[str, dict[LabelsKey, Summary]] = defaultdict(
+            lambda: defaultdict(Summary)
+        )
+        self._gauge_callbacks: dict[str, list[Callable[[], dict[LabelsKey, float]]]] = defaultdict(
+            list
+        )
+
+    @staticmethod
+    def _labels_key(labels: dict[str, Any]) -> LabelsKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format_name(name: str, labels_key: LabelsKey) -> str:
+        if not labels_key:
+            return name
+        labels = ",".join(f'{key}="{value}"' for key, value in labels_key)
+        return f"{name}{{{labels}}}"
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        with self._lock:
+            self._counters[name][self._labels_key(labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._gauges[name][self._labels_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._summaries[name][self._labels_key(labels)].observe(value)
+
+    def register_gauge_callback(
+        self, name: str, callback: Callable[[], dict[LabelsKey, float]]
+    ) -> None:
+        """
+        Регистрирует gauge, значение которого вычисляется в момент снятия снимка.
+        Для одного gauge можно зарегистрировать несколько callback'ов с разными метками
+        """
+        with self._lock:
+            self._gauge_callbacks[name].append(callback)
+
+    def unregister_gauge_callback(
+        self, name: str, callback: Callable[[], dict[LabelsKey, float]]
+    ) -> None:
+        with self._lock:
+            callbacks = self._gauge_callbacks.get(name, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def get_counter(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters[name].get(self._labels_key(labels), 0.0)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            gauges = {name: dict(values) for name, values in self._gauges.items()}
+            callbacks = {name: list(values) for name, values in self._gauge_callbacks.items()}
+            counters = {
+                self._format_name(name, key): value
+                for name, values in self._counters.items()
+                for key, value in values.items()
+            }
+            summaries = {
+                self._format_name(name, key): summary.dump()
+                for name, values in self._summaries.items()
+                for key, summary in values.items()
+            }
+        for name, values in callbacks.items():
+            for callback in values:
+                gauges.setdefault(name, {}).update(callback())
+        return {
+            "counters": counters,
+            "gauges": {
+                self._format_name(name, key): value
+                for name, values in gauges.items()
+                for key, value in values.items()
+            },
+            "summaries": summaries,
+        }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from source.application.deadline import current_deadline
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RetryBudget:
+    """
+    Бюджет повторов запросов к внешнему сервису (upstream) в пределах процесса.
+
+    Повторов за последние window секунд может быть не больше ratio от числа запросов
+    за то же время плюс min_retries (чтобы при малом трафике единичные сбои повторялись).
+    Во время сбоя сервиса повторы быстро исчерпывают бюджет, и нагрузка на сервис
+    растет не в max_attempts раз, а не больше чем на ratio.
+
+    Окно состоит из корзин по секунде: старые корзины отбрасываются по мере сдвига окна.
+    """
+
+    def __init__(
+        self, upstream: str, ratio: float = 0.1, window: float = 10.0, min_retries: int = 5
+    ):
+        self.upstream = upstream
+        self.ratio = ratio
+        self.window = window
+        self.min_retries = min_retries
+        # корзины: [номер секунды, запросов, повторов]
+        self._buckets: deque[list[int]] = deque()
+
+    def _bucket(self) -> list[int]:
+        now = math.floor(time.monotonic())
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+
+    def available(self) -> int:
+        """Сколько повторов еще можно выполнить в текущем окне"""
+        self._bucket()
+        requests = sum(bucket[1] for bucket in self._buckets)
+        retries = sum(bucket[2] for bucket in self._buckets)
+        return max(int(self.min_retries + self.ratio * requests) - retries, 0)
+
+    def record_request(self) -> None:
+        """Учитывает первую попытку запроса (повторы учитываются в try_spend)"""
+        self._bucket()[1] += 1
+        metrics.inc("retry_budget_requests_total", upstream=self.upstream)
+
+    def try_spend(self) -> bool:
+        """Списывает один повтор из бюджета. False - бюджет исчерпан, повтор не выполняется"""
+        allowed = self.available() > 0
+        if allowed:
+            self._bucket()[2] += 1
+        metrics.inc(
+            "retry_budget_retries_total",
+            upstream=self.upstream,
+            result="allowed" if allowed else "exhausted",
+        )
+        metrics.set_gauge("retry_budget_available", self.available(), upstream=self.upstream)
+        return allowed
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Политика повторов: число попыток, экспоненциальная пауза с джиттером и общий бюджет.
+
+    Пауза перед повтором после попытки attempt - случайная величина в диапазоне
+    [delay / 2, delay], где delay = base_delay * 2 ** (attempt - 1), но не больше max_delay.
+    Повтор не выполняется, если исчерпаны попытки, бюджет (budget) или он не уложится
+    в срок обработки запроса (current_deadline).
+    """
+
+    upstream: str
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    budget: RetryBudget | None = None
+
+    def record_request(self) -> None:
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return random.uniform(delay / 2, delay)
+
+    def allow(self, attempt: int, delay: float = 0.0) -> bool:
+        """Можно ли повторить запрос после неудачной попытки attempt с паузой delay"""
+        if attempt >= self.max_attempts:
+            return False
+        deadline = current_deadline()
+        if deadline is not None and deadline.remaining() <= delay:
+            logger.warning("Повтор запроса к %s не уложится в срок, повтор отменен", self.upstream)
+            return False
+        if self.budget is not None and not self.budget.try_spend():
+            logger.warning("Бюджет повторов запросов к %s исчерпан, повтор отменен", self.upstream)
+            return False
+        return True
+
+    async def backoff(self, attempt: int, delay: float | None = None) -> bool:
+        """
+        Пауза перед повтором после неудачной попытки attempt.
+
+        False - повтор не выполняется (см. allow), пауза не выдерживается.
+        delay - пауза вместо рассчитанной (например, из Retry-After).
+        """
+        delay = self.delay(attempt) if delay is None else delay
+        if not self.allow(attempt, delay):
+            return False
+        logger.warning("Повтор запроса к %s через %s сек.", self.upstream, round(delay, 2))
+        await asyncio.sleep(delay)
+        return True
@@ -0,0 +1,117 @@
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from source.infrastructure.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# KEYS: lock; ARGV: token
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight[K: Hashable, V]:
+    """
+    Объединение одновременных одинаковых вызовов в пределах процесса.
+
+    Первый вызов с ключом выполняет операцию, остальные вызовы с тем же ключом, пришедшие до
+    ее завершения, ждут и получают тот же результат (или то же исключение). Операция
+    выполняется в отдельной задаче, поэтому отмена одного из ожидающих не отменяет ее для
+    остальных. Результат не кэшируется - после завершения следующий вызов выполнит операцию
+    заново. Объединенные вызовы учитываются в метрике single_flight_calls_total.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        task = self._inflight.get(key)
+        if task is not None:
+            metrics.inc("single_flight_calls_total", flight=self.name, result="collapsed")
+            return await asyncio.shield(task)
+
+        metrics.inc("single_flight_calls_total", flight=self.name, result="leader")
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: asyncio.Task[V]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # исключение могло остаться неполученным, если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+
+class RedisFlightLock:
+    """
+    Межпроцессный вариант SingleFlight для данных с общим кэшем в Redis.
+
+    Процесс, получивший блокировку ключа, выполняет запрос и сохраняет результат в кэш,
+    остальные ждут снятия блокировки и читают результат из кэша. Блокировка выдается
+    на ttl секунд, поэтому упавший процесс не блокирует ключ навсегда.
+    При недоступности Redis блокировка считается полученной.
+    """
+
+    def __init__(
+        self, redis: Redis, namespace: str, ttl: float = 10.0, poll_interval: float = 0.05
+    ):
+        self.redis = redis
+        self.namespace = namespace
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self._release = redis.register_script(RELEASE_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return f"flight:{self.namespace}:{key}"
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[bool]:
+        """Пытается получить блокировку ключа. True - блокировка получена этим процессом"""
+        token = uuid.uuid4().hex
+        try:
+            owned = bool(
+                await self.redis.set(self._key(key), token, nx=True, px=int(self.ttl * 1000))
+            )
+        except RedisError as e:
+            logger.warning("Не удалось получить блокировку %s в Redis: %s", key, e)
+            owned = None
+        if owned is None:
+            yield True
+            return
+        try:
+            yield owned
+        finally:
+            if owned:
+                with contextlib.suppress(RedisError):
+                    await self._release(keys=[self._key(key)], args=[token])
+
+    async def wait(self, key: str, timeout: float | None = None) -> bool:
+        """Ждет снятия блокировки ключа другим процессом. False - не дождались за timeout"""
+        timeout = self.ttl if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if not await self.redis.exists(self._key(key)):
+                    return True
+            except RedisError as e:
+                logger.warning("Не удалось проверить блокировку %s в Redis: %s", key, e)
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return False
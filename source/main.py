@@ -1,11 +1,15 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
+from source.application.deadline import DeadlineExceededError
 from source.infrastructure.di import init_di_container
 from source.infrastructure.settings.app import app_settings
 from source.presentation.api.ai import router as ai_router
 from source.presentation.api.auth import router as auth_router
+from source.presentation.api.metrics import router as metrics_router
+from source.presentation.api.vacancies import router as vacancies_router
 from source.presentation.bot.create_bot import run_bot
 from source.presentation.wsgi import Application, get_app_options
 
@@ -16,6 +20,13 @@ async def lifespan(app: FastAPI):
     await app.state.dishka_container.close()
 
 
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "Не удалось обработать запрос за отведенное время"},
+    )
+
+
 def create_web_app() -> FastAPI:
     app = FastAPI(
         title="AI-HR",
@@ -25,6 +36,9 @@ def create_web_app() -> FastAPI:
 
     app.include_router(auth_router)
     app.include_router(ai_router)
+    app.include_router(vacancies_router)
+    app.include_router(metrics_router)
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
     init_di_container(app)
 
     return app
@@ -42,7 +56,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--type-app",
         type=str,
-        choices=("telegram", "web"),
+        choices=("telegram", "web", "worker"),
         default="telegram",
         help="Какое приложение запустить",
     )
@@ -52,6 +66,12 @@ if __name__ == "__main__":
         import asyncio
 
         asyncio.run(run_bot())
+    elif args.type_app == "worker":
+        import asyncio
+
+        from source.presentation.worker import run_worker
+
+        asyncio.run(run_worker())
     else:
         app = create_web_app()
         options = get_app_options(
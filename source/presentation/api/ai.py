@@ -1,12 +1,18 @@
+import json
 import logging
+from collections.abc import AsyncIterator
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
-from source.application.dtos.query import QueryCreateDTO, QueryRecreateDTO
+from source.application.dtos.job import ResponseJobDTO
+from source.application.dtos.query import QueryBatchCreateDTO, QueryCreateDTO, QueryRecreateDTO
 from source.application.services.hh_service import IHHService
+from source.application.services.job_queue import IJobQueue
 from source.application.use_cases.generate_response import GenerateResponseUseCase
+from source.application.use_cases.generate_responses_batch import GenerateResponsesBatchUseCase
 from source.application.use_cases.regenerate_response import RegenerateResponseUseCase
 from source.domain.entities.response import ResponseToVacancyEntity
 
@@ -31,6 +37,81 @@ async def generate_response(
     return result
 
 
+def _sse_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post("/responses/generate/stream")
+async def generate_response_stream(
+    query: QueryCreateDTO,
+    use_case: FromDishka[GenerateResponseUseCase],
+) -> StreamingResponse:
+    """
+    Потоковая генерация отклика (Server-Sent Events).
+
+    События `token` содержат части текста (JSON-строка) по мере генерации,
+    завершающее событие `response` - итоговый отклик.
+    """
+    logger.info("Получен запрос на потоковую генерацию отклика. Входные данные: %s", query)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for chunk in use_case.stream(query):
+            if isinstance(chunk, ResponseToVacancyEntity):
+                logger.info("Сгенерированный отклик: %s", chunk.message)
+                yield _sse_event("response", chunk.model_dump_json())
+                continue
+            yield _sse_event("token", json.dumps(chunk, ensure_ascii=False))
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.post("/responses/generate:batch")
+async def generate_responses_batch(
+    query: QueryBatchCreateDTO,
+    use_case: FromDishka[GenerateResponsesBatchUseCase],
+) -> StreamingResponse:
+    """
+    Пакетная генерация откликов на список вакансий или результаты поиска одним резюме.
+
+    Ответ - NDJSON: по одной строке BatchResponseItemDTO на вакансию в порядке готовности.
+    """
+    logger.info("Получен запрос на пакетную генерацию откликов. Входные данные: %s", query)
+    # резюме загружается до начала потока: ошибка возвращается статусом ответа
+    try:
+        items = await use_case(query)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    async def items_stream() -> AsyncIterator[str]:
+        async for item in items:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(items_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_response_job(
+    query: QueryCreateDTO,
+    job_queue: FromDishka[IJobQueue],
+) -> ResponseJobDTO:
+    """
+    Фоновая генерация отклика: ставит задачу в очередь и сразу возвращает ее id.
+
+    Статус и результат - GET /ai/jobs/{job_id}. Повторный запрос с теми же данными,
+    пока задача не выполнена, возвращает ту же задачу.
+    """
+    logger.info("Получен запрос на фоновую генерацию отклика. Входные данные: %s", query)
+    return await job_queue.enqueue(query)
+
+
+@router.get("/jobs/{job_id}")
+async def get_response_job(job_id: str, job_queue: FromDishka[IJobQueue]) -> ResponseJobDTO:
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена")
+    return job
+
+
 @router.post("/responses/regenerate")
 async def regenerate_response(
     query: QueryRecreateDTO,
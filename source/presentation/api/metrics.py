@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from source.infrastructure.utils.metrics import metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+
+@router.get("")
+async def get_metrics() -> dict[str, dict[str, Any]]:
+    """
+    Снимок метрик текущего процесса (счетчики, gauge'и и summary)
+    """
+    return metrics.snapshot()
@@ -0,0 +1,59 @@
+import logging
+
+from dishka import FromDishka
+from dishka.integrations.fastapi import DishkaRoute
+from fastapi import APIRouter, HTTPException, status
+
+from source.application.dtos.search import (
+    VacancyMatchPageDTO,
+    VacancyMatchQueryDTO,
+    VacancySearchDTO,
+    VacancySearchPageDTO,
+)
+from source.application.use_cases.search_vacancies import (
+    RankVacanciesUseCase,
+    ResumeNotFoundError,
+    SearchVacanciesUseCase,
+)
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter(
+    prefix="/vacancies",
+    tags=["vacancies"],
+    route_class=DishkaRoute,
+)
+
+
+@router.post("/search")
+async def search_vacancies(
+    query: VacancySearchDTO,
+    use_case: FromDishka[SearchVacanciesUseCase],
+) -> VacancySearchPageDTO:
+    """
+    Поиск по сохраненным вакансиям. Следующая страница - тот же запрос с cursor = next_cursor.
+    """
+    logger.info("Получен запрос на поиск вакансий. Входные данные: %s", query)
+    try:
+        return await use_case(query)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.post("/match")
+async def match_vacancies(
+    query: VacancyMatchQueryDTO,
+    use_case: FromDishka[RankVacanciesUseCase],
+) -> VacancyMatchPageDTO:
+    """
+    Лучшие по совпадению навыков с резюме вакансии среди найденных (до limit штук).
+    """
+    logger.info("Получен запрос на подбор вакансий под резюме. Входные данные: %s", query)
+    try:
+        return await use_case(query)
+    except ResumeNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except ValueError as e:
+        # некорректный курсор поиска
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
@@ -47,3 +47,9 @@ def send_or_regenerate_ai_response() -> InlineKeyboardMarkup:
     builder.button(text="Отправить", callback_data=CallbackKeys.SEND_AI_RESPONSE)
     builder.adjust(1)
     return builder.as_markup()
+
+
+def more_vacancies_keyboard() -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    builder.button(text="Еще вакансии", callback_data=CallbackKeys.MORE_VACANCIES)
+    return builder.as_markup()
@@ -4,6 +4,7 @@ from .ai import router as ai_router
 from .help import router as help_router
 from .profile import router as profile_router
 from .start import router as start_router
+from .vacancies import router as vacancies_router
 
 main_router = Router()
 
@@ -12,5 +13,6 @@ main_router.include_routers(
     start_router,
     help_router,
     profile_router,
+    vacancies_router,
     ai_router,
 )
@@ -7,8 +7,10 @@ from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import CallbackQuery, Message
 from dishka.integrations.aiogram import FromDishka
 
+from source.application.dtos.job import BotReplyTarget
 from source.application.dtos.query import QueryCreateDTO, QueryRecreateDTO
 from source.application.services.hh_service import IHHService
+from source.application.services.job_queue import IJobQueue
 from source.application.use_cases.generate_response import GenerateResponseUseCase
 from source.application.use_cases.regenerate_response import RegenerateResponseUseCase
 from source.constants.keys import CallbackKeys, StorageKeys
@@ -16,7 +18,9 @@ from source.constants.texts_message import AIMessages
 from source.domain.entities.response import ResponseToVacancyEntity
 from source.domain.entities.resume import ResumeEntity
 from source.domain.entities.user import UserEntity
+from source.infrastructure.settings.app import app_settings
 from source.presentation.bot.keyboards.inline import send_or_regenerate_ai_response
+from source.presentation.bot.utils import edit_message_streaming
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,7 @@ async def handler_hh_vacancy(
     user: FromDishka[UserEntity | None],
     resume: FromDishka[ResumeEntity | None],
     generate_case: FromDishka[GenerateResponseUseCase],
+    job_queue: FromDishka[IJobQueue],
 ):
     logger.info(
         "Пришел запрос на генерацию отклика на вакансию %s пользователя %s",
@@ -52,9 +57,23 @@ async def handler_hh_vacancy(
             url_vacancy=url.string,
             resume_hh_id=resume.hh_id,
         )
-        response = await generate_case(dto)
+        if app_settings.AI_JOBS_ENABLED:
+            # генерацию выполняет воркер, он же заменит сообщение-заглушку результатом
+            placeholder = await message.answer(AIMessages.generation_queued())
+            reply_to = BotReplyTarget(
+                chat_id=placeholder.chat.id, message_id=placeholder.message_id
+            )
+            job = await job_queue.enqueue(dto, reply_to=reply_to)
+            if job.reply_to != reply_to:
+                await placeholder.edit_text(AIMessages.generation_already_queued())
+            return
+        placeholder = await message.answer(AIMessages.generation_in_progress())
+        response = await edit_message_streaming(
+            placeholder,
+            generate_case.stream(dto),
+            reply_markup=send_or_regenerate_ai_response(),
+        )
         logger.info("Сгенерированный отклик: %s", response.message)
-        await message.answer(response.message, reply_markup=send_or_regenerate_ai_response())
         return
     logger.info("У пользователя %s не выбрано активное резюме", message.from_user.username)
     await message.answer(AIMessages.no_active_resume())
@@ -111,6 +130,11 @@ async def regenerate_response(
         response=ai_response,
         user_comments=user_comments,
     )
-    new_response = await regenerate_case(dto)
+    placeholder = await message.answer(AIMessages.generation_in_progress())
+    new_response = await edit_message_streaming(
+        placeholder,
+        regenerate_case.stream(dto),
+        reply_markup=send_or_regenerate_ai_response(),
+    )
+    logger.info("Новый отклик: %s", new_response.message)
     await state.set_state()
-    return message.answer(new_response.message, reply_markup=send_or_regenerate_ai_response())
@@ -22,7 +22,7 @@ async def show_help(message: Message):
         /logout - Выйти из аккаунта
 
         <b>Работа с вакансиями:</b>
-        /vacancies - Поиск вакансий (в разработке)
+        /vacancies запрос [навыки: ...] - Поиск по сохраненным вакансиям
 
         <b>О боте:</b>
         Этот бот помогает управлять вашими откликами на вакансии
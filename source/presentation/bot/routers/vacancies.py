@@ -0,0 +1,100 @@
+"""
+Роутер поиска по сохраненным вакансиям.
+"""
+
+import logging
+import re
+
+from aiogram import F, Router
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+from dishka import FromDishka
+
+from source.application.dtos.search import VacancySearchDTO
+from source.application.services.skill_matcher import ISkillMatcher
+from source.application.use_cases.search_vacancies import SearchVacanciesUseCase
+from source.constants.keys import CallbackKeys, StorageKeys
+from source.constants.texts_message import VacancyMessages
+from source.domain.entities.resume import ResumeEntity
+from source.presentation.bot.keyboards.inline import more_vacancies_keyboard
+
+logger = logging.getLogger(__name__)
+
+router = Router()
+
+skills_pattern = re.compile(r"навыки:", re.IGNORECASE)
+
+
+def parse_search_args(args: str) -> VacancySearchDTO:
+    """Разбирает аргументы команды: "запрос навыки: навык1, навык2" """
+    text, *skills = skills_pattern.split(args, maxsplit=1)
+    return VacancySearchDTO(
+        text=text.strip(),
+        skills=[skill.strip() for skill in "".join(skills).split(",") if skill.strip()],
+    )
+
+
+async def send_search_page(
+    message: Message,
+    state: FSMContext,
+    search_case: SearchVacanciesUseCase,
+    query: VacancySearchDTO,
+    resume: ResumeEntity | None,
+    matcher: ISkillMatcher,
+):
+    page = await search_case(query)
+    if not page.items:
+        await message.answer(VacancyMessages.nothing_found())
+        return
+    # запрос следующей страницы хранится в FSM, в callback_data курсор не помещается
+    next_query = query.model_copy(update={"cursor": page.next_cursor})
+    await state.update_data({StorageKeys.VACANCY_SEARCH: next_query.model_dump_json()})
+    if resume:
+        # с выбранным резюме сначала показываем вакансии, которые лучше ему подходят
+        text_message = VacancyMessages.ranked_page(matcher.rank(resume, page.items))
+    else:
+        text_message = VacancyMessages.search_page(page.items)
+    await message.answer(
+        text_message,
+        reply_markup=more_vacancies_keyboard() if page.next_cursor else None,
+        disable_web_page_preview=True,
+    )
+
+
+@router.message(Command("vacancies"))
+async def search_vacancies(
+    message: Message,
+    command: CommandObject,
+    state: FSMContext,
+    search_case: FromDishka[SearchVacanciesUseCase],
+    resume: FromDishka[ResumeEntity | None],
+    matcher: FromDishka[ISkillMatcher],
+):
+    logger.info("Поиск вакансий пользователя %s: %s", message.from_user.username, command.args)
+    if not command.args or not command.args.strip():
+        await message.answer(VacancyMessages.search_usage())
+        return
+    query = parse_search_args(command.args)
+    await send_search_page(message, state, search_case, query, resume, matcher)
+
+
+@router.callback_query(F.data == CallbackKeys.MORE_VACANCIES)
+async def more_vacancies(
+    callback: CallbackQuery,
+    state: FSMContext,
+    search_case: FromDishka[SearchVacanciesUseCase],
+    resume: FromDishka[ResumeEntity | None],
+    matcher: FromDishka[ISkillMatcher],
+):
+    await callback.answer()
+    await callback.message.edit_reply_markup(reply_markup=None)
+    query_json = await state.get_value(StorageKeys.VACANCY_SEARCH)
+    if not query_json:
+        await callback.message.answer(VacancyMessages.search_expired())
+        return
+    query = VacancySearchDTO.model_validate_json(query_json)
+    if query.cursor is None:
+        await callback.message.answer(VacancyMessages.search_expired())
+        return
+    await send_search_page(callback.message, state, search_case, query, resume, matcher)
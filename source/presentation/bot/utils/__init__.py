@@ -0,0 +1,5 @@
+"""Вспомогательные функции для бота."""
+
+from source.presentation.bot.utils.streaming import edit_message_streaming
+
+__all__ = ["edit_message_streaming"]
@@ -0,0 +1,75 @@
+import logging
+import time
+from collections.abc import AsyncIterator
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup, Message
+
+from source.application.services.ai_service import ResponseStreamChunk
+from source.domain.entities.response import ResponseToVacancyEntity
+from source.infrastructure.settings.app import app_settings
+
+logger = logging.getLogger(__name__)
+
+# Максимальная длина текста сообщения в Telegram
+MAX_MESSAGE_LENGTH = 4096
+CURSOR = " ▌"
+
+
+async def _edit_partial(message: Message, text: str) -> None:
+    """Редактирует сообщение промежуточным текстом, не прерывая генерацию при ошибках Telegram"""
+    try:
+        # частичный текст может содержать незакрытые теги, поэтому без parse_mode
+        await message.edit_text(text[: MAX_MESSAGE_LENGTH - len(CURSOR)] + CURSOR, parse_mode=None)
+    except TelegramBadRequest as e:
+        # например "message is not modified" - просто пропускаем кадр
+        logger.debug("Промежуточное редактирование пропущено: %s", e.message)
+
+
+async def edit_message_streaming(
+    message: Message,
+    chunks: AsyncIterator[ResponseStreamChunk],
+    reply_markup: InlineKeyboardMarkup | None = None,
+    interval: float = app_settings.BOT_STREAM_EDIT_INTERVAL,
+) -> ResponseToVacancyEntity:
+    """
+    Постепенно редактирует одно сообщение по мере поступления текста.
+
+    Редактирование выполняется не чаще одного раза в `interval` секунд (ограничения Telegram
+    на частоту правок), итоговый отклик выводится целиком вместе с клавиатурой.
+
+    Args:
+        message: Сообщение-заглушка, которое будет редактироваться
+        chunks: Поток генерации (части текста, последним элементом - итоговый отклик)
+        reply_markup: Клавиатура, прикрепляемая к итоговому сообщению
+        interval: Минимальный интервал между редактированиями
+
+    Returns:
+        Итоговый отклик
+    """
+    text = ""
+    shown = ""
+    last_edit = time.monotonic()
+    result: ResponseToVacancyEntity | None = None
+
+    async for chunk in chunks:
+        if isinstance(chunk, ResponseToVacancyEntity):
+            result = chunk
+            continue
+        text += chunk
+        now = time.monotonic()
+        if now - last_edit < interval or text.strip() == shown:
+            continue
+        try:
+            await _edit_partial(message, text)
+            shown = text.strip()
+        except TelegramRetryAfter as e:
+            logger.warning("Telegram ограничил частоту правок, пауза %s сек.", e.retry_after)
+            interval = max(interval, float(e.retry_after))
+        last_edit = time.monotonic()
+
+    if result is None:
+        raise RuntimeError("Поток генерации завершился без итогового отклика")
+
+    await message.edit_text(result.message, reply_markup=reply_markup)
+    return result
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramAPIError
+from dishka import AsyncContainer
+
+from source.application.dtos.job import JobStatus, ResponseJobDTO
+from source.application.use_cases.generate_response import GenerateResponseUseCase
+from source.constants.texts_message import AIMessages
+from source.infrastructure.di import container_factory
+from source.infrastructure.services.job_queue import RedisJobQueue
+from source.infrastructure.settings.app import app_settings
+from source.infrastructure.utils.metrics import metrics
+from source.presentation.bot.keyboards.inline import send_or_regenerate_ai_response
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseJobWorker:
+    """
+    Воркер генерации откликов из очереди RedisJobQueue.
+
+    Выполняет до concurrency задач одновременно. Сообщение очереди подтверждается только
+    после сохранения результата или окончательной ошибки, поэтому задача не теряется при
+    падении воркера, но может быть выполнена повторно - уже выполненные задачи пропускаются.
+    Ошибки входных данных (ValueError) не повторяются, остальные - до max_attempts запусков.
+    Если задача пришла из бота, результат отправляется в сообщение пользователя.
+    """
+
+    def __init__(
+        self,
+        container: AsyncContainer,
+        queue: RedisJobQueue,
+        bot: Bot | None = None,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        name: str | None = None,
+    ):
+        self.container = container
+        self.queue = queue
+        self.bot = bot
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+
+    async def run(self) -> None:
+        await self.queue.ensure_group()
+        logger.info("Воркер %s запущен, одновременных задач: %s", self.name, self.concurrency)
+        await asyncio.gather(*(self._consume(f"{self.name}-{i}") for i in range(self.concurrency)))
+
+    async def _consume(self, consumer: str) -> None:
+        while True:
+            try:
+                messages = await self.queue.claim_stale(consumer)
+                if not messages:
+                    messages = await self.queue.read(consumer)
+            except Exception as e:
+                logger.error("Ошибка чтения очереди задач: %s", e)
+                await asyncio.sleep(1)
+                continue
+            for message_id, job_id in messages:
+                try:
+                    await self._process(consumer, message_id, job_id)
+                except Exception as e:
+                    # сообщение не подтверждено и будет забрано повторно
+                    logger.error("Не удалось обработать задачу %s: %s", job_id, e)
+
+    async def _keep_alive(self, consumer: str, message_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.visibility_timeout / 3)
+            try:
+                await self.queue.touch(consumer, message_id)
+            except Exception as e:
+                logger.warning("Не удалось продлить задачу %s: %s", message_id, e)
+
+    async def _process(self, consumer: str, message_id: str, job_id: str) -> None:
+        job = await self.queue.get(job_id)
+        if job is None or job.status in (JobStatus.DONE, JobStatus.FAILED):
+            # повторная доставка уже выполненной (или истекшей) задачи
+            await self.queue.ack(message_id)
+            return
+        if job.attempts == 0:
+            wait = (datetime.now() - job.created_at).total_seconds()
+            metrics.observe("job_queue_wait_seconds", wait)
+        job = await self.queue.start(job)
+        if job.attempts > self.max_attempts:
+            job = await self.queue.fail(job, "Превышено количество попыток")
+            await self._finish(message_id, job)
+            return
+
+        logger.info("Задача %s: запуск %s", job.job_id, job.attempts)
+        started = time.perf_counter()
+        keep_alive = asyncio.create_task(self._keep_alive(consumer, message_id))
+        try:
+            async with self.container() as request_container:
+                use_case = await request_container.get(GenerateResponseUseCase)
+                result = await use_case(job.query)
+        except ValueError as e:
+            logger.warning("Задача %s: некорректные данные: %s", job.job_id, e)
+            job = await self.queue.fail(job, str(e))
+        except Exception as e:
+            logger.exception("Задача %s завершилась ошибкой", job.job_id)
+            if job.attempts >= self.max_attempts:
+                job = await self.queue.fail(job, str(e))
+            else:
+                await self.queue.retry(message_id, job, str(e))
+                metrics.inc("jobs_retried_total")
+                return
+        else:
+            job = await self.queue.complete(job, result)
+        finally:
+            keep_alive.cancel()
+        metrics.observe("job_seconds", time.perf_counter() - started, status=job.status)
+        await self._finish(message_id, job)
+
+    async def _finish(self, message_id: str, job: ResponseJobDTO) -> None:
+        await self.queue.ack(message_id)
+        metrics.inc("jobs_finished_total", status=job.status)
+        logger.info("Задача %s завершена со статусом %s", job.job_id, job.status)
+        await self._reply(job)
+
+    async def _reply(self, job: ResponseJobDTO) -> None:
+        if self.bot is None or job.reply_to is None:
+            return
+        try:
+            if job.status == JobStatus.DONE:
+                await self.bot.edit_message_text(
+                    job.result.message,
+                    chat_id=job.reply_to.chat_id,
+                    message_id=job.reply_to.message_id,
+                    reply_markup=send_or_regenerate_ai_response(),
+                )
+            else:
+                await self.bot.edit_message_text(
+                    AIMessages.generation_failed(),
+                    chat_id=job.reply_to.chat_id,
+                    message_id=job.reply_to.message_id,
+                )
+        except TelegramAPIError as e:
+            logger.error("Не удалось отправить результат задачи %s в бот: %s", job.job_id, e)
+
+
+async def run_worker():
+    container = container_factory()
+    bot = Bot(
+        token=app_settings.BOT_TOKEN,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    try:
+        worker = ResponseJobWorker(
+            container,
+            await container.get(RedisJobQueue),
+            bot,
+            concurrency=app_settings.JOB_WORKER_CONCURRENCY,
+            max_attempts=app_settings.JOB_MAX_ATTEMPTS,
+        )
+        await worker.run()
+    finally:
+        await bot.session.close()
+        await container.close()
@@ -1,6 +1,12 @@
+import datetime
+
 import pytest
 from playwright.sync_api import Page
 
+from source.domain.entities.employer import EmployerEntity
+from source.domain.entities.resume import JobExperienceEntity, ResumeEntity
+from source.domain.entities.user import UserEntity
+from source.domain.entities.vacancy import VacancyEntity
 from source.infrastructure.settings.test import TestAppSettings
 
 
@@ -34,6 +40,66 @@ def test_settings() -> TestAppSettings:
     return TestAppSettings()
 
 
+@pytest.fixture(scope="package")
+def test_job_experience_entity() -> JobExperienceEntity:
+    return JobExperienceEntity(
+        company="ННК-Северная нефть",
+        position="Ведущий инженер",
+        start=datetime.datetime(year=2024, month=7, day=1),
+        end=None,
+        description="Катать вату",
+    )
+
+
+@pytest.fixture(scope="package")
+def test_resume_entity(test_job_experience_entity: JobExperienceEntity) -> ResumeEntity:
+    return ResumeEntity(
+        hh_id="asjhfjha78",
+        title="Python разработчик",
+        name="Владимир",
+        surname="Быков",
+        job_experience=[test_job_experience_entity],
+        skills={"python", "FastAPI", "pydantic", "pytest"},
+        contact_phone="89091260929",
+        contact_email="vovka1998@gmail.com",  # type: ignore
+    )
+
+
+@pytest.fixture(scope="package")
+def test_user_entity(test_resume_entity: ResumeEntity) -> UserEntity:
+    return UserEntity(
+        hh_id="12351ad213",
+        name="Владимир",
+        mid_name="Николаевич",
+        last_name="Быков",
+        phone="89091260929",
+        email="vovka1998@gmail.com",  # type: ignore
+        resumes=[test_resume_entity],
+    )
+
+
+@pytest.fixture(scope="package")
+def test_employer_entity() -> EmployerEntity:
+    return EmployerEntity(
+        hh_id="1740",
+        name="Яндекс",
+        description="<p>Яндекс — технологическая компания.</p>",
+    )
+
+
+@pytest.fixture(scope="package")
+def test_vacancy_entity(test_employer_entity: EmployerEntity) -> VacancyEntity:
+    return VacancyEntity(
+        hh_id="125537679",
+        url_vacancy="https://hh.ru/vacancy/125537679",
+        name="Python разработчик",
+        experience={"id": "between1And3", "name": "От 1 года до 3 лет"},
+        description="<p><strong>Требования:</strong></p><ul><li>Python</li><li>FastAPI</li></ul>",
+        key_skills=[{"name": "Python"}, {"name": "FastAPI"}, {"name": "PostgreSQL"}],
+        employer_id=test_employer_entity.hh_id,
+    )
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--run-migrations",
@@ -0,0 +1,44 @@
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from source.infrastructure.services.ai_service import AIService
+from source.infrastructure.services.llm_endpoints import LLMEndpoint
+from source.infrastructure.settings.app import app_settings
+
+
+def test_history_restarts_when_it_does_not_end_with_edited_response():
+    messages = [HumanMessage("контекст"), AIMessage("Письмо 1")]
+
+    assert AIService._history({"messages": messages, "response": "Письмо 1"}) is messages
+    restarted = AIService._history({"messages": messages, "response": "Письмо из бота"})
+    assert [m.content for m in restarted] == ["Письмо из бота"]
+
+
+async def test_history_over_budget_is_summarized_before_regeneration(
+    monkeypatch: pytest.MonkeyPatch, test_vacancy_entity, test_resume_entity, test_employer_entity
+):
+    answers = ["Письмо 1", "Письмо 2", "- писать короче", "Письмо 3"]
+    llm = GenericFakeChatModel(messages=iter([AIMessage(answer) for answer in answers]))
+    service = AIService(InMemorySaver(), endpoints=[LLMEndpoint("primary", "fake", llm)])
+    data = {
+        "user_id": 1,
+        "vacancy": test_vacancy_entity,
+        "resume": test_resume_entity,
+        "employer": test_employer_entity,
+        "user_rules": {},
+    }
+
+    await service.generate_response(data)
+    await service.regenerate_response(1, "Письмо 1", "короче")
+    monkeypatch.setattr(app_settings, "AI_HISTORY_TOKEN_BUDGET", 1)
+    result = await service.regenerate_response(1, "Письмо 2", "еще короче")
+
+    assert result.message == "Письмо 3"
+    state = await service._workflow.aget_state(AIService._get_config(1))
+    messages = state.values["messages"]
+    # прошлые варианты и замечания свернуты в одно сообщение
+    assert len(messages) == 4
+    assert messages[0].content.endswith("- писать короче")
+    assert [m.content for m in messages[1::2]] == ["Письмо 2", "Письмо 3"]
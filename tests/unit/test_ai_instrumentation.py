@@ -0,0 +1,137 @@
+from uuid import uuid4
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+from source.infrastructure.services.ai_instrumentation import WorkflowInstrumentation
+from source.infrastructure.services.ai_service import AIService
+from source.infrastructure.services.entity_store import EntityStore
+from source.infrastructure.services.llm_endpoints import LLMEndpoint
+from source.infrastructure.settings.app import app_settings
+from source.infrastructure.utils.metrics import metrics
+
+MODEL = "test-instrumentation-model"
+
+
+def llm_result(input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> LLMResult:
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": cached_tokens},
+        },
+    )
+    return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+
+async def call_llm(handler, root_id, node: str | None, result: LLMResult) -> None:
+    metadata = {"ls_model_name": MODEL}
+    if node is not None:
+        metadata["langgraph_node"] = node
+    run_id = uuid4()
+    await handler.on_chat_model_start(
+        None, [[]], run_id=run_id, parent_run_id=root_id, metadata=metadata
+    )
+    await handler.on_llm_end(result, run_id=run_id)
+
+
+@pytest.fixture
+def prices(monkeypatch):
+    monkeypatch.setattr(
+        app_settings,
+        "LLM_PRICES",
+        {MODEL: {"input": 2.0, "cached_input": 0.5, "output": 8.0}},
+    )
+
+
+def test_estimate_cost_uses_cached_input_price(prices):
+    cost = WorkflowInstrumentation.estimate_cost(MODEL, 1_000_000, 400_000, 500_000)
+
+    assert cost == pytest.approx(0.6 * 2.0 + 0.4 * 0.5 + 0.5 * 8.0)
+    assert WorkflowInstrumentation.estimate_cost("unknown", 1000, 0, 1000) == 0.0
+
+
+async def test_tokens_and_cost_aggregated_by_node_and_workflow(prices):
+    handler = WorkflowInstrumentation()
+    node = f"generate-{uuid4()}"
+    labels = {"node": node, "model": MODEL}
+    root_id = uuid4()
+    await handler.on_chain_start(None, {}, run_id=root_id, metadata={"user_id": 1})
+
+    await call_llm(handler, root_id, node, llm_result(1_000, 200, cached_tokens=600))
+    await call_llm(handler, root_id, node, llm_result(500, 100))
+    await call_llm(handler, root_id, None, llm_result(300, 50))
+
+    workflow = handler._workflows[root_id]
+    assert workflow.input_tokens == 1_800
+    assert workflow.cached_tokens == 600
+    assert workflow.output_tokens == 350
+    assert workflow.llm_calls == {node: 2}
+    assert workflow.cost == pytest.approx((1_200 * 2.0 + 600 * 0.5 + 350 * 8.0) / 1_000_000)
+
+    assert metrics.get_counter("ai_llm_prompt_tokens_total", **labels) == 1_500
+    assert metrics.get_counter("ai_llm_cached_tokens_total", **labels) == 600
+    assert metrics.get_counter("ai_llm_completion_tokens_total", **labels) == 300
+    assert metrics.get_counter("ai_llm_cost_usd_total", **labels) == pytest.approx(
+        (900 * 2.0 + 600 * 0.5 + 300 * 8.0) / 1_000_000
+    )
+    assert metrics.get_counter("ai_llm_retries_total", node=node) == 1
+    # вызов вне узла не пишется с меткой node="None"
+    assert metrics.get_counter("ai_llm_prompt_tokens_total", node=None, model=MODEL) == 0
+
+    await handler.on_chain_end({}, run_id=root_id)
+    assert not handler._workflows
+    assert not handler._runs
+
+
+async def test_abandoned_runs_evicted_after_ttl():
+    handler = WorkflowInstrumentation(ttl=0.0)
+    abandoned = uuid4()
+    await handler.on_chain_start(None, {}, run_id=abandoned)
+    await handler.on_chat_model_start(
+        None, [[]], run_id=uuid4(), parent_run_id=abandoned, metadata={"langgraph_node": "n"}
+    )
+    evicted = metrics.get_counter("ai_workflow_abandoned_total")
+
+    current = uuid4()
+    await handler.on_chain_start(None, {}, run_id=current)
+
+    assert list(handler._workflows) == [current]
+    assert not handler._runs
+    assert metrics.get_counter("ai_workflow_abandoned_total") == evicted + 1
+
+
+async def test_regenerate_from_checkpoint_reports_vacancy_id(
+    monkeypatch, test_vacancy_entity, test_resume_entity, test_employer_entity
+):
+    finished: list[str | None] = []
+    monkeypatch.setattr(
+        WorkflowInstrumentation,
+        "_finish_workflow",
+        staticmethod(lambda workflow: finished.append(workflow.vacancy_id)),
+    )
+    llm = GenericFakeChatModel(messages=iter([AIMessage("Письмо 1"), AIMessage("Письмо 2")]))
+    service = AIService(
+        InMemorySaver(),
+        endpoints=[LLMEndpoint("primary", "fake", llm)],
+        entity_store=EntityStore(FakeAsyncRedis(), ttl=60),
+    )
+    data = {
+        "user_id": 1,
+        "vacancy": test_vacancy_entity,
+        "resume": test_resume_entity,
+        "employer": test_employer_entity,
+        "user_rules": {},
+    }
+
+    await service.generate_response(data)
+    # в состоянии checkpoint'а вместо вакансии - ссылка на EntityStore
+    await service.regenerate_response(1, "Письмо 1", "короче")
+
+    assert finished == [test_vacancy_entity.hh_id] * 2
@@ -0,0 +1,38 @@
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from source.infrastructure.services.ai_prompts import PromptBuilder
+
+
+def test_context_keeps_user_prefix_stable_across_vacancies(
+    test_vacancy_entity, test_resume_entity, test_employer_entity
+):
+    state = {
+        "resume": test_resume_entity,
+        "user_rules": {"max_length": 1000},
+        "vacancy": test_vacancy_entity,
+        "employer": test_employer_entity,
+    }
+    other = test_vacancy_entity.model_copy(update={"hh_id": "2", "name": "Go разработчик"})
+
+    first = PromptBuilder.context(state)
+    second = PromptBuilder.context({**state, "vacancy": other, "employer": None})
+
+    assert isinstance(first[0], SystemMessage) and isinstance(first[1], HumanMessage)
+    # резюме и правила - в общем префиксе, вакансия и работодатель - только в суффиксе
+    assert first[0].content == second[0].content
+    assert test_resume_entity.surname in first[0].content
+    assert "Go разработчик" not in second[0].content
+    assert "Go разработчик" in second[1].content
+    assert test_employer_entity.name in first[1].content
+
+
+def test_cache_control_marks_only_system_message_copy():
+    messages = [SystemMessage("инструкции"), HumanMessage("вакансия")]
+
+    marked = PromptBuilder.with_cache_control(messages)
+
+    assert marked[0].content == [
+        {"type": "text", "text": "инструкции", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert marked[1] is messages[1]
+    assert messages[0].content == "инструкции"
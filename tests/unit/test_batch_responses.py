@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import httpx
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+
+from source.application.use_cases.generate_responses_batch import GenerateResponsesBatchUseCase
+from source.domain.entities.employer import EmployerEntity
+from source.domain.entities.response import ResponseToVacancyEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.hh_service import HHService
+from source.presentation.api.ai import router
+
+
+class FakeHHService:
+    def __init__(self):
+        self.employer_requests = 0
+
+    extract_vacancy_id_from_url = staticmethod(HHService.extract_vacancy_id_from_url)
+
+    async def get_resume_data(self, subject, resume_hh_id):
+        if resume_hh_id == "404":
+            raise ValueError("Резюме не найдено")
+        return None
+
+    async def get_user_rules(self):
+        return {}
+
+    async def get_employer_data(self, subject, employer_id):
+        self.employer_requests += 1
+        return EmployerEntity(hh_id=employer_id, name="Яндекс", description="")
+
+    async def iter_vacancies(self, subject, max_results=None, **filter_query):
+        yield await self.get_vacancy_data(subject, "1")
+        yield await self.get_vacancy_data(subject, "2")
+        raise RuntimeError("hh.ru недоступен")
+
+    async def get_vacancy_data(self, subject, vacancy_id):
+        if vacancy_id == "404":
+            raise ValueError("Вакансия не найдена")
+        return VacancyEntity(
+            hh_id=vacancy_id,
+            url_vacancy=f"https://hh.ru/vacancy/{vacancy_id}",
+            name="Python разработчик",
+            experience={"id": "noExperience", "name": "Нет опыта"},
+            description="",
+            key_skills=[],
+            employer_id="1740",
+        )
+
+
+class FakeAIService:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_response(self, data, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        vacancy = data["vacancy"]
+        return ResponseToVacancyEntity(
+            url_vacancy=vacancy.url_vacancy,
+            vacancy_hh_id=vacancy.hh_id,
+            resume_hh_id="r",
+            message=f"Отклик на {vacancy.hh_id}",
+        )
+
+
+def make_app(hh_service: FakeHHService, ai_service: FakeAIService) -> FastAPI:
+    provider = Provider(scope=Scope.APP)
+    provider.provide(
+        lambda: GenerateResponsesBatchUseCase(hh_service, ai_service, max_concurrency=2),
+        provides=GenerateResponsesBatchUseCase,
+    )
+    app = FastAPI()
+    app.include_router(router)
+    setup_dishka(make_async_container(provider), app)
+    return app
+
+
+async def post_batch(app: FastAPI, **query) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.post(
+            "/ai/responses/generate:batch",
+            json={"subject": "user", "user_id": 1, "resume_hh_id": "r", **query},
+        )
+
+
+async def test_batch_endpoint_streams_one_ndjson_line_per_vacancy():
+    hh_service, ai_service = FakeHHService(), FakeAIService()
+    urls = [f"https://hh.ru/vacancy/{vacancy_id}" for vacancy_id in ("1", "2", "3", "404")]
+
+    response = await post_batch(make_app(hh_service, ai_service), urls_vacancy=urls)
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    items = {item["vacancy_hh_id"]: item for item in map(json.loads, response.text.splitlines())}
+    assert items.keys() == {"1", "2", "3", "404"}
+    assert items["1"]["response"]["message"] == "Отклик на 1"
+    assert items["404"]["response"] is None and items["404"]["error"] == "Вакансия не найдена"
+    # работодатель один на все вакансии, генерации ограничены max_concurrency
+    assert hh_service.employer_requests == 1
+    assert ai_service.max_active <= 2
+
+
+async def test_batch_endpoint_returns_status_when_resume_not_loaded():
+    response = await post_batch(
+        make_app(FakeHHService(), FakeAIService()),
+        resume_hh_id="404",
+        urls_vacancy=["https://hh.ru/vacancy/1"],
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Резюме не найдено"
+
+
+async def test_search_failure_is_last_item_of_stream():
+    response = await post_batch(
+        make_app(FakeHHService(), FakeAIService()), search_filter={"text": "python"}
+    )
+
+    *items, error = map(json.loads, response.text.splitlines())
+    assert sorted(item["vacancy_hh_id"] for item in items) == ["1", "2"]
+    assert all(item["response"] is not None for item in items)
+    assert error["url_vacancy"] is None and error["error"] == "hh.ru недоступен"
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from langchain_core.messages import AIMessage
+
+from source.domain.entities.resume import JobExperienceEntity, ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.checkpoint_serde import CheckpointSerializer
+
+
+def make_vacancy(description: str = "<p>Python разработчик</p>") -> VacancyEntity:
+    return VacancyEntity(
+        hh_id="1",
+        url_vacancy="https://hh.ru/vacancy/1",
+        name="Python разработчик",
+        experience={"id": "between1And3", "name": "От 1 года до 3 лет"},
+        description=description,
+        key_skills=[{"name": "Python"}],
+        employer_id="2",
+    )
+
+
+def test_entities_roundtrip_with_type_tags():
+    serde = CheckpointSerializer()
+    resume = ResumeEntity(
+        hh_id="r1",
+        title="Python разработчик",
+        name="Иван",
+        surname="Иванов",
+        job_experience=[
+            JobExperienceEntity(
+                company="Компания",
+                position="Разработчик",
+                start=datetime(2020, 1, 1),
+                end=None,
+                description="Разработка API",
+            )
+        ],
+        skills={"Python", "Redis"},
+        contact_phone="+79990000000",
+        contact_email="ivan@example.com",
+    )
+    value = [make_vacancy(), resume, AIMessage(content="Письмо")]
+
+    type_, data = serde.dumps_typed(value)
+
+    assert type_ == CheckpointSerializer.TYPE
+    assert serde.loads_typed((type_, data)) == value
+
+
+def test_large_values_are_compressed():
+    serde = CheckpointSerializer(compress_threshold=1024)
+    vacancy = make_vacancy("<p>Python разработчик</p>" * 200)
+
+    type_, data = serde.dumps_typed(vacancy)
+
+    assert type_ == CheckpointSerializer.TYPE_ZSTD
+    assert len(data) < len(vacancy.description)
+    assert serde.loads_typed((type_, data)) == vacancy
+
+
+def test_metadata_stays_json():
+    serde = CheckpointSerializer()
+    metadata = {"source": "loop", "step": 1, "user_id": 1}
+
+    type_, data = serde.dumps_typed(metadata)
+
+    assert type_ == "json"
+    assert serde.loads_typed((type_, data)) == metadata
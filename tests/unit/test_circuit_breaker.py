@@ -0,0 +1,80 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from source.infrastructure.services.ai_service import AIService
+from source.infrastructure.services.llm_endpoints import LLMEndpoint
+from source.infrastructure.utils.circuit_breaker import CircuitState, RedisCircuitBreaker
+from source.infrastructure.utils.metrics import metrics
+
+
+def make_breaker(redis: FakeAsyncRedis, name: str = "primary") -> RedisCircuitBreaker:
+    return RedisCircuitBreaker(
+        redis, name, window=10, min_requests=3, failure_rate=0.5, open_seconds=0.2
+    )
+
+
+async def test_breaker_opens_on_failures_and_recovers_after_probe():
+    breaker = make_breaker(FakeAsyncRedis())
+
+    for _ in range(2):
+        await breaker.record_failure(await breaker.allow())
+    assert breaker.state == CircuitState.CLOSED
+    await breaker.record_failure(await breaker.allow())
+    assert breaker.state == CircuitState.OPEN
+    assert await breaker.allow() is None
+
+    await asyncio.sleep(0.25)
+    # после паузы пропускается ровно один пробный запрос
+    probe = await breaker.allow()
+    assert probe is not None and probe.probe
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert await breaker.allow() is None
+
+    await breaker.record_success(probe, duration=0.1)
+    assert breaker.state == CircuitState.CLOSED
+    permit = await breaker.allow()
+    assert permit is not None and not permit.probe
+
+
+async def test_failed_probe_opens_breaker_again():
+    breaker = make_breaker(FakeAsyncRedis())
+    for _ in range(3):
+        await breaker.record_failure(await breaker.allow())
+    await asyncio.sleep(0.25)
+
+    await breaker.record_failure(await breaker.allow())
+
+    assert breaker.state == CircuitState.OPEN
+    assert await breaker.allow() is None
+
+
+class UnreachableModel(GenericFakeChatModel):
+    async def _agenerate(self, *args, **kwargs):
+        raise AssertionError("запрос к отключенному эндпоинту")
+
+
+async def test_request_fails_over_to_next_endpoint_when_primary_is_open():
+    redis = FakeAsyncRedis()
+    primary = make_breaker(redis, "primary")
+    for _ in range(3):
+        await primary.record_failure(await primary.allow())
+    endpoints = [
+        LLMEndpoint("primary", "main", UnreachableModel(messages=iter([])), primary),
+        LLMEndpoint(
+            "reserve",
+            "reserve",
+            GenericFakeChatModel(messages=iter([AIMessage("Ответ резервной модели")])),
+            make_breaker(redis, "reserve"),
+        ),
+    ]
+    service = AIService(InMemorySaver(), endpoints=endpoints)
+    failovers = metrics.get_counter("llm_failover_total", endpoint="reserve")
+
+    response = await service._request_llm([HumanMessage("Привет")], AIService._get_config(1))
+
+    assert response.content == "Ответ резервной модели"
+    assert metrics.get_counter("llm_failover_total", endpoint="reserve") == failovers + 1
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from source.application.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    bind_deadline,
+    current_deadline,
+    deadline_scope,
+)
+
+
+def test_timeout_is_limited_by_remaining_time():
+    deadline = Deadline.after(1.0)
+
+    assert deadline.timeout(60.0) <= 1.0
+    assert deadline.timeout(0.1) == 0.1
+
+
+def test_expired_deadline_raises():
+    deadline = Deadline.after(0)
+
+    with pytest.raises(DeadlineExceededError):
+        deadline.timeout(1.0)
+
+
+def test_nested_deadline_cannot_extend_outer():
+    with bind_deadline(1.0) as outer:
+        with bind_deadline(10.0) as inner:
+            assert inner is outer
+            assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+async def test_scope_cancels_work_after_deadline():
+    with pytest.raises(DeadlineExceededError):
+        async with deadline_scope(0.05):
+            await asyncio.sleep(1)
+    assert current_deadline() is None
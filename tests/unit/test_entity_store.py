@@ -0,0 +1,38 @@
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+
+from source.infrastructure.services.entity_store import EntityNotFoundError, EntityStore
+
+
+async def test_put_get_round_trip(test_vacancy_entity, test_resume_entity):
+    redis = FakeAsyncRedis()
+    store = EntityStore(redis, ttl=60)
+
+    vacancy_ref = await store.put(test_vacancy_entity)
+    resume_ref = await store.put(test_resume_entity)
+
+    assert vacancy_ref.startswith("vacancy:")
+    assert resume_ref.startswith("resume:")
+    assert await store.put(test_vacancy_entity) == vacancy_ref
+    assert await redis.ttl(f"entity:{vacancy_ref}") > 0
+    # другой процесс без локального кэша читает сущности из Redis
+    other = EntityStore(redis, ttl=60)
+    assert await other.get(vacancy_ref) == test_vacancy_entity
+    assert await other.get(resume_ref) == test_resume_entity
+
+
+async def test_get_missing_ref_raises(test_vacancy_entity):
+    redis = FakeAsyncRedis()
+    ref = await EntityStore(redis, ttl=60).put(test_vacancy_entity)
+    await redis.delete(f"entity:{ref}")
+
+    with pytest.raises(EntityNotFoundError):
+        await EntityStore(redis, ttl=60).get(ref)
+
+
+async def test_put_keeps_entity_inline_when_redis_unavailable(test_employer_entity):
+    server = FakeServer()
+    server.connected = False
+    store = EntityStore(FakeAsyncRedis(server=server), ttl=60)
+
+    assert await store.put(test_employer_entity) is test_employer_entity
@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+from source.infrastructure.utils.fetch_executor import FairFetchExecutor
+
+
+async def test_slots_are_limited_and_shared_fairly_between_keys():
+    executor = FairFetchExecutor(limit_per_host=2)
+    active = peak = 0
+    order: list[str] = []
+
+    async def fetch(key: str) -> None:
+        nonlocal active, peak
+        async with executor.slot("api.hh.ru", key):
+            active += 1
+            peak = max(peak, active)
+            order.append(key)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    tasks = [asyncio.create_task(fetch("a")) for _ in range(10)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(fetch("b")) for _ in range(2)]
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    # запросы "b" не ждут, пока выполнятся все запросы "a"
+    assert max(i for i, key in enumerate(order) if key == "b") < 6
+
+
+async def test_throttled_host_is_paused_and_limit_recovers():
+    executor = FairFetchExecutor(limit_per_host=4)
+
+    executor.throttled("api.hh.ru", retry_after=0.05)
+    assert executor.cooldown("api.hh.ru") > 0
+    started = time.monotonic()
+    async with executor.slot("api.hh.ru", "a"):
+        pass
+
+    assert time.monotonic() - started >= 0.04
+    assert executor._hosts["api.hh.ru"].limit == 2
+    executor.succeeded("api.hh.ru")
+    assert executor._hosts["api.hh.ru"].limit == 3
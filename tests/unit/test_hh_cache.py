@@ -0,0 +1,46 @@
+import time
+
+import httpx
+
+from source.infrastructure.services.hh_cache import CachedHHResponse, HHResponseCache
+
+
+def test_public_endpoints_are_keyed_globally():
+    cache = HHResponseCache(cache=None, ttls={"vacancy": 600, "resume": 300}, retention=60)
+
+    vacancy = cache.rule("/vacancies/123")
+    resume = cache.rule("/resumes/abc-1")
+
+    assert vacancy.shared and not resume.shared
+    assert cache.rule("/employers/1") is None  # TTL не задан - не кэшируется
+    assert cache.rule("/resumes/mine") is None
+    assert cache.key(vacancy, "/vacancies/123", None, "user_1") == "/vacancies/123"
+    assert cache.key(resume, "/resumes/abc-1", None, "user_1") == "subject:user_1:/resumes/abc-1"
+    assert cache.key(vacancy, "/vacancies/123", {"b": 2, "a": 1}, None) == (
+        "/vacancies/123?a=1&b=2"
+    )
+
+
+def test_cached_response_revalidation():
+    response = httpx.Response(
+        200,
+        json={"id": "1"},
+        headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Oct 2025 10:00:00 GMT"},
+    )
+    entry = CachedHHResponse.from_response(response)
+    stale = CachedHHResponse(
+        content=entry.content,
+        etag=entry.etag,
+        last_modified=entry.last_modified,
+        fetched_at=time.time() - 100,
+    )
+
+    assert entry.is_fresh(60)
+    assert not stale.is_fresh(60)
+    assert stale.revalidated().is_fresh(60)
+    assert stale.validators() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Oct 2025 10:00:00 GMT",
+    }
+    restored = stale.to_response(httpx.Request("GET", "https://api.hh.ru/vacancies/1"))
+    assert restored.json() == {"id": "1"}
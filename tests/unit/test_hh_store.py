@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+from datetime import UTC, datetime, timedelta
+
+from source.domain.entities.employer import EmployerEntity
+from source.infrastructure.services.hh_service import HHService
+from source.infrastructure.services.hh_store import HHRecordStore
+from source.infrastructure.services.text_preprocessing import DescriptionPreprocessor
+from source.infrastructure.services.text_summarizer import ExtractiveSummarizer
+
+
+class FakeSession:
+    def begin(self):
+        return contextlib.nullcontext()
+
+
+class FakeRepository:
+    rows: dict[str, tuple[EmployerEntity, datetime]] = {}
+
+    def __init__(self, session: FakeSession):
+        self.session = session
+
+    async def get_by_hh_id(self, hh_id: str) -> tuple[EmployerEntity, datetime] | None:
+        return self.rows.get(hh_id)
+
+    async def upsert(self, entity: EmployerEntity, fetched_at: datetime) -> None:
+        self.rows[entity.hh_id] = (entity, fetched_at)
+
+
+@contextlib.asynccontextmanager
+async def session_maker():
+    yield FakeSession()
+
+
+def make_store() -> HHRecordStore:
+    FakeRepository.rows = {}
+    return HHRecordStore(
+        session_maker,
+        refresh_after={"employer": 60},
+        max_staleness={"employer": 3600},
+        repositories={"employer": FakeRepository},
+    )
+
+
+def employer(name: str) -> EmployerEntity:
+    return EmployerEntity(hh_id="1", name=name, description="")
+
+
+async def test_fetched_record_is_saved_and_served_from_store():
+    store = make_store()
+    fetches = 0
+
+    async def fetch() -> EmployerEntity:
+        nonlocal fetches
+        fetches += 1
+        return employer("hh.ru")
+
+    assert (await store.get("employer", "1", fetch)).name == "hh.ru"
+    await store.aclose()
+    assert (await store.get("employer", "1", fetch)).name == "hh.ru"
+    assert fetches == 1
+
+
+async def test_stale_record_is_served_and_refreshed_in_background():
+    store = make_store()
+    FakeRepository.rows["1"] = (employer("old"), datetime.now(UTC) - timedelta(minutes=5))
+    refreshed = asyncio.Event()
+
+    async def fetch() -> EmployerEntity:
+        refreshed.set()
+        return employer("new")
+
+    assert (await store.get("employer", "1", fetch)).name == "old"
+    await store.aclose()
+    assert refreshed.is_set()
+    assert FakeRepository.rows["1"][0].name == "new"
+
+
+class FakeHHClient:
+    def __init__(self, description: str):
+        self.description = description
+
+    async def get_employer(self, employer_id: str, subject=None) -> dict:
+        return {"id": employer_id, "name": "hh.ru", "description": self.description}
+
+
+async def test_store_keeps_full_description_and_prompt_gets_summary():
+    sentences = [f"Предложение номер {i} о компании и её продуктах." for i in range(40)]
+    service = HHService.__new__(HHService)
+    service.hh_client = FakeHHClient("<p>" + " ".join(sentences) + "</p>")
+    service._preprocessor = DescriptionPreprocessor()
+    service._summarizer = ExtractiveSummarizer()
+    service._employer_token_budget = 50
+    service._record_store = make_store()
+
+    summarized = await service.get_employer_data(None, "1")
+    await service._record_store.aclose()
+
+    stored = FakeRepository.rows["1"][0]
+    assert stored.description == " ".join(sentences)
+    assert 0 < len(summarized.description) < len(stored.description)
@@ -0,0 +1,87 @@
+import asyncio
+import datetime as dt
+
+import httpx
+import pytest
+from hh_api.auth import InMemoryKeyedTokenStore, OAuthConfig, TokenPair
+from hh_api.exceptions import HHAuthError
+
+from source.infrastructure.services.hh_service import CustomHHClient, CustomTokenManager
+
+
+def make_manager(refresh_ahead: float = 0.0) -> tuple[CustomTokenManager, list[int]]:
+    refreshes: list[int] = []
+
+    async def token_endpoint(request: httpx.Request) -> httpx.Response:
+        refreshes.append(1)
+        await asyncio.sleep(0.01)
+        return httpx.Response(
+            200,
+            json={"access_token": "new", "refresh_token": "refresh-2", "expires_in": 3600},
+        )
+
+    manager = CustomTokenManager(
+        OAuthConfig("client", "secret", "https://example.com/callback"),
+        InMemoryKeyedTokenStore(),
+        user_agent="test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(token_endpoint)),
+        refresh_ahead=refresh_ahead,
+    )
+    return manager, refreshes
+
+
+def tokens(access_token: str, expires_in: int) -> TokenPair:
+    expires_at = dt.datetime.now(dt.UTC) + dt.timedelta(seconds=expires_in)
+    return TokenPair(access_token, expires_in, expires_at, "refresh-1")
+
+
+async def test_expired_token_is_refreshed_once():
+    manager, refreshes = make_manager()
+    await manager.store.set_tokens("user", tokens("old", -1))
+
+    results = await asyncio.gather(*[manager.ensure_access("user") for _ in range(10)])
+
+    assert results == ["new"] * 10
+    assert len(refreshes) == 1
+    # следующий запрос берет токен из кэша процесса
+    await manager.store.set_tokens("user", tokens("other", 3600))
+    assert await manager.ensure_access("user") == "new"
+
+
+async def test_token_is_refreshed_ahead_in_background():
+    manager, refreshes = make_manager(refresh_ahead=300)
+    await manager.store.set_tokens("user", tokens("current", 100))
+
+    assert await manager.ensure_access("user") == "current"
+    await asyncio.sleep(0.05)
+
+    assert len(refreshes) == 1
+    assert await manager.ensure_access("user") == "new"
+
+
+async def test_rejected_cached_token_is_reread_from_store_once():
+    manager, refreshes = make_manager()
+    seen_tokens: list[str] = []
+
+    async def api(request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        seen_tokens.append(token)
+        if token == "revoked":
+            return httpx.Response(401, json={"errors": [{"type": "oauth"}]})
+        return httpx.Response(200, json={"id": "user"})
+
+    client = CustomHHClient(manager, transport=httpx.MockTransport(api))
+    await manager.save_tokens("user", tokens("revoked", 3600))
+    # другой процесс переавторизовал пользователя, кэш процесса еще хранит старый токен
+    await manager.store.set_tokens("user", tokens("fresh", 3600))
+
+    assert await client.get_me("user") == {"id": "user"}
+    assert seen_tokens == ["revoked", "fresh"]
+
+    await manager.save_tokens("user", tokens("revoked", 3600))
+    seen_tokens.clear()
+    with pytest.raises(HHAuthError):
+        await client.get_me("user")
+    assert seen_tokens == ["revoked", "revoked"]
+    assert not refreshes
+    await client.aclose()
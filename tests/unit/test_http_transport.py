@@ -0,0 +1,49 @@
+import asyncio
+import contextlib
+
+import httpx
+
+from source.infrastructure.utils.http_transport import InstrumentedTransport
+from source.infrastructure.utils.metrics import metrics
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # HTTP/1.1 keep-alive: отвечаем на запросы, пока клиент не закроет соединение
+    with contextlib.suppress(asyncio.IncompleteReadError, ConnectionError):
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+    writer.close()
+
+
+async def test_connections_are_reused_and_counted():
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = InstrumentedTransport("test-reuse", http2=False)
+
+    async with server, httpx.AsyncClient(transport=transport) as client:
+        for _ in range(3):
+            response = await client.get(f"http://127.0.0.1:{port}/")
+            assert response.text == "ok"
+        state = transport.pool_state()
+
+    labels = {"client": "test-reuse", "http_version": "HTTP/1.1"}
+    assert metrics.get_counter("http_client_requests_total", connection="new", **labels) == 1
+    assert metrics.get_counter("http_client_requests_total", connection="reused", **labels) == 2
+    assert state[(("client", "test-reuse"), ("state", "idle"))] == 1
+
+
+async def test_pool_gauge_reported_per_transport_until_closed():
+    first = InstrumentedTransport("test-gauge-1")
+    second = InstrumentedTransport("test-gauge-2")
+    gauge = 'http_client_pool_connections{client="%s",state="idle"}'
+
+    gauges = metrics.snapshot()["gauges"]
+    assert gauge % "test-gauge-1" in gauges and gauge % "test-gauge-2" in gauges
+
+    async with httpx.AsyncClient(transport=first):
+        pass
+    await second.aclose()
+
+    gauges = metrics.snapshot()["gauges"]
+    assert gauge % "test-gauge-1" not in gauges and gauge % "test-gauge-2" not in gauges
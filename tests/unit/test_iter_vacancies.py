@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+from hh_api.exceptions import HHAPIError
+
+from source.infrastructure.services.hh_service import HHService
+
+
+class FakeHHClient:
+    def __init__(self, pages: int, per_page: int):
+        self.pages = pages
+        self.per_page = per_page
+        self.requested_pages: list[int] = []
+
+    async def get_vacancies(self, subject, page: int = 0, **filter_query) -> dict:
+        self.requested_pages.append(page)
+        items = [{"id": f"{page}-{i}"} for i in range(self.per_page)]
+        return {"items": items, "pages": self.pages}
+
+
+def make_service(client: FakeHHClient, started: list[str]) -> HHService:
+    service = HHService.__new__(HHService)
+    service.hh_client = client
+
+    async def get_vacancy_data(subject, vacancy_id: str):
+        started.append(vacancy_id)
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(id=vacancy_id)
+
+    service.get_vacancy_data = get_vacancy_data
+    return service
+
+
+async def test_search_stops_at_max_results():
+    client = FakeHHClient(pages=10, per_page=3)
+    started: list[str] = []
+    service = make_service(client, started)
+
+    vacancies = [vacancy async for vacancy in service.iter_vacancies("user", max_results=5)]
+
+    assert len(vacancies) == 5
+    assert client.requested_pages == [0, 1]
+    assert len(started) == 5
+
+
+async def test_early_termination_cancels_pending_requests():
+    client = FakeHHClient(pages=10, per_page=3)
+    started: list[str] = []
+    service = make_service(client, started)
+
+    search = service.iter_vacancies("user", text="python")
+    first = await anext(search)
+    await search.aclose()
+    await asyncio.sleep(0.02)
+
+    assert first.id.startswith("0-")
+    # загружена только первая страница и предзагрузка второй
+    assert client.requested_pages == [0, 1]
+
+
+async def test_unavailable_vacancies_do_not_count_toward_max_results():
+    client = FakeHHClient(pages=10, per_page=3)
+    started: list[str] = []
+    service = make_service(client, started)
+    get_vacancy_data = service.get_vacancy_data
+
+    async def get_available_vacancy_data(subject, vacancy_id: str):
+        vacancy = await get_vacancy_data(subject, vacancy_id)
+        if vacancy_id in ("0-0", "1-0"):
+            raise HHAPIError(404, "Вакансия в архиве")
+        return vacancy
+
+    service.get_vacancy_data = get_available_vacancy_data
+
+    vacancies = [vacancy async for vacancy in service.iter_vacancies("user", max_results=5)]
+
+    assert sorted(vacancy.id for vacancy in vacancies) == ["0-1", "0-2", "1-1", "1-2", "2-0"]
+    assert client.requested_pages == [0, 1, 2]
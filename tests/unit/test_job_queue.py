@@ -0,0 +1,130 @@
+import asyncio
+
+from dishka import Provider, Scope, make_async_container
+from fakeredis import FakeAsyncRedis
+
+from source.application.dtos.job import JobStatus
+from source.application.dtos.query import QueryCreateDTO
+from source.application.use_cases.generate_response import GenerateResponseUseCase
+from source.domain.entities.response import ResponseToVacancyEntity
+from source.infrastructure.services.job_queue import RedisJobQueue
+from source.presentation.worker import ResponseJobWorker
+
+
+def make_query(vacancy_id: str = "1") -> QueryCreateDTO:
+    return QueryCreateDTO(
+        subject="user", user_id=1, url_vacancy=f"https://hh.ru/vacancy/{vacancy_id}"
+    )
+
+
+def make_queue(visibility_timeout: float = 300.0) -> RedisJobQueue:
+    return RedisJobQueue(FakeAsyncRedis(), visibility_timeout=visibility_timeout)
+
+
+async def test_enqueue_dedupes_and_ack_clears_pending():
+    queue = make_queue()
+    await queue.ensure_group()
+
+    job = await queue.enqueue(make_query())
+    assert (await queue.enqueue(make_query())).job_id == job.job_id
+
+    messages = await queue.read("consumer")
+    assert [job_id for _, job_id in messages] == [job.job_id]
+    await queue.ack(messages[0][0])
+
+    assert (await queue.redis.xpending(queue.stream, queue.group))["pending"] == 0
+    assert await queue.read("consumer") == []
+
+
+async def test_unacked_message_redelivered_after_visibility_timeout():
+    queue = make_queue(visibility_timeout=0.05)
+    await queue.ensure_group()
+    job = await queue.enqueue(make_query())
+    [(message_id, _)] = await queue.read("crashed")
+
+    assert await queue.claim_stale("other") == []
+    await asyncio.sleep(0.03)
+    # продление сбрасывает время простоя
+    await queue.touch("crashed", message_id)
+    await asyncio.sleep(0.03)
+    assert await queue.claim_stale("other") == []
+
+    await asyncio.sleep(0.06)
+    assert await queue.claim_stale("other") == [(message_id, job.job_id)]
+
+
+async def test_failed_job_releases_dedupe_and_retry_requeues():
+    queue = make_queue()
+    await queue.ensure_group()
+    job = await queue.enqueue(make_query())
+    [(message_id, _)] = await queue.read("consumer")
+
+    retried = await queue.retry(message_id, await queue.start(job), "timeout")
+    assert retried.status == JobStatus.QUEUED and retried.error == "timeout"
+    [(message_id, job_id)] = await queue.read("consumer")
+    assert job_id == job.job_id
+
+    failed = await queue.fail(retried, "boom")
+    assert (await queue.get(job.job_id)).status == JobStatus.FAILED
+    assert failed.attempts == 1
+    # после окончательной ошибки такой же запрос создает новую задачу
+    assert (await queue.enqueue(make_query())).job_id != job.job_id
+
+
+class FakeGenerateResponseUseCase:
+    calls: dict[str, int] = {}
+
+    async def __call__(self, query: QueryCreateDTO) -> ResponseToVacancyEntity:
+        vacancy_id = query.url_vacancy.rsplit("/", 1)[-1]
+        self.calls[vacancy_id] = self.calls.get(vacancy_id, 0) + 1
+        if vacancy_id == "invalid":
+            raise ValueError("Вакансия не найдена")
+        if vacancy_id == "flaky" and self.calls[vacancy_id] == 1:
+            raise RuntimeError("LLM недоступна")
+        return ResponseToVacancyEntity(
+            url_vacancy=query.url_vacancy,
+            vacancy_hh_id=vacancy_id,
+            resume_hh_id=query.resume_hh_id,
+            message=f"Отклик на {vacancy_id}",
+        )
+
+
+async def test_worker_completes_retries_and_fails_jobs(monkeypatch):
+    provider = Provider(scope=Scope.REQUEST)
+    provider.provide(FakeGenerateResponseUseCase, provides=GenerateResponseUseCase)
+    container = make_async_container(provider)
+    queue = make_queue()
+
+    async def read(consumer: str, count: int = 1):
+        messages = await RedisJobQueue.read(queue, consumer, count)
+        if not messages:
+            # fakeredis не блокирует XREADGROUP с COUNT - имитируем ожидание новых сообщений
+            await asyncio.sleep(0.01)
+        return messages
+
+    monkeypatch.setattr(queue, "read", read)
+    worker = ResponseJobWorker(container, queue, concurrency=2, max_attempts=3)
+    jobs = [
+        await queue.enqueue(make_query(vacancy_id)) for vacancy_id in ("ok", "invalid", "flaky")
+    ]
+
+    task = asyncio.create_task(worker.run())
+    try:
+        async with asyncio.timeout(5):
+            while True:
+                done = [await queue.get(job.job_id) for job in jobs]
+                if all(job.status in (JobStatus.DONE, JobStatus.FAILED) for job in done):
+                    break
+                await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await container.close()
+
+    ok, invalid, flaky = done
+    assert ok.status == JobStatus.DONE and ok.result.message == "Отклик на ok"
+    # ошибка входных данных не повторяется
+    assert invalid.status == JobStatus.FAILED and invalid.attempts == 1
+    assert flaky.status == JobStatus.DONE and flaky.attempts == 2
+    assert FakeGenerateResponseUseCase.calls == {"ok": 1, "invalid": 1, "flaky": 2}
+    assert (await queue.redis.xpending(queue.stream, queue.group))["pending"] == 0
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from source.application.services.ai_service import LLMPriority
+from source.infrastructure.services.llm_admission import LLMAdmissionController
+from source.infrastructure.utils.distributed_semaphore import AdmissionTimeoutError
+
+
+def make_controller(redis: FakeAsyncRedis, lease_ttl: float = 30.0) -> LLMAdmissionController:
+    return LLMAdmissionController(
+        redis, limits={"primary": 1}, default_limit=1, lease_ttl=lease_ttl, timeout=1.0
+    )
+
+
+async def test_slot_is_released_and_waiting_is_limited_by_timeout():
+    redis = FakeAsyncRedis()
+    admission = make_controller(redis)
+
+    async with admission.slot("primary", LLMPriority.INTERACTIVE):
+        assert await redis.zcard("semaphore:llm:primary:holders") == 1
+        with pytest.raises(AdmissionTimeoutError):
+            async with admission.slot("primary", LLMPriority.INTERACTIVE, timeout=0.2):
+                pass
+
+    assert not isinstance(AdmissionTimeoutError(), TimeoutError)
+    assert await redis.zcard("semaphore:llm:primary:holders") == 0
+    assert await redis.zcard("semaphore:llm:primary:waiters") == 0
+    async with admission.slot("primary", LLMPriority.INTERACTIVE, timeout=0.2):
+        pass
+
+
+async def test_higher_priority_is_served_first():
+    admission = make_controller(FakeAsyncRedis())
+    order: list[str] = []
+
+    async def request(name: str, priority: LLMPriority) -> None:
+        async with admission.slot("primary", priority):
+            order.append(name)
+
+    async with admission.slot("primary", LLMPriority.INTERACTIVE):
+        background = asyncio.create_task(request("background", LLMPriority.BACKGROUND))
+        await asyncio.sleep(0.2)
+        interactive = asyncio.create_task(request("interactive", LLMPriority.INTERACTIVE))
+        await asyncio.sleep(0.2)
+    await asyncio.gather(background, interactive)
+
+    assert order == ["interactive", "background"]
+
+
+async def test_lease_of_crashed_holder_expires():
+    redis = FakeAsyncRedis()
+    admission = make_controller(redis, lease_ttl=0.3)
+    # слот процесса, который упал и не продлевает аренду
+    await redis.zadd("semaphore:llm:primary:holders", {"crashed": time.time() * 1000 + 300})
+
+    started = time.monotonic()
+    async with admission.slot("primary", LLMPriority.BATCH):
+        waited = time.monotonic() - started
+
+    assert 0.2 <= waited < 1.0
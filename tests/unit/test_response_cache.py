@@ -0,0 +1,71 @@
+import time
+
+from source.application.services.ai_service import GenerateResponseData
+from source.domain.entities.employer import EmployerEntity
+from source.domain.entities.resume import ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.response_cache import ResponseCache
+from source.infrastructure.utils.cache import LRUCache
+
+
+def make_data(
+    vacancy: VacancyEntity, resume: ResumeEntity, employer: EmployerEntity, user_id: int = 1
+) -> GenerateResponseData:
+    return GenerateResponseData(
+        user_id=user_id,
+        vacancy=vacancy,
+        resume=resume,
+        employer=employer,
+        user_rules={"rule_1": "Длина отклика не более 800 символов"},
+    )
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_expires_entries():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_response_cache_key_ignores_user_and_service_fields(
+    test_vacancy_entity: VacancyEntity,
+    test_resume_entity: ResumeEntity,
+    test_employer_entity: EmployerEntity,
+):
+    first = make_data(test_vacancy_entity, test_resume_entity, test_employer_entity, user_id=1)
+    second = make_data(
+        test_vacancy_entity.model_copy(
+            update={"id": 10, "description": "  " + test_vacancy_entity.description}
+        ),
+        test_resume_entity,
+        test_employer_entity,
+        user_id=2,
+    )
+    assert ResponseCache.make_key(first, "model", "1") == ResponseCache.make_key(
+        second, "model", "1"
+    )
+
+
+def test_response_cache_key_depends_on_model_and_prompt(
+    test_vacancy_entity: VacancyEntity,
+    test_resume_entity: ResumeEntity,
+    test_employer_entity: EmployerEntity,
+):
+    data = make_data(test_vacancy_entity, test_resume_entity, test_employer_entity)
+    base_key = ResponseCache.make_key(data, "model", "1")
+    assert base_key != ResponseCache.make_key(data, "other-model", "1")
+    assert base_key != ResponseCache.make_key(data, "model", "2")
+    data["user_rules"] = {"rule_1": "Длина отклика не более 500 символов"}
+    assert base_key != ResponseCache.make_key(data, "model", "1")
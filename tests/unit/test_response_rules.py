@@ -0,0 +1,48 @@
+from source.infrastructure.services.response_rules import ResponseRules, ResponseRulesEnforcer
+
+GREETING = "Здравствуйте, [Имя контактного лица]! Меня зовут Иван, я Python разработчик."
+EXPERIENCE = " ".join(f"Проект {i}: разработал сервис на FastAPI." for i in range(8))
+MOTIVATION = "Мне близка ваша миссия, хочу развивать продукт вместе с вами.\nС уважением, Иван"
+RESPONSE = "\n\n".join([GREETING, EXPERIENCE, MOTIVATION])
+
+
+def test_rules_are_parsed_from_user_rules():
+    rules = ResponseRules.from_user_rules(
+        {
+            "rule_1": "Длина отклика не более 800 символов. Допускается отклонение +- 20 символов",
+            "forbidden_phrases": ["как языковая модель"],
+        }
+    )
+
+    assert rules == ResponseRules(
+        max_length=800, length_tolerance=20, forbidden_phrases=("как языковая модель",)
+    )
+    assert rules.length_limit == 820
+
+
+def test_long_response_is_trimmed_by_sentences():
+    enforcer = ResponseRulesEnforcer(max_trim_ratio=0.3)
+    rules = ResponseRules(max_length=len(RESPONSE) - 100, forbidden_phrases=("Проект 0",))
+
+    result = enforcer.enforce(RESPONSE, rules)
+
+    assert result.repaired
+    assert result.violations == []
+    assert len(result.text) <= rules.length_limit
+    assert result.text.startswith("Здравствуйте! Меня зовут Иван")
+    assert "Проект 0" not in result.text
+    # последний абзац (мотивация и подпись) не изменяется
+    assert result.text.endswith(MOTIVATION)
+
+
+def test_violations_left_when_local_repair_is_impossible():
+    enforcer = ResponseRulesEnforcer(max_trim_ratio=0.3)
+    rules = ResponseRules(max_length=200, required_paragraph="опыт")
+
+    result = enforcer.enforce(RESPONSE, rules)
+
+    assert len(result.violations) == 2
+    assert len(result.text) > 200
+    # без ограничения на объем сокращения длину можно соблюсти
+    trimmed = enforcer.enforce(RESPONSE, ResponseRules(max_length=200), max_trim_ratio=1.0)
+    assert trimmed.violations == []
@@ -0,0 +1,27 @@
+from source.application.deadline import bind_deadline
+from source.infrastructure.utils.retry import RetryBudget, RetryPolicy
+
+
+def test_budget_limits_retries_to_ratio_of_requests():
+    budget = RetryBudget("test", ratio=0.1, window=10.0, min_retries=2)
+    for _ in range(50):
+        budget.record_request()
+
+    allowed = sum(budget.try_spend() for _ in range(20))
+
+    # 2 повтора сверх доли + 10% от 50 запросов
+    assert allowed == 7
+    assert budget.available() == 0
+
+
+async def test_policy_stops_on_attempts_deadline_and_budget():
+    policy = RetryPolicy("test", max_attempts=3, base_delay=0.01)
+
+    assert await policy.backoff(1)
+    assert not await policy.backoff(3)
+    with bind_deadline(0.05):
+        assert not policy.allow(1, delay=1.0)
+
+    exhausted = RetryPolicy("test", budget=RetryBudget("test", min_retries=0))
+    assert not exhausted.allow(1)
+    assert 0.01 <= policy.delay(2) <= 0.02
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from source.infrastructure.utils.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight: SingleFlight[str, int] = SingleFlight("test")
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+
+    assert results == [1] * 5
+    assert len(flight) == 0
+    # после завершения операция выполняется заново
+    assert await flight.do("key", fetch) == 2
+
+
+async def test_error_is_shared_and_cancelled_waiter_does_not_cancel_others():
+    flight: SingleFlight[str, int] = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        await release.wait()
+        raise ValueError("hh.ru недоступен")
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(ValueError):
+        await second
+    assert first.cancelled()
@@ -0,0 +1,77 @@
+import numpy as np
+
+from source.domain.entities.resume import ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.skill_matcher import SkillMatcher
+
+
+def vacancy(hh_id: str, skills: list[str]) -> VacancyEntity:
+    return VacancyEntity(
+        hh_id=hh_id,
+        url_vacancy=f"https://hh.ru/vacancy/{hh_id}",
+        name="Python разработчик",
+        experience={"id": "noExperience", "name": "Нет опыта"},
+        description="",
+        key_skills=[{"name": name} for name in skills],
+        employer_id="1",
+    )
+
+
+def test_vacancies_are_ranked_by_share_of_matched_skills():
+    resume = ResumeEntity(
+        hh_id="r1",
+        title="Python разработчик",
+        name="Иван",
+        surname="Иванов",
+        job_experience=[],
+        skills={"python", "PostgreSQL", "Docker"},
+        contact_phone="+79990000000",
+        contact_email="ivan@example.com",
+    )
+    vacancies = [
+        vacancy("1", ["Java", "Spring"]),
+        vacancy("2", []),
+        vacancy("3", ["Python", "PostgreSQL", "Kafka", "Redis"]),
+        vacancy("4", ["Python", " docker "]),
+    ]
+
+    ranked = SkillMatcher().rank(resume, vacancies)
+
+    assert [(m.vacancy.hh_id, m.score) for m in ranked] == [
+        ("4", 1.0),
+        ("3", 0.5),
+        ("1", 0.0),
+        ("2", None),
+    ]
+    assert ranked[1].missing_skills == ["Kafka", "Redis"]
+
+
+def test_bitsets_encoded_before_vocabulary_growth_stay_valid():
+    matcher = SkillMatcher()
+    old = matcher.encode([["skill-0", "skill-1"]])
+    matcher.encode([[f"skill-{i}" for i in range(200)]])
+    resume = matcher.encode([["skill-1", "skill-150"]], add=False)[0]
+
+    assert old.shape[1] == 1 and resume.shape[0] == 4
+    np.testing.assert_allclose(matcher.score(resume, old), [0.5])
+
+
+def test_vocabulary_is_reset_when_it_exceeds_max_entries():
+    resume = ResumeEntity(
+        hh_id="r1",
+        title="Python разработчик",
+        name="Иван",
+        surname="Иванов",
+        job_experience=[],
+        skills={"python"},
+        contact_phone="+79990000000",
+        contact_email="ivan@example.com",
+    )
+    matcher = SkillMatcher(max_entries=5)
+
+    for i in range(3):
+        skills = ["Python", *(f"skill-{i}-{j}" for j in range(3))]
+        ranked = matcher.rank(resume, [vacancy(str(i), skills)])
+        assert ranked[0].score == 0.25
+    # словарь сброшен перед последним вызовом и содержит только его навыки
+    assert matcher.vocabulary.entries == 5
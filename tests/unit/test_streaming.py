@@ -0,0 +1,81 @@
+import asyncio
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from source.domain.entities.response import ResponseToVacancyEntity
+from source.domain.entities.resume import ResumeEntity
+from source.domain.entities.vacancy import VacancyEntity
+from source.infrastructure.services.ai_service import AIService
+from source.infrastructure.services.llm_endpoints import LLMEndpoint
+from source.presentation.bot.utils.streaming import CURSOR, edit_message_streaming
+
+LETTER = "Здравствуйте! Меня зовут Иван, хочу работать у вас."
+
+
+class FakeMessage:
+    def __init__(self):
+        self.edits: list[str] = []
+        self.reply_markup = None
+
+    async def edit_text(self, text: str, reply_markup=None, **kwargs) -> None:
+        self.edits.append(text)
+        self.reply_markup = reply_markup
+
+
+def response(message: str) -> ResponseToVacancyEntity:
+    return ResponseToVacancyEntity(
+        url_vacancy="https://hh.ru/vacancy/1", vacancy_hh_id="1", resume_hh_id="r", message=message
+    )
+
+
+async def test_edits_are_throttled_and_final_text_is_shown():
+    async def chunks():
+        for word in ["Здравствуйте!", " Меня", " зовут", " Иван."]:
+            await asyncio.sleep(0.02)
+            yield word
+        yield response("Здравствуйте! Меня зовут Иван.")
+
+    message = FakeMessage()
+    result = await edit_message_streaming(message, chunks(), reply_markup="kb", interval=0.05)
+
+    # 4 части с паузой 0.02 сек при интервале 0.05 - не больше одной промежуточной правки
+    assert len(message.edits) <= 2
+    assert all(edit.endswith(CURSOR) for edit in message.edits[:-1])
+    assert message.edits[-1] == result.message == "Здравствуйте! Меня зовут Иван."
+    assert message.reply_markup == "kb"
+
+
+async def test_ai_service_streams_each_token_once():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(LETTER)]))
+    service = AIService(InMemorySaver(), endpoints=[LLMEndpoint("primary", "fake", llm)])
+    data = {
+        "user_id": 1,
+        "vacancy": VacancyEntity(
+            hh_id="1",
+            url_vacancy="https://hh.ru/vacancy/1",
+            name="Python разработчик",
+            experience={"id": "noExperience", "name": "Нет опыта"},
+            description="Разработка сервисов",
+            key_skills=[],
+            employer_id="1",
+        ),
+        "resume": ResumeEntity(
+            hh_id="r",
+            title="Python разработчик",
+            name="Иван",
+            surname="Иванов",
+            job_experience=[],
+            skills={"Python"},
+            contact_phone="+79990000000",
+            contact_email="ivan@example.com",
+        ),
+        "employer": None,
+        "user_rules": {},
+    }
+
+    chunks = [chunk async for chunk in service.stream_response(data)]
+
+    assert "".join(chunks[:-1]) == LETTER
+    assert chunks[-1].message == LETTER
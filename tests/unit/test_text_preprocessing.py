@@ -0,0 +1,54 @@
+from source.infrastructure.services.text_preprocessing import (
+    DescriptionPreprocessor,
+    approx_tokens,
+    normalize_description,
+)
+from source.infrastructure.utils.metrics import metrics
+
+VACANCY_HTML = (
+    "<p><strong>Обязанности:</strong></p>"
+    "<ul><li>разработка backend на Python;</li><li>code review;</li><li>code review;</li></ul>"
+    "<p><strong>Условия:</strong></p>"
+    "<ul><li>ДМС;</li><li>удаленная работа;</li></ul>"
+    "<p>Мы предлагаем:</p>"
+    "<ul><li>ДМС;</li><li>удаленная&nbsp;работа;</li></ul>"
+    "<p>Контакты:</p>"
+    "<p>Ждем ваших откликов!</p>"
+)
+
+
+def test_html_is_converted_to_compact_text():
+    text = normalize_description(VACANCY_HTML)
+
+    assert text == (
+        "Обязанности:\n"
+        "- разработка backend на Python;\n"
+        "- code review;\n"
+        "Условия:\n"
+        "- ДМС;\n"
+        "- удаленная работа;\n"
+        "Мы предлагаем:\n"
+        "- ДМС;\n"
+        "- удаленная работа;"
+    )
+    assert approx_tokens(text) < approx_tokens(VACANCY_HTML)
+
+
+def test_preprocessor_caches_by_hh_id_and_source():
+    preprocessor = DescriptionPreprocessor(cache_size=10)
+    before = metrics.get_counter("description_preprocess_total", kind="vacancy", result="cached")
+
+    first = preprocessor.normalize("vacancy", "1", VACANCY_HTML)
+    second = preprocessor.normalize("vacancy", "1", VACANCY_HTML)
+    changed = preprocessor.normalize("vacancy", "1", "<p>Новое описание</p>")
+
+    assert first == second
+    assert changed == "Новое описание"
+    assert (
+        metrics.get_counter("description_preprocess_total", kind="vacancy", result="cached")
+        == before + 1
+    )
+
+
+def test_empty_description():
+    assert DescriptionPreprocessor().normalize("employer", "1", None) == ""
@@ -0,0 +1,67 @@
+from source.infrastructure.services.text_preprocessing import approx_tokens
+from source.infrastructure.services.text_summarizer import ExtractiveSummarizer, split_sentences
+from source.infrastructure.utils.metrics import metrics
+
+DESCRIPTION = "\n".join(
+    [
+        "О компании:",
+        "Мы крупная продуктовая компания с офисами в Москве и Санкт-Петербурге. "
+        "Нашими продуктами пользуются миллионы людей.",
+        "Обязанности:",
+        "- разработка backend сервисов на Python;",
+        "- работа с очередями Kafka;",
+        "Требования:",
+        "- опыт коммерческой разработки от 3 лет;",
+        "Условия:",
+        "- современный офис рядом с метро, кофе, фрукты и настольный теннис;",
+        "- корпоративные праздники и тимбилдинги каждый квартал;",
+        "- ДМС после испытательного срока.",
+    ]
+)
+
+
+def test_sentences_are_split_by_lines_and_punctuation():
+    sentences = split_sentences(DESCRIPTION)
+
+    assert sentences[1] == "Мы крупная продуктовая компания с офисами в Москве и Санкт-Петербурге."
+    assert sentences[2] == "Нашими продуктами пользуются миллионы людей."
+    assert len(sentences) == 12
+
+
+def test_summary_fits_budget_and_keeps_requirements():
+    summarizer = ExtractiveSummarizer(cache_size=10)
+
+    summary = summarizer.summarize(DESCRIPTION, 60, keywords=["Kafka"])
+
+    assert approx_tokens(summary) <= 60
+    assert "- опыт коммерческой разработки от 3 лет;" in summary
+    assert "- работа с очередями Kafka;" in summary
+    # порядок предложений сохраняется
+    lines = summary.splitlines()
+    assert lines == [line for line in split_sentences(DESCRIPTION) if line in lines]
+
+
+def test_short_text_is_unchanged_and_summary_is_cached():
+    summarizer = ExtractiveSummarizer(cache_size=10)
+    before = metrics.get_counter("summarizer_requests_total", result="cached")
+
+    assert summarizer.summarize(DESCRIPTION, None) == DESCRIPTION
+    assert summarizer.summarize(DESCRIPTION, 1000) == DESCRIPTION
+    first = summarizer.summarize(DESCRIPTION, 60)
+    second = summarizer.summarize(DESCRIPTION, 60)
+
+    assert first == second
+    assert metrics.get_counter("summarizer_requests_total", result="cached") == before + 1
+
+
+def test_text_without_sentences_is_truncated_to_budget():
+    text = " ".join(f"слово{i}" for i in range(3000))
+
+    summary = ExtractiveSummarizer().summarize(text, 400)
+
+    assert summary and approx_tokens(summary) <= 400
+    assert text.startswith(summary) and text[len(summary)] == " "
+
+
+def test_whitespace_only_text_over_budget():
+    assert ExtractiveSummarizer().summarize(" \n\t" * 100, 10) == ""
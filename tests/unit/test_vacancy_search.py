@@ -0,0 +1,91 @@
+import httpx
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+from sqlalchemy.dialects import postgresql
+
+from source.application.dtos.search import VacancySearchDTO, VacancySearchPageDTO
+from source.application.use_cases.search_vacancies import RankVacanciesUseCase
+from source.infrastructure.db.repositories.vacancy import (
+    VacancyRepository,
+    decode_cursor,
+    encode_cursor,
+)
+from source.infrastructure.services.skill_matcher import SkillMatcher
+from source.presentation.api.vacancies import router
+from source.presentation.bot.routers.vacancies import parse_search_args
+
+
+def compile_search(query: VacancySearchDTO) -> str:
+    stmt = VacancyRepository(session=None).search_statement(query)
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_search_uses_indexes_and_keyset_pagination():
+    query = parse_search_args("python backend Навыки: Django, PostgreSQL")
+    assert query.text == "python backend"
+    assert query.skills == ["Django", "PostgreSQL"]
+
+    sql = compile_search(query.model_copy(update={"cursor": encode_cursor(0.25, 42)}))
+
+    assert "vacancies.search_vector @@ websearch_to_tsquery" in sql
+    assert "vacancies.key_skills @>" in sql
+    assert "(ts_rank_cd(vacancies.search_vector" in sql and ") < (CAST(" in sql
+    assert "OFFSET" not in sql
+    # вектор нужен только в условиях, в результат не загружается
+    assert "search_vector" not in sql.split("ts_rank_cd")[0]
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(0.1, 7)) == (0.1, 7)
+    assert parse_search_args("  навыки: Git").text == ""
+
+
+class FakeUnitOfWork:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class FakeResumeRepository:
+    def __init__(self, session):
+        pass
+
+    async def get(self, hh_id: str):
+        return None if hh_id == "missing" else object()
+
+
+class FakeVacancyRepository:
+    def __init__(self, session):
+        pass
+
+    async def search(self, query: VacancySearchDTO) -> VacancySearchPageDTO:
+        if query.cursor:
+            decode_cursor(query.cursor)
+        return VacancySearchPageDTO(items=[], next_cursor=None)
+
+
+async def test_match_maps_missing_resume_to_404_and_bad_cursor_to_400():
+    provider = Provider(scope=Scope.APP)
+    provider.provide(
+        lambda: RankVacanciesUseCase(
+            FakeUnitOfWork(), FakeVacancyRepository, FakeResumeRepository, SkillMatcher()
+        ),
+        provides=RankVacanciesUseCase,
+    )
+    app = FastAPI()
+    app.include_router(router)
+    setup_dishka(make_async_container(provider), app)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        missing = await client.post("/vacancies/match", json={"resume_hh_id": "missing"})
+        bad_cursor = await client.post(
+            "/vacancies/match", json={"resume_hh_id": "r1", "cursor": "not-a-cursor"}
+        )
+
+    assert missing.status_code == 404
+    assert bad_cursor.status_code == 400